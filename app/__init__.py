@@ -6,5 +6,28 @@
 
 __version__ = '1.0.0'
 
+import importlib
+
 from app.config import constants
-from app.core import DataProcessor, PDFParser, DataExtractor, ExportManager
\ No newline at end of file
+
+# רכיבי הליבה נטענים רק בגישה הראשונה אליהם (PEP 562), כך שייבוא app אינו טוען
+# את pdfplumber ואת ספריות הייצוא
+_LAZY_EXPORTS = {
+    "DataProcessor": "app.core.data_processor",
+    "PDFParser": "app.core.pdf_parser",
+    "DataExtractor": "app.core.data_extractor",
+    "ExportManager": "app.core.export_manager"
+}
+
+
+def __getattr__(name):
+    if name not in _LAZY_EXPORTS:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+    value = getattr(importlib.import_module(_LAZY_EXPORTS[name]), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    return sorted(list(globals()) + list(_LAZY_EXPORTS))
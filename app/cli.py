@@ -0,0 +1,276 @@
+# -*- coding: utf-8 -*-
+
+"""
+ממשק שורת פקודה - חילוץ אצוות של נסחים ללא ממשק גרפי (שרתים, cron).
+
+המודול אינו מייבא את PyQt5, ומודולי החילוץ והייצוא נטענים רק כשפקודה רצה בפועל,
+כך ש---help ושגיאות בארגומנטים מגיבים מיד.
+
+הרצה:
+    python -m app.cli extract <folder> --out results.csv [--template NAME] [--workers 4]
+    python -m app.cli templates
+    python -m app.cli serve [--port 8765] [--workers 4]
+"""
+
+import os
+import sys
+import time
+import argparse
+
+# מתודת הייצוא לפי סיומת קובץ הפלט
+OUTPUT_FORMATS = {
+    ".csv": "export_to_csv",
+    ".xlsx": "export_to_excel",
+    ".parquet": "export_to_parquet",
+    ".jsonl": "export_to_jsonl"
+}
+
+# מספר הקבצים בין הודעות התקדמות
+PROGRESS_EVERY_FILES = 100
+
+
+class BatchStats:
+    """
+    סטטיסטיקת תפוקה של אצוות חילוץ.
+    """
+
+    def __init__(self, total_files):
+        """
+        Args:
+            total_files (int): מספר הקבצים באצווה
+        """
+        self.total_files = total_files
+        self.processed = 0
+        self.failed = 0
+        self.started_at = time.perf_counter()
+
+    def add(self, result):
+        """
+        Args:
+            result (ExtractionResult): תוצאת חילוץ שהתקבלה
+        """
+        self.processed += 1
+        if result.has_error():
+            self.failed += 1
+
+    @property
+    def elapsed(self):
+        return time.perf_counter() - self.started_at
+
+    def summary(self):
+        """
+        Returns:
+            str: שורת סיכום - קבצים, שגיאות, זמן ותפוקה
+        """
+        rate = self.processed / self.elapsed if self.elapsed > 0 else 0.0
+        return (f"{self.processed}/{self.total_files} files, {self.failed} failed, "
+                f"{self.elapsed:.1f}s, {rate:.1f} files/s")
+
+
+def _iter_results(results, stats, quiet):
+    """
+    מעבר על תוצאות החילוץ תוך עדכון הסטטיסטיקה והדפסת התקדמות.
+
+    Args:
+        results (iterable): תוצאות החילוץ
+        stats (BatchStats): סטטיסטיקת האצווה
+        quiet (bool): האם להשמיט הודעות התקדמות
+
+    Yields:
+        ExtractionResult: כל תוצאה כפי שהתקבלה
+    """
+    for result in results:
+        stats.add(result)
+
+        if result.has_error() and not quiet:
+            print(f"error: {result.file_path}: {result.error}", file=sys.stderr)
+
+        if not quiet and stats.processed % PROGRESS_EVERY_FILES == 0:
+            print(stats.summary(), file=sys.stderr)
+
+        yield result
+
+
+def run_extract(args):
+    """
+    חילוץ כל קבצי ה-PDF בתיקייה וכתיבת התוצאות לקובץ הפלט בזרימה.
+
+    Args:
+        args (argparse.Namespace): הארגומנטים של הפקודה extract
+
+    Returns:
+        int: קוד היציאה (0 - הצלחה)
+    """
+    extension = os.path.splitext(args.out)[1].lower()
+    if extension not in OUTPUT_FORMATS:
+        print(f"Unsupported output format '{extension}' (use {', '.join(OUTPUT_FORMATS)})", file=sys.stderr)
+        return 2
+    if args.resume and extension != ".jsonl":
+        print("--resume is only supported for .jsonl output", file=sys.stderr)
+        return 2
+
+    from app.config.application_config import ApplicationConfig
+    from app.core.cache import TextCache, ResultCache
+    from app.core.data_processor import DataProcessor
+    from app.core.export_manager import ExportManager, JsonLinesSink
+    from app.models.extraction_config import ExtractionConfig
+    from app.utils.file_utils import get_pdf_files_in_directory
+
+    config = ApplicationConfig()
+
+    field_ids = None
+    if args.fields:
+        field_ids = [field_id.strip() for field_id in args.fields.split(",") if field_id.strip()]
+
+    try:
+        selected_field_ids = config.resolve_field_ids(args.template, field_ids)
+    except ValueError as e:
+        print(str(e), file=sys.stderr)
+        return 2
+
+    pdf_files = sorted(get_pdf_files_in_directory(args.folder, recursive=not args.no_recursive))
+
+    # המשך אצווה שנקטעה - קבצים שכבר חולצו בהצלחה לקובץ הפלט אינם מעובדים שוב (קבצים שנכשלו - כן)
+    if args.resume:
+        completed_paths = JsonLinesSink.completed_file_paths(args.out)
+        pdf_files = [pdf_path for pdf_path in pdf_files if pdf_path not in completed_paths]
+
+    extraction_config = ExtractionConfig()
+    extraction_config.update_from_field_ids(selected_field_ids)
+
+    if args.no_cache:
+        processor = DataProcessor()
+    else:
+        processor = DataProcessor(TextCache(config.cache_dir), ResultCache(config.cache_dir))
+
+    stats = BatchStats(len(pdf_files))
+    results = _iter_results(
+        processor.iter_process(pdf_files, extraction_config, parallel=args.workers > 1, max_workers=args.workers,
+                               isolated=args.isolated),
+        stats, args.quiet)
+
+    if args.resume:
+        with JsonLinesSink(args.out, append=True) as sink:
+            for result in results:
+                sink.write(result)
+        success = True
+    else:
+        export_method = getattr(ExportManager(), OUTPUT_FORMATS[extension])
+        success = export_method(results, selected_field_ids, args.out)
+
+    print(stats.summary(), file=sys.stderr)
+
+    if not success:
+        print(f"Failed to write {args.out}", file=sys.stderr)
+        return 1
+
+    return 0
+
+
+def run_templates(args):
+    """
+    הדפסת התבניות השמורות ושדותיהן.
+
+    Args:
+        args (argparse.Namespace): הארגומנטים של הפקודה templates
+
+    Returns:
+        int: קוד היציאה
+    """
+    from app.config.application_config import ApplicationConfig
+
+    for template in ApplicationConfig().get_available_templates():
+        field_ids = template["data"].get("selected_field_ids", [])
+        print(f"{template['name']}: {','.join(field_ids)}")
+
+    return 0
+
+
+def run_serve(args):
+    """
+    הפעלת שירות החילוץ המקומי (ראו app.service) עד לעצירה.
+
+    Args:
+        args (argparse.Namespace): הארגומנטים של הפקודה serve
+
+    Returns:
+        int: קוד היציאה
+    """
+    from app.config.application_config import ApplicationConfig
+    from app.core.cache import TextCache, ResultCache
+    from app.core.data_processor import DataProcessor
+    from app.service import serve
+
+    if args.no_cache:
+        processor = DataProcessor()
+    else:
+        cache_dir = ApplicationConfig().cache_dir
+        processor = DataProcessor(TextCache(cache_dir), ResultCache(cache_dir))
+
+    def on_ready(server):
+        host, port = server.server_address[:2]
+        print(f"Serving on http://{host}:{port} ({server.service.workers} workers, "
+              f"queue of {server.service.queue_size})", file=sys.stderr)
+
+    serve(args.host, args.port, args.workers, args.queue_size, processor, on_ready)
+    return 0
+
+
+def build_parser():
+    """
+    Returns:
+        argparse.ArgumentParser: מפענח הארגומנטים של שורת הפקודה
+    """
+    parser = argparse.ArgumentParser(prog="python -m app.cli", description="חילוץ נתונים מנסחי טאבו ללא ממשק גרפי")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    extract = commands.add_parser("extract", help="חילוץ כל קבצי ה-PDF בתיקייה לקובץ פלט")
+    extract.add_argument("folder", help="תיקיית קבצי ה-PDF")
+    extract.add_argument("--out", required=True,
+                         help=f"קובץ הפלט - הפורמט נקבע לפי הסיומת ({', '.join(OUTPUT_FORMATS)})")
+    fields = extract.add_mutually_exclusive_group()
+    fields.add_argument("--template", help="שם תבנית שמורה שממנה נלקחים השדות")
+    fields.add_argument("--fields", help="מזהי שדות מופרדים בפסיקים (ברירת מחדל - שדות ברירת המחדל)")
+    extract.add_argument("--workers", type=int, default=1, help="מספר תהליכי העבודה (1 - עיבוד טורי)")
+    extract.add_argument("--isolated", action="store_true",
+                         help="עיבוד בתהליכי עבודה מבודדים עם מגבלת זמן וזיכרון לכל קובץ")
+    extract.add_argument("--no-recursive", action="store_true", help="ללא חיפוש בתתי-תיקיות")
+    extract.add_argument("--no-cache", action="store_true", help="ללא מטמון טקסט ותוצאות")
+    extract.add_argument("--resume", action="store_true",
+                         help="הוספה לקובץ .jsonl קיים ודילוג על קבצים שכבר חולצו בהצלחה (קבצים שנכשלו מעובדים שוב)")
+    extract.add_argument("--quiet", action="store_true", help="ללא הודעות התקדמות ושגיאות לקבצים בודדים")
+    extract.set_defaults(handler=run_extract)
+
+    templates = commands.add_parser("templates", help="הצגת התבניות השמורות")
+    templates.set_defaults(handler=run_templates)
+
+    from app.config.constants import SERVICE_DEFAULT_HOST, SERVICE_DEFAULT_PORT, SERVICE_QUEUE_SIZE
+
+    serve = commands.add_parser("serve", help="הפעלת שירות חילוץ מקומי ב-HTTP")
+    serve.add_argument("--host", default=SERVICE_DEFAULT_HOST, help="הכתובת להאזנה")
+    serve.add_argument("--port", type=int, default=SERVICE_DEFAULT_PORT, help="הפורט להאזנה")
+    serve.add_argument("--workers", type=int, help="מספר תהליכי העבודה (ברירת מחדל - מספר המעבדים)")
+    serve.add_argument("--queue-size", type=int, default=SERVICE_QUEUE_SIZE,
+                       help="מספר הבקשות שממתינות לתהליך פנוי לפני דחייה ב-429")
+    serve.add_argument("--no-cache", action="store_true", help="ללא מטמון טקסט ותוצאות")
+    serve.set_defaults(handler=run_serve)
+
+    return parser
+
+
+def main(argv=None):
+    """
+    נקודת הכניסה של שורת הפקודה.
+
+    Args:
+        argv (list, optional): הארגומנטים (ברירת מחדל - sys.argv)
+
+    Returns:
+        int: קוד היציאה
+    """
+    args = build_parser().parse_args(argv)
+    return args.handler(args)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -7,7 +7,7 @@
 import os
 import json
 from pathlib import Path
-from app.config.constants import DEFAULT_FIELDS
+from app.config.constants import DEFAULT_FIELDS, FIELD_ID_TO_NAME
 
 
 class ApplicationConfig:
@@ -22,9 +22,9 @@ class ApplicationConfig:
         # נתיב ספריית הגדרות המשתמש
         self.user_config_dir = Path.home() / "PDFExtractor"
         self.templates_dir = self.user_config_dir / "templates"
+        self.cache_dir = self.user_config_dir / "cache"
 
-        # יצירת ספריות הגדרות אם לא קיימות
-        self._ensure_directories_exist()
+        # הספריות נוצרות רק כשנכתב אליהן קובץ (תבנית, רשומת מטמון), ולא בעת האתחול
 
         # טעינת הגדרות ברירת מחדל
         self.available_fields = DEFAULT_FIELDS
@@ -51,6 +51,7 @@ class ApplicationConfig:
             if not template_name:
                 return False
 
+            self._ensure_directories_exist()
             template_file = self.templates_dir / f"{template_name}.json"
 
             with open(template_file, 'w', encoding='utf-8') as f:
@@ -117,4 +118,36 @@ class ApplicationConfig:
         except Exception as e:
             print(f"Error listing templates: {str(e)}")
 
-        return templates
\ No newline at end of file
+        return templates
+
+    def resolve_field_ids(self, template_name=None, field_ids=None):
+        """
+        קביעת השדות לחילוץ עבור הרצה ללא ממשק גרפי (שורת פקודה, שירות).
+
+        Args:
+            template_name (str, optional): שם תבנית שמורה שממנה נלקחים השדות
+            field_ids (list, optional): מזהי שדות מפורשים
+
+        Returns:
+            list: מזהי השדות - מהתבנית, מהרשימה שסופקה, או שדות ברירת המחדל
+
+        Raises:
+            ValueError: אם התבנית לא נמצאה, יש מזהה שדה לא מוכר או שלא נבחר אף שדה
+        """
+        if template_name:
+            template_data = self.load_template(template_name)
+            if template_data is None:
+                raise ValueError(f"Template not found: {template_name}")
+            field_ids = template_data.get("selected_field_ids", [])
+
+        elif field_ids is None:
+            field_ids = [field["id"] for fields in self.available_fields.values()
+                         for field in fields if field["default"]]
+
+        unknown = [field_id for field_id in field_ids if field_id not in FIELD_ID_TO_NAME]
+        if unknown:
+            raise ValueError(f"Unknown field ids: {', '.join(unknown)}")
+        if not field_ids:
+            raise ValueError("No fields selected")
+
+        return list(field_ids)
@@ -4,6 +4,8 @@
 קבועים של האפליקציה.
 """
 
+import os
+
 # רשימת השדות האפשריים לחילוץ
 DEFAULT_FIELDS = {
     "general": [
@@ -59,4 +61,50 @@ FIELD_NAME_TO_ID = {v: k for k, v in FIELD_ID_TO_NAME.items()}
 APP_NAME = "מחלץ נתונים מנסחי טאבו"
 
 # גודל חלון ברירת מחדל
-DEFAULT_WINDOW_SIZE = (1200, 800)
\ No newline at end of file
+DEFAULT_WINDOW_SIZE = (1200, 800)
+
+# מספר תהליכי עבודה ברירת מחדל לעיבוד מקבילי
+DEFAULT_MAX_WORKERS = os.cpu_count() or 1
+
+# גודל מקסימלי של מטמון הטקסט המחולץ (במגה-בייט)
+TEXT_CACHE_MAX_SIZE_MB = 512
+
+# גודל מקסימלי של מטמון תוצאות החילוץ (במגה-בייט)
+RESULT_CACHE_MAX_SIZE_MB = 256
+
+# מגבלת הזמן (בשניות) להרצת הביטויים הרגולריים על מסמך בודד
+REGEX_TIME_BUDGET_SECONDS = 10.0
+
+# מרווח הזמן (במילישניות) בין עדכוני טבלת התוצאות במהלך החילוץ
+RESULTS_FLUSH_INTERVAL_MS = 200
+
+# מרווח הזמן (בשניות) בין שמירות לדיסק של קובץ CSV שנכתב במהלך החילוץ
+CSV_SINK_FLUSH_INTERVAL_SECONDS = 5.0
+
+# מרווח הזמן (בשניות) בין שמירות לדיסק של קובץ JSON Lines שנכתב במהלך החילוץ
+JSONL_SINK_FLUSH_INTERVAL_SECONDS = 5.0
+
+# עיבוד מבודד (קבצים מעובדים בתהליכי עבודה שניתן לעצור ולהחליף) - מגבלת הזמן לקובץ בודד (שניות)
+ISOLATED_FILE_TIMEOUT_SECONDS = 120.0
+
+# עיבוד מבודד - מגבלת הזיכרון של תהליך עבודה (מגה-בייט, RLIMIT_AS - לא נאכף ב-Windows)
+ISOLATED_MEMORY_LIMIT_MB = 2048
+
+# עיבוד מבודד - מספר הקבצים שתהליך עבודה מעבד לפני שהוא מוחלף בתהליך חדש
+ISOLATED_MAX_FILES_PER_WORKER = 200
+
+# מספר השורות בכל קבוצת שורות (row group) בייצוא Parquet - השורות נאגרות בזיכרון עד לכתיבה
+PARQUET_ROW_GROUP_SIZE = 10000
+
+# שירות החילוץ המקומי (python -m app.cli serve)
+SERVICE_DEFAULT_HOST = "127.0.0.1"
+SERVICE_DEFAULT_PORT = 8765
+
+# מספר הבקשות שממתינות לתהליך עבודה פנוי - מעבר לכך השירות מחזיר 429
+SERVICE_QUEUE_SIZE = 32
+
+# הגודל המקסימלי של קובץ PDF שנשלח לשירות (מגה-בייט)
+SERVICE_MAX_UPLOAD_MB = 50
+
+# מספר הבקשות האחרונות שמהן מחושבים אחוזוני זמן התגובה
+SERVICE_LATENCY_WINDOW = 1000
\ No newline at end of file
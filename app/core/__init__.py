@@ -4,7 +4,38 @@
 מודול ליבה - אחראי על חילוץ ועיבוד המידע מקבצי PDF.
 """
 
-from app.core.pdf_parser import PDFParser
-from app.core.data_extractor import DataExtractor
-from app.core.data_processor import DataProcessor
-from app.core.export_manager import ExportManager
\ No newline at end of file
+import importlib
+
+# המחלקות נטענות רק בגישה הראשונה אליהן (PEP 562) - ייבוא app.core אינו טוען את
+# pdfplumber, openpyxl ו-pyarrow עד שמשתמשים במודול שזקוק להן
+_LAZY_EXPORTS = {
+    "PDFParser": "app.core.pdf_parser",
+    "PDFDocument": "app.core.pdf_parser",
+    "ExtractionPlan": "app.core.extraction_plan",
+    "SectionIndex": "app.core.section_index",
+    "DataExtractor": "app.core.data_extractor",
+    "DiskCache": "app.core.cache",
+    "TextCache": "app.core.cache",
+    "ResultCache": "app.core.cache",
+    "DataProcessor": "app.core.data_processor",
+    "ColumnPlan": "app.core.column_plan",
+    "TablePlan": "app.core.column_plan",
+    "ParquetSink": "app.core.parquet_export",
+    "SUPPORTS_PARQUET": "app.core.parquet_export",
+    "ExportManager": "app.core.export_manager",
+    "CsvSink": "app.core.export_manager",
+    "JsonLinesSink": "app.core.export_manager"
+}
+
+
+def __getattr__(name):
+    if name not in _LAZY_EXPORTS:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+    value = getattr(importlib.import_module(_LAZY_EXPORTS[name]), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    return sorted(list(globals()) + list(_LAZY_EXPORTS))
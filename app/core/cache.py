@@ -0,0 +1,331 @@
+# -*- coding: utf-8 -*-
+
+"""
+מודול מטמון - שמירת תוצרי עיבוד על הדיסק לפי גיבוב תוכן הקובץ.
+"""
+
+import os
+import json
+import shutil
+import hashlib
+import tempfile
+from pathlib import Path
+
+from app.config.constants import TEXT_CACHE_MAX_SIZE_MB, RESULT_CACHE_MAX_SIZE_MB
+from app.core.pdf_parser import PDFParser
+from app.core.data_extractor import EXTRACTOR_VERSION
+from app.utils.regex_patterns import PATTERNS_VERSION
+from app.utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+
+class DiskCache:
+    """
+    מטמון כללי על הדיסק - רשומה אחת לכל מפתח, עם מגבלת גודל ופינוי LRU
+    (הרשומות שהשימוש האחרון בהן הוא הישן ביותר נמחקות ראשונות).
+    """
+
+    # סיומת קבצי הרשומות
+    extension = ".bin"
+
+    # שם המטמון ברישום הפגיעות של תוצאת חילוץ (ExtractionResult.cache_lookups)
+    name = "cache"
+
+    def __init__(self, cache_dir, max_size_bytes):
+        """
+        אתחול המטמון.
+
+        Args:
+            cache_dir (str או Path): ספריית המטמון
+            max_size_bytes (int): הגודל הכולל המקסימלי של הרשומות בבתים
+        """
+        self.cache_dir = Path(cache_dir)
+        self.max_size_bytes = max_size_bytes
+
+        # מוני פגיעות והחטאות
+        self.hits = 0
+        self.misses = 0
+
+        # הערכת הגודל הנוכחי של המטמון (מחושבת בכתיבה הראשונה)
+        self._size_estimate = None
+
+    def _make_key(self, *parts):
+        """
+        בניית מפתח רשומה מרכיבי המפתח.
+
+        Args:
+            *parts (str): רכיבי המפתח
+
+        Returns:
+            str: מפתח הרשומה
+        """
+        return hashlib.sha256("\0".join(parts).encode('utf-8')).hexdigest()
+
+    def _entry_path(self, key):
+        """
+        Args:
+            key (str): מפתח הרשומה
+
+        Returns:
+            Path: נתיב קובץ הרשומה (מפוצל לתתי-ספריות לפי תחילית המפתח)
+        """
+        return self.cache_dir / key[:2] / (key + self.extension)
+
+    def _read(self, key):
+        """
+        קריאת רשומה מהמטמון ועדכון זמן השימוש האחרון בה.
+
+        Args:
+            key (str): מפתח הרשומה
+
+        Returns:
+            bytes או None: תוכן הרשומה, או None אם אינה קיימת
+        """
+        entry_path = self._entry_path(key)
+
+        try:
+            with open(entry_path, 'rb') as f:
+                data = f.read()
+
+            # עדכון זמן השינוי משמש כזמן השימוש האחרון לצורך פינוי LRU
+            os.utime(entry_path)
+
+        except OSError:
+            self.misses += 1
+            return None
+
+        self.hits += 1
+        return data
+
+    def record_lookup(self, hit):
+        """
+        רישום פגיעה או החטאה שהתרחשה בעותק של המטמון בתהליך עבודה, כך שהמונים
+        בתהליך הראשי משקפים את כל האצווה גם בעיבוד מקבילי.
+
+        Args:
+            hit (bool): האם הרשומה נמצאה
+        """
+        if hit:
+            self.hits += 1
+        else:
+            self.misses += 1
+
+    def _write(self, key, data):
+        """
+        כתיבת רשומה למטמון ופינוי רשומות ישנות במקרה של חריגה מהגודל המותר.
+
+        Args:
+            key (str): מפתח הרשומה
+            data (bytes): תוכן הרשומה
+        """
+        entry_path = self._entry_path(key)
+
+        try:
+            entry_path.parent.mkdir(parents=True, exist_ok=True)
+
+            # כתיבה לקובץ זמני והחלפה אטומית - קוראים מקבילים לא יראו רשומה חלקית
+            fd, temp_path = tempfile.mkstemp(dir=entry_path.parent, suffix=".tmp")
+            with os.fdopen(fd, 'wb') as f:
+                f.write(data)
+            os.replace(temp_path, entry_path)
+
+        except OSError as e:
+            logger.error(f"Error writing cache entry {entry_path}: {str(e)}")
+            return
+
+        if self._size_estimate is None:
+            self._size_estimate = self._scan_size()
+        else:
+            self._size_estimate += len(data)
+
+        if self._size_estimate > self.max_size_bytes:
+            self._evict()
+
+    def _list_entries(self):
+        """
+        Returns:
+            list: רשימת (זמן שימוש אחרון, גודל, נתיב) לכל רשומה במטמון
+        """
+        entries = []
+
+        if not self.cache_dir.exists():
+            return entries
+
+        for entry_path in self.cache_dir.glob(f"*/*{self.extension}"):
+            try:
+                stat = entry_path.stat()
+                entries.append((stat.st_mtime, stat.st_size, entry_path))
+            except OSError:
+                # הרשומה נמחקה בינתיים על ידי תהליך אחר
+                continue
+
+        return entries
+
+    def _scan_size(self):
+        """
+        Returns:
+            int: הגודל הכולל של הרשומות במטמון בבתים
+        """
+        return sum(size for _, size, _ in self._list_entries())
+
+    def _evict(self):
+        """
+        מחיקת הרשומות הישנות ביותר עד שהמטמון חוזר לגודל המותר.
+        """
+        entries = sorted(self._list_entries(), key=lambda entry: entry[0])
+        total_size = sum(size for _, size, _ in entries)
+
+        for _, size, entry_path in entries:
+            if total_size <= self.max_size_bytes:
+                break
+
+            try:
+                entry_path.unlink()
+                total_size -= size
+            except OSError:
+                continue
+
+        self._size_estimate = total_size
+
+    def get_stats(self):
+        """
+        קבלת סטטיסטיקות שימוש במטמון.
+
+        Returns:
+            dict: מספר הפגיעות, ההחטאות, הרשומות והגודל הכולל בבתים
+        """
+        entries = self._list_entries()
+
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "entries": len(entries),
+            "size_bytes": sum(size for _, size, _ in entries)
+        }
+
+    def clear(self):
+        """
+        מחיקת כל הרשומות במטמון ואיפוס המונים.
+        """
+        try:
+            if self.cache_dir.exists():
+                shutil.rmtree(self.cache_dir)
+        except OSError as e:
+            logger.error(f"Error clearing cache {self.cache_dir}: {str(e)}")
+
+        self.hits = 0
+        self.misses = 0
+        self._size_estimate = 0
+
+
+class TextCache(DiskCache):
+    """
+    מטמון הטקסט המחולץ מקבצי PDF, לפי גיבוב תוכן הקובץ ומנוע החילוץ.
+    """
+
+    extension = ".txt"
+    name = "text"
+
+    def __init__(self, cache_root, max_size_bytes=TEXT_CACHE_MAX_SIZE_MB * 1024 * 1024, backend_id=None):
+        """
+        אתחול מטמון הטקסט.
+
+        Args:
+            cache_root (str או Path): ספריית המטמונים של האפליקציה
+            max_size_bytes (int, optional): הגודל הכולל המקסימלי בבתים
+            backend_id (str, optional): מזהה מנוע החילוץ (ברירת מחדל - המנוע הנוכחי)
+        """
+        super().__init__(Path(cache_root) / "text", max_size_bytes)
+        self._backend_id = backend_id
+
+    @property
+    def backend_id(self):
+        """
+        Returns:
+            str: מזהה מנוע החילוץ (נקבע בשימוש הראשון - קביעתו טוענת את מנוע החילוץ)
+        """
+        if self._backend_id is None:
+            self._backend_id = PDFParser.get_backend_id()
+        return self._backend_id
+
+    def get(self, file_hash):
+        """
+        קבלת הטקסט השמור עבור קובץ.
+
+        Args:
+            file_hash (str): גיבוב תוכן הקובץ
+
+        Returns:
+            str או None: הטקסט השמור, או None אם אינו במטמון
+        """
+        data = self._read(self._make_key(file_hash, self.backend_id))
+        return data.decode('utf-8') if data is not None else None
+
+    def put(self, file_hash, text_content):
+        """
+        שמירת הטקסט של קובץ במטמון.
+
+        Args:
+            file_hash (str): גיבוב תוכן הקובץ
+            text_content (str): הטקסט שחולץ מהקובץ
+        """
+        self._write(self._make_key(file_hash, self.backend_id), text_content.encode('utf-8'))
+
+
+class ResultCache(DiskCache):
+    """
+    מטמון נתוני החילוץ הסופיים, לפי גיבוב תוכן הקובץ, השדות שנבחרו וגרסת החילוץ.
+    שינוי בביטויים הרגולריים או בלוגיקת החילוץ פוסל אוטומטית את כל הרשומות הקודמות.
+    """
+
+    extension = ".json"
+    name = "result"
+
+    def __init__(self, cache_root, max_size_bytes=RESULT_CACHE_MAX_SIZE_MB * 1024 * 1024):
+        """
+        אתחול מטמון התוצאות.
+
+        Args:
+            cache_root (str או Path): ספריית המטמונים של האפליקציה
+            max_size_bytes (int, optional): הגודל הכולל המקסימלי בבתים
+        """
+        super().__init__(Path(cache_root) / "results", max_size_bytes)
+        self.version = f"{PATTERNS_VERSION}-{EXTRACTOR_VERSION}"
+
+    def _result_key(self, file_hash, selected_field_ids):
+        """
+        Args:
+            file_hash (str): גיבוב תוכן הקובץ
+            selected_field_ids (iterable): מזהי השדות שנבחרו
+
+        Returns:
+            str: מפתח הרשומה (לא תלוי בסדר השדות)
+        """
+        return self._make_key(file_hash, ",".join(sorted(set(selected_field_ids))), self.version)
+
+    def get(self, file_hash, selected_field_ids):
+        """
+        קבלת נתוני החילוץ השמורים עבור קובץ.
+
+        Args:
+            file_hash (str): גיבוב תוכן הקובץ
+            selected_field_ids (iterable): מזהי השדות שנבחרו
+
+        Returns:
+            dict או None: הנתונים השמורים, או None אם אינם במטמון
+        """
+        data = self._read(self._result_key(file_hash, selected_field_ids))
+        return json.loads(data.decode('utf-8')) if data is not None else None
+
+    def put(self, file_hash, selected_field_ids, extracted_data):
+        """
+        שמירת נתוני החילוץ של קובץ במטמון.
+
+        Args:
+            file_hash (str): גיבוב תוכן הקובץ
+            selected_field_ids (iterable): מזהי השדות שנבחרו
+            extracted_data (dict): הנתונים שחולצו
+        """
+        data = json.dumps(extracted_data, ensure_ascii=False).encode('utf-8')
+        self._write(self._result_key(file_hash, selected_field_ids), data)
@@ -0,0 +1,293 @@
+# -*- coding: utf-8 -*-
+
+"""
+מודול תוכנית עמודות - הידור השדות שנבחרו לעמודות ייצוא והצגה פעם אחת.
+"""
+
+from app.config.constants import FIELD_ID_TO_NAME
+
+# כותרת עמודת שם הקובץ (העמודה הראשונה בכל טבלה וקובץ ייצוא)
+FILE_NAME_HEADER = "שם קובץ"
+
+# מיפוי שדות הרשימות (בעלים, משכנתאות, הערות) למפתח הרשימה ולמפתח הערך בכל רשומה
+LIST_FIELD_KEYS = {
+    "owner_name": ("owners", "name"),
+    "owner_id": ("owners", "id_number"),
+    "owner_id_type": ("owners", "id_type"),
+    "owner_share": ("owners", "share"),
+    "mortgage_holder": ("mortgages", "holder"),
+    "mortgage_amount": ("mortgages", "amount"),
+    "mortgage_rank": ("mortgages", "rank"),
+    "remark_type": ("remarks", "type"),
+    "remark_content": ("remarks", "content")
+}
+
+# כותרת עמודת גיבוב תוכן הקובץ (בייצוא בלבד - אחרי שם הקובץ)
+CONTENT_HASH_HEADER = "גיבוב תוכן"
+
+# השדה שמזהה מסמך במיזוג לייצוא קיים (אם לא נבחר או ריק - גיבוב תוכן הקובץ)
+MERGE_KEY_FIELD = "nesach_number"
+
+# כותרות עמודות המפתח בייצוא המנורמל (טבלה לכל ישות)
+DOCUMENT_KEY_HEADER = "מזהה מסמך"
+ENTRY_NUMBER_HEADER = "מספר רשומה"
+
+# טבלאות הייצוא המנורמל לפי סדרן - טבלת המסמכים ואחריה טבלה לכל רשימה
+DOCUMENTS_TABLE = "documents"
+ENTITY_TABLES = ("owners", "mortgages", "remarks")
+
+# מפתח הרשימה לפי תחילית מזהה השדה
+LIST_FIELD_PREFIXES = {
+    "owner_": "owners",
+    "mortgage_": "mortgages",
+    "remark_": "remarks"
+}
+
+
+def _scalar_accessor(field_id):
+    """
+    Args:
+        field_id (str): מזהה שדה כללי
+
+    Returns:
+        callable: פונקציה שמחזירה את ערך השדה מנתוני החילוץ (מחרוזת ריקה אם חסר)
+    """
+    def accessor(data):
+        return data.get(field_id, "")
+
+    return accessor
+
+
+def _list_accessor(list_key, value_key):
+    """
+    Args:
+        list_key (str): מפתח הרשימה בנתוני החילוץ (owners, mortgages, remarks)
+        value_key (str): מפתח הערך בכל רשומה (None - שדה לא מוכר)
+
+    Returns:
+        callable: פונקציה שמחזירה את ערכי הרשומות מופרדים בפסיקים, או None אם הרשימה ריקה
+    """
+    def accessor(data):
+        entries = data.get(list_key)
+        if not entries:
+            return None
+
+        if value_key is None:
+            return ""
+
+        return ", ".join([str(value) for entry in entries if (value := entry.get(value_key))])
+
+    return accessor
+
+
+class ColumnPlan:
+    """
+    תוכנית עמודות מהודרת - כותרות העמודות ופונקציית גישה לכל עמודה, מחושבות פעם אחת
+    מהשדות שנבחרו ומשותפות לטבלת התוצאות ולכל פורמטי הייצוא.
+
+    העמודה הראשונה היא תמיד שם הקובץ, ואחריה (בייצוא) גיבוב תוכן הקובץ ועמודה לכל שדה
+    לפי סדר הבחירה. ערך של שדה רשימה הוא ערכי כל הרשומות מופרדים בפסיקים, או None אם
+    אין רשומות.
+    """
+
+    def __init__(self, selected_field_ids, content_hash=False):
+        """
+        הידור תוכנית העמודות.
+
+        Args:
+            selected_field_ids (iterable): מזהי השדות שנבחרו, לפי סדר העמודות
+            content_hash (bool, optional): האם לכלול את עמודת גיבוב תוכן הקובץ (בקבצי ייצוא)
+        """
+        self.field_ids = tuple(selected_field_ids)
+        self.content_hash = content_hash
+
+        leading_headers = [FILE_NAME_HEADER, CONTENT_HASH_HEADER] if content_hash else [FILE_NAME_HEADER]
+        self.first_field_column = len(leading_headers)
+
+        self.headers = leading_headers + [FIELD_ID_TO_NAME.get(field_id, field_id) for field_id in self.field_ids]
+        self.accessors = [self._compile_accessor(field_id) for field_id in self.field_ids]
+
+        # עמודת מספר הנסח (מפתח המיזוג), או None אם לא נבחרה
+        self.merge_key_column = (
+            self.field_ids.index(MERGE_KEY_FIELD) + self.first_field_column if MERGE_KEY_FIELD in self.field_ids
+            else None
+        )
+
+    @staticmethod
+    def _compile_accessor(field_id):
+        """
+        Args:
+            field_id (str): מזהה השדה
+
+        Returns:
+            callable: פונקציית הגישה לערך השדה בנתוני החילוץ
+        """
+        if field_id in LIST_FIELD_KEYS:
+            return _list_accessor(*LIST_FIELD_KEYS[field_id])
+
+        for prefix, list_key in LIST_FIELD_PREFIXES.items():
+            if field_id.startswith(prefix):
+                return _list_accessor(list_key, None)
+
+        return _scalar_accessor(field_id)
+
+    @staticmethod
+    def is_list_field(field_id):
+        """
+        Args:
+            field_id (str): מזהה השדה
+
+        Returns:
+            bool: האם השדה מוצג כרשימת ערכים (בעלים, משכנתאות, הערות)
+        """
+        return field_id.startswith(tuple(LIST_FIELD_PREFIXES))
+
+    def row_values(self, result):
+        """
+        Args:
+            result (ExtractionResult): תוצאת החילוץ
+
+        Returns:
+            list: ערכי השורה לפי סדר העמודות (שם הקובץ, גיבוב התוכן אם נכלל, ואחריהם השדות)
+        """
+        data = result.data
+        if self.content_hash:
+            return [result.file_name, result.file_hash or ""] + [accessor(data) for accessor in self.accessors]
+        return [result.file_name] + [accessor(data) for accessor in self.accessors]
+
+    def row_dict(self, result):
+        """
+        Args:
+            result (ExtractionResult): תוצאת החילוץ
+
+        Returns:
+            dict: שורה {כותרת: ערך} - ללא עמודות של שדות רשימה ריקים
+        """
+        return {header: value for header, value in zip(self.headers, self.row_values(result)) if value is not None}
+
+    def display_value(self, result, column):
+        """
+        Args:
+            result (ExtractionResult): תוצאת החילוץ
+            column (int): מספר העמודה (0 - שם הקובץ)
+
+        Returns:
+            str: הטקסט להצגה בתא
+        """
+        if column == 0:
+            return result.file_name
+        if column < self.first_field_column:
+            return result.file_hash or ""
+
+        value = self.accessors[column - self.first_field_column](result.data)
+        return "" if value is None else str(value)
+
+    def row_key(self, row):
+        """
+        מפתח השורה למיזוג עם ייצוא קיים - מספר הנסח אם הוא בין העמודות ואינו ריק,
+        ואחרת גיבוב תוכן הקובץ. שם הקובץ אינו משמש כמפתח - שני קבצים שונים עשויים
+        לשאת אותו שם בתיקיות שונות.
+
+        Args:
+            row (list): ערכי השורה לפי סדר העמודות (כמו ב-row_values, עם גיבוב התוכן)
+
+        Returns:
+            tuple: (סוג המפתח, ערך המפתח)
+
+        Raises:
+            ValueError: אם אין לשורה מספר נסח ולא גיבוב תוכן
+        """
+        if self.merge_key_column is not None:
+            nesach_number = row[self.merge_key_column]
+            if nesach_number not in (None, ""):
+                return MERGE_KEY_FIELD, str(nesach_number)
+
+        if self.content_hash and row[1] not in (None, ""):
+            return "content_hash", str(row[1])
+
+        raise ValueError(f"Cannot identify the row of {row[0]} for merging (no nesach number or content hash)")
+
+    def __len__(self):
+        return len(self.headers)
+
+
+class TablePlan:
+    """
+    תוכנית טבלאות מהודרת לייצוא מנורמל - טבלת מסמכים עם השדות הכלליים, וטבלה
+    נפרדת לכל רשימה שנבחרו ממנה שדות (בעלים, משכנתאות, הערות) עם שורה לכל רשומה.
+
+    כל שורה מתחילה במזהה המסמך - נתיב הקובץ, ייחודי לכל שורה בטבלת המסמכים - כך שניתן
+    לחבר את הטבלאות זו לזו בלי לפרק מחדש ערכים מופרדים בפסיקים. גיבוב תוכן הקובץ נשמר
+    בעמודה נפרדת בטבלת המסמכים (קבצים זהים בנתיבים שונים - אותו גיבוב, מזהים שונים).
+    """
+
+    def __init__(self, selected_field_ids):
+        """
+        הידור תוכנית הטבלאות.
+
+        Args:
+            selected_field_ids (iterable): מזהי השדות שנבחרו, לפי סדר העמודות
+        """
+        self.field_ids = tuple(selected_field_ids)
+        self.document_field_ids = tuple(
+            field_id for field_id in self.field_ids if not ColumnPlan.is_list_field(field_id)
+        )
+
+        # מפתחות הערך של כל רשימה, לפי סדר הבחירה
+        entry_keys = {}
+        entry_headers = {}
+        for field_id in self.field_ids:
+            if field_id in LIST_FIELD_KEYS:
+                list_key, value_key = LIST_FIELD_KEYS[field_id]
+                entry_keys.setdefault(list_key, []).append(value_key)
+                entry_headers.setdefault(list_key, []).append(FIELD_ID_TO_NAME.get(field_id, field_id))
+
+        self.entry_keys = {table: tuple(entry_keys[table]) for table in ENTITY_TABLES if table in entry_keys}
+
+        self.headers = {
+            DOCUMENTS_TABLE: [DOCUMENT_KEY_HEADER, FILE_NAME_HEADER, CONTENT_HASH_HEADER] + [
+                FIELD_ID_TO_NAME.get(field_id, field_id) for field_id in self.document_field_ids
+            ]
+        }
+        for table in self.entry_keys:
+            self.headers[table] = [DOCUMENT_KEY_HEADER, ENTRY_NUMBER_HEADER] + entry_headers[table]
+
+    @property
+    def tables(self):
+        """
+        Returns:
+            list: שמות הטבלאות לפי סדרן
+        """
+        return list(self.headers)
+
+    @staticmethod
+    def document_key(result):
+        """
+        Args:
+            result (ExtractionResult): תוצאת החילוץ
+
+        Returns:
+            str: מזהה המסמך שמחבר בין הטבלאות (נתיב הקובץ)
+        """
+        return result.file_path
+
+    def iter_rows(self, result):
+        """
+        מעבר על שורות כל הטבלאות עבור תוצאת חילוץ אחת.
+
+        Args:
+            result (ExtractionResult): תוצאת החילוץ
+
+        Yields:
+            tuple: (שם הטבלה, ערכי השורה לפי סדר העמודות)
+        """
+        data = result.data
+        document_key = self.document_key(result)
+
+        yield DOCUMENTS_TABLE, [document_key, result.file_name, result.file_hash or ""] + [
+            data.get(field_id, "") for field_id in self.document_field_ids
+        ]
+
+        for table, value_keys in self.entry_keys.items():
+            for entry_number, entry in enumerate(data.get(table) or (), 1):
+                yield table, [document_key, entry_number] + [entry.get(value_key, "") for value_key in value_keys]
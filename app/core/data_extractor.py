@@ -5,30 +5,77 @@
 """
 
 import re
-from app.utils.regex_patterns import PATTERNS
+import time
+
+from app.config.constants import REGEX_TIME_BUDGET_SECONDS
+from app.core.extraction_plan import ExtractionPlan, SUPPORTS_TIMEOUT
+from app.core.section_index import SectionIndex
 from app.utils.logger import get_logger
 
 logger = get_logger(__name__)
 
+# גרסת לוגיקת החילוץ - יש להעלות אותה בכל שינוי שמשפיע על התוצאות (פוסלת תוצאות שמורות)
+EXTRACTOR_VERSION = 1
+
+# זיהוי סוג מספר הזיהוי של בעלים
+ID_NUMBER_PATTERN = re.compile(r'^\d+$')
+COMPANY_NUMBER_PATTERN = re.compile(r'^\d{3,9}$')
+
+# זמן מינימלי (בשניות) לכל הרצת ביטוי גם לאחר שמגבלת הזמן של המסמך נוצלה
+MIN_REGEX_TIMEOUT_SECONDS = 0.05
+
+# הודעת השגיאה לשדה שחילוצו חרג ממגבלת הזמן
+TIMEOUT_ERROR_MESSAGE = "חריגה ממגבלת הזמן בחילוץ השדה"
+
+
+class RegexTimeBudget:
+    """
+    מגבלת זמן להרצת הביטויים הרגולריים על מסמך אחד. הזמן משותף לכל השדות במסמך,
+    כך שמסמך פגום אחד לא יכול לעכב את כל האצווה.
+    """
+
+    def __init__(self, seconds):
+        """
+        Args:
+            seconds (float): הזמן הכולל המותר (None או 0 - ללא הגבלה)
+        """
+        self.deadline = time.monotonic() + seconds if seconds else None
+
+    def kwargs(self):
+        """
+        Returns:
+            dict: פרמטרי הרצה לביטוי (timeout עם הזמן שנותר, או ריק אם המנוע אינו תומך)
+        """
+        if self.deadline is None or not SUPPORTS_TIMEOUT:
+            return {}
+
+        return {"timeout": max(self.deadline - time.monotonic(), MIN_REGEX_TIMEOUT_SECONDS)}
+
 
 class DataExtractor:
     """
     אחראי על חילוץ מידע מובנה מטקסט של נסח טאבו באמצעות ביטויים רגולריים וניתוח טקסט.
     """
 
-    def __init__(self):
+    def __init__(self, time_budget=REGEX_TIME_BUDGET_SECONDS):
         """
         אתחול מחלץ הנתונים.
+
+        Args:
+            time_budget (float, optional): מגבלת הזמן בשניות להרצת הביטויים על כל מסמך
         """
-        self.patterns = PATTERNS
+        self.time_budget = time_budget
 
-    def extract_data_from_text(self, text_content, extraction_config):
+    def extract_data_from_text(self, text_content, extraction_config, field_errors=None):
         """
         חילוץ מידע מטקסט של נסח טאבו לפי תצורת החילוץ שהוגדרה.
 
+        שדה (או חלק במסמך) שחילוצו חורג ממגבלת הזמן מדולג, והשגיאה נרשמת ב-field_errors.
+
         Args:
             text_content (str): הטקסט של הנסח
-            extraction_config (ExtractionConfig): תצורת החילוץ
+            extraction_config (ExtractionConfig או ExtractionPlan): תצורת החילוץ או תוכנית מהודרת
+            field_errors (dict, optional): דיקשנרי שיעודכן בשגיאות החילוץ של שדות בודדים
 
         Returns:
             dict: מידע מובנה שחולץ מהטקסט
@@ -39,18 +86,29 @@ class DataExtractor:
         # התוצאה תכיל את כל הנתונים שחולצו
         result = {}
 
+        if field_errors is None:
+            field_errors = {}
+
+        budget = RegexTimeBudget(self.time_budget)
+
         try:
+            plan = ExtractionPlan.from_config(extraction_config)
+
             # חילוץ נתונים כלליים
-            self._extract_general_data(text_content, result, extraction_config)
+            self._extract_general_data(text_content, result, plan, budget, field_errors)
+
+            # אינדקס חלקי המסמך - מחושב פעם אחת ומשותף לכל החלקים
+            if plan.sections:
+                section_index = SectionIndex(text_content)
 
-            # חילוץ נתוני בעלים
-            self._extract_owners_data(text_content, result, extraction_config)
+                # חילוץ נתוני בעלים
+                self._extract_owners_data(text_content, result, plan, section_index, budget, field_errors)
 
-            # חילוץ נתוני משכנתאות
-            self._extract_mortgages_data(text_content, result, extraction_config)
+                # חילוץ נתוני משכנתאות
+                self._extract_mortgages_data(text_content, result, plan, section_index, budget, field_errors)
 
-            # חילוץ נתוני הערות
-            self._extract_remarks_data(text_content, result, extraction_config)
+                # חילוץ נתוני הערות
+                self._extract_remarks_data(text_content, result, plan, section_index, budget, field_errors)
 
             return result
 
@@ -58,82 +116,138 @@ class DataExtractor:
             logger.error(f"Error extracting data from text: {str(e)}")
             return result
 
-    def _extract_general_data(self, text_content, result, extraction_config):
+    def _extract_general_data(self, text_content, result, plan, budget, field_errors):
         """
         חילוץ נתונים כלליים מהטקסט.
 
         Args:
             text_content (str): הטקסט המלא
             result (dict): דיקשנרי התוצאות שיעודכן
-            extraction_config (ExtractionConfig): תצורת החילוץ
+            plan (ExtractionPlan): תוכנית החילוץ
+            budget (RegexTimeBudget): מגבלת הזמן של המסמך
+            field_errors (dict): דיקשנרי שגיאות השדות שיעודכן
         """
-        # מספר נסח
-        if 'nesach_number' in extraction_config.selected_field_ids:
-            match = re.search(self.patterns['nesach_number'], text_content)
-            if match:
-                result['nesach_number'] = match.group(1).strip()
+        # מספר נסח, תאריך הפקה, גוש, חלקה, שטח, רשות מקומית וסוג מקרקעין
+        for field_id, match in self._find_general_fields(text_content, plan, budget, field_errors).items():
+            result[field_id] = match.group(1).strip()
 
-        # תאריך הפקה
-        if 'date' in extraction_config.selected_field_ids:
-            match = re.search(self.patterns['date'], text_content)
-            if match:
-                result['date'] = match.group(1).strip()
+    def _find_general_fields(self, text_content, plan, budget, field_errors, field_ids=None):
+        """
+        איתור ההתאמה הראשונה של כל שדה כללי שנבחר.
 
-        # גוש
-        if 'gush' in extraction_config.selected_field_ids:
-            match = re.search(self.patterns['gush'], text_content)
-            if match:
-                result['gush'] = match.group(1).strip()
+        שדות שהביטוי שלהם מתחיל במילה קבועה נמצאים בחיפוש הביטוי המהודר, שמדלג על
+        הטקסט לפי התחילית. שדות שמתחילים בחלופות נסרקים לפי מילות העוגן שלהם בחיפוש
+        מחרוזת, כשכל מילה מחפשת רק עד ההתאמה הטובה ביותר שנמצאה. כל שדה מפסיק להיסרק
+        מיד עם ההתאמה הראשונה שלו. שדה שחורג ממגבלת הזמן נרשם ב-field_errors ומדולג.
 
-        # חלקה
-        if 'helka' in extraction_config.selected_field_ids:
-            match = re.search(self.patterns['helka'], text_content)
-            if match:
-                result['helka'] = match.group(1).strip()
+        Args:
+            text_content (str): הטקסט המלא
+            plan (ExtractionPlan): תוכנית החילוץ
+            budget (RegexTimeBudget): מגבלת הזמן של המסמך
+            field_errors (dict): דיקשנרי שגיאות השדות שיעודכן
+            field_ids (iterable, optional): השדות לחיפוש (ברירת מחדל - כל השדות הכלליים בתוכנית)
 
-        # שטח במ"ר
-        if 'area' in extraction_config.selected_field_ids:
-            match = re.search(self.patterns['area'], text_content)
-            if match:
-                result['area'] = match.group(1).strip()
+        Returns:
+            dict: ההתאמה הראשונה של כל שדה שנמצא {מזהה שדה: Match}
+        """
+        matches = {}
+
+        for field_id in plan.general_field_ids if field_ids is None else field_ids:
+            pattern = plan.patterns[field_id]
+            anchors = plan.general_anchors.get(field_id)
+
+            try:
+                if anchors is None:
+                    match = pattern.search(text_content, **budget.kwargs())
+                else:
+                    match = None
+                    end = len(text_content)
+
+                    for anchor in anchors:
+                        pos = text_content.find(anchor, 0, end)
+                        while pos != -1:
+                            candidate = pattern.match(text_content, pos, **budget.kwargs())
+                            if candidate:
+                                # התאמה מוקדמת יותר - העוגנים הבאים יחפשו רק עד כאן
+                                match = candidate
+                                end = pos
+                                break
+                            pos = text_content.find(anchor, pos + 1, end)
+
+            except TimeoutError:
+                self._record_timeout(field_errors, field_id)
+                continue
 
-        # רשות מקומית
-        if 'authority' in extraction_config.selected_field_ids:
-            match = re.search(self.patterns['authority'], text_content)
             if match:
-                result['authority'] = match.group(1).strip()
+                matches[field_id] = match
 
-        # סוג מקרקעין
-        if 'land_type' in extraction_config.selected_field_ids:
-            match = re.search(self.patterns['land_type'], text_content)
-            if match:
-                result['land_type'] = match.group(1).strip()
+        return matches
+
+    def is_resolved(self, text_content, plan, resolved):
+        """
+        בדיקה אם טקסט חלקי (העמודים הראשונים של המסמך) כבר מכיל את הערכים הסופיים של
+        כל השדות והחלקים שנבחרו, כך שהוספת עמודים נוספים לא תשנה את תוצאת החילוץ.
 
-    def _extract_owners_data(self, text_content, result, extraction_config):
+        שדה כללי סופי כשההתאמה הראשונה שלו מסתיימת לפני סוף הטקסט (אחרת הערך עשוי
+        להימשך בעמוד הבא). חלק במסמך סופי כשהוא נסגר בכותרת מסיימת - חלק ההערות,
+        שאין לו כותרת מסיימת, אינו סופי לעולם.
+
+        Args:
+            text_content (str): הטקסט של העמודים שנקראו עד כה
+            plan (ExtractionPlan): תוכנית החילוץ
+            resolved (set): השדות והחלקים שכבר נמצאו סופיים - מתעדכן ונשמר בין הקריאות
+
+        Returns:
+            bool: האם כל השדות והחלקים שנבחרו סופיים
+
+        Raises:
+            TimeoutError: אם חיפוש השדות חרג ממגבלת הזמן
+        """
+        pending_fields = [field_id for field_id in plan.general_field_ids if field_id not in resolved]
+
+        if pending_fields:
+            field_errors = {}
+            matches = self._find_general_fields(text_content, plan, RegexTimeBudget(self.time_budget),
+                                                field_errors, pending_fields)
+            if field_errors:
+                raise TimeoutError("regex time budget exceeded while resolving fields")
+
+            resolved.update(field_id for field_id, match in matches.items() if match.end() < len(text_content))
+
+        pending_sections = [section for section in plan.sections if section not in resolved]
+
+        if pending_sections:
+            section_index = SectionIndex(text_content)
+            resolved.update(section for section in pending_sections if section_index.is_closed(section))
+
+        return len(resolved) == len(plan.general_field_ids) + len(plan.sections)
+
+    def _extract_owners_data(self, text_content, result, plan, section_index, budget, field_errors):
         """
         חילוץ נתוני בעלים מהטקסט.
 
         Args:
             text_content (str): הטקסט המלא
             result (dict): דיקשנרי התוצאות שיעודכן
-            extraction_config (ExtractionConfig): תצורת החילוץ
+            plan (ExtractionPlan): תוכנית החילוץ
+            section_index (SectionIndex): אינדקס חלקי המסמך
+            budget (RegexTimeBudget): מגבלת הזמן של המסמך
+            field_errors (dict): דיקשנרי שגיאות השדות שיעודכן
         """
-        owners_ids = {'owner_name', 'owner_id', 'owner_id_type', 'owner_share'}
-
         # בדיקה אם נדרש לחלץ נתוני בעלים
-        if not owners_ids.intersection(extraction_config.selected_field_ids):
+        if "owners" not in plan.sections:
             return
 
         try:
             # חיפוש חלק בטקסט שמכיל את רשימת הבעלים
-            owners_section = re.search(self.patterns['owners_section'], text_content, re.DOTALL)
+            owners_section = section_index.span("owners")
 
             if owners_section:
-                owners_text = owners_section.group(0)
                 owners = []
 
                 # התבנית מחפשת את הבעלים, מספר הזיהוי, סוג הזיהוי והחלק בנכס
-                owner_pattern = re.finditer(self.patterns['owner_entry'], owners_text, re.DOTALL)
+                owner_pattern = plan.patterns['owner_entry'].finditer(
+                    text_content, *owners_section, **budget.kwargs())
 
                 for match in owner_pattern:
                     owner_name = match.group(1).strip() if match.group(1) else ""
@@ -142,22 +256,22 @@ class DataExtractor:
 
                     owner_entry = {}
 
-                    if 'owner_name' in extraction_config.selected_field_ids:
+                    if 'owner_name' in plan.selected_field_ids:
                         owner_entry['name'] = owner_name
 
-                    if 'owner_id' in extraction_config.selected_field_ids:
+                    if 'owner_id' in plan.selected_field_ids:
                         owner_entry['id_number'] = id_number
 
-                    if 'owner_id_type' in extraction_config.selected_field_ids:
+                    if 'owner_id_type' in plan.selected_field_ids:
                         # קביעת סוג זיהוי בהתאם לפורמט
-                        if re.match(r'^\d+$', id_number):
+                        if ID_NUMBER_PATTERN.match(id_number):
                             owner_entry['id_type'] = "ת.ז"
-                        elif re.match(r'^\d{3,9}$', id_number):
+                        elif COMPANY_NUMBER_PATTERN.match(id_number):
                             owner_entry['id_type'] = "חברה"
                         else:
                             owner_entry['id_type'] = "אחר"
 
-                    if 'owner_share' in extraction_config.selected_field_ids:
+                    if 'owner_share' in plan.selected_field_ids:
                         owner_entry['share'] = share
 
                     owners.append(owner_entry)
@@ -165,34 +279,39 @@ class DataExtractor:
                 if owners:
                     result['owners'] = owners
 
+        except TimeoutError:
+            # רשומות שחולצו לפני החריגה אינן נשמרות - רשימה חלקית עלולה להטעות
+            self._record_timeout(field_errors, "owners")
+
         except Exception as e:
             logger.error(f"Error extracting owners data: {str(e)}")
 
-    def _extract_mortgages_data(self, text_content, result, extraction_config):
+    def _extract_mortgages_data(self, text_content, result, plan, section_index, budget, field_errors):
         """
         חילוץ נתוני משכנתאות מהטקסט.
 
         Args:
             text_content (str): הטקסט המלא
             result (dict): דיקשנרי התוצאות שיעודכן
-            extraction_config (ExtractionConfig): תצורת החילוץ
+            plan (ExtractionPlan): תוכנית החילוץ
+            section_index (SectionIndex): אינדקס חלקי המסמך
+            budget (RegexTimeBudget): מגבלת הזמן של המסמך
+            field_errors (dict): דיקשנרי שגיאות השדות שיעודכן
         """
-        mortgage_ids = {'mortgage_holder', 'mortgage_amount', 'mortgage_rank'}
-
         # בדיקה אם נדרש לחלץ נתוני משכנתאות
-        if not mortgage_ids.intersection(extraction_config.selected_field_ids):
+        if "mortgages" not in plan.sections:
             return
 
         try:
             # חיפוש חלק בטקסט שמכיל את רשימת המשכנתאות
-            mortgages_section = re.search(self.patterns['mortgages_section'], text_content, re.DOTALL)
+            mortgages_section = section_index.span("mortgages")
 
             if mortgages_section:
-                mortgages_text = mortgages_section.group(0)
                 mortgages = []
 
                 # חיפוש פרטי כל משכנתה
-                mortgage_pattern = re.finditer(self.patterns['mortgage_entry'], mortgages_text, re.DOTALL)
+                mortgage_pattern = plan.patterns['mortgage_entry'].finditer(
+                    text_content, *mortgages_section, **budget.kwargs())
 
                 for match in mortgage_pattern:
                     bank_name = match.group(1).strip() if match.group(1) else ""
@@ -201,13 +320,13 @@ class DataExtractor:
 
                     mortgage_entry = {}
 
-                    if 'mortgage_holder' in extraction_config.selected_field_ids:
+                    if 'mortgage_holder' in plan.selected_field_ids:
                         mortgage_entry['holder'] = bank_name
 
-                    if 'mortgage_rank' in extraction_config.selected_field_ids:
+                    if 'mortgage_rank' in plan.selected_field_ids:
                         mortgage_entry['rank'] = rank
 
-                    if 'mortgage_amount' in extraction_config.selected_field_ids:
+                    if 'mortgage_amount' in plan.selected_field_ids:
                         mortgage_entry['amount'] = amount
 
                     mortgages.append(mortgage_entry)
@@ -215,34 +334,39 @@ class DataExtractor:
                 if mortgages:
                     result['mortgages'] = mortgages
 
+        except TimeoutError:
+            # רשומות שחולצו לפני החריגה אינן נשמרות - רשימה חלקית עלולה להטעות
+            self._record_timeout(field_errors, "mortgages")
+
         except Exception as e:
             logger.error(f"Error extracting mortgages data: {str(e)}")
 
-    def _extract_remarks_data(self, text_content, result, extraction_config):
+    def _extract_remarks_data(self, text_content, result, plan, section_index, budget, field_errors):
         """
         חילוץ נתוני הערות מהטקסט.
 
         Args:
             text_content (str): הטקסט המלא
             result (dict): דיקשנרי התוצאות שיעודכן
-            extraction_config (ExtractionConfig): תצורת החילוץ
+            plan (ExtractionPlan): תוכנית החילוץ
+            section_index (SectionIndex): אינדקס חלקי המסמך
+            budget (RegexTimeBudget): מגבלת הזמן של המסמך
+            field_errors (dict): דיקשנרי שגיאות השדות שיעודכן
         """
-        remark_ids = {'remark_type', 'remark_content'}
-
         # בדיקה אם נדרש לחלץ נתוני הערות
-        if not remark_ids.intersection(extraction_config.selected_field_ids):
+        if "remarks" not in plan.sections:
             return
 
         try:
             # חיפוש חלק בטקסט שמכיל את רשימת ההערות
-            remarks_section = re.search(self.patterns['remarks_section'], text_content, re.DOTALL)
+            remarks_section = section_index.span("remarks")
 
             if remarks_section:
-                remarks_text = remarks_section.group(0)
                 remarks = []
 
                 # חיפוש פרטי כל הערה
-                remark_pattern = re.finditer(self.patterns['remark_entry'], remarks_text, re.DOTALL)
+                remark_pattern = plan.patterns['remark_entry'].finditer(
+                    text_content, *remarks_section, **budget.kwargs())
 
                 for match in remark_pattern:
                     remark_type = match.group(1).strip() if match.group(1) else ""
@@ -250,10 +374,10 @@ class DataExtractor:
 
                     remark_entry = {}
 
-                    if 'remark_type' in extraction_config.selected_field_ids:
+                    if 'remark_type' in plan.selected_field_ids:
                         remark_entry['type'] = remark_type
 
-                    if 'remark_content' in extraction_config.selected_field_ids:
+                    if 'remark_content' in plan.selected_field_ids:
                         remark_entry['content'] = beneficiary
 
                     remarks.append(remark_entry)
@@ -261,5 +385,20 @@ class DataExtractor:
                 if remarks:
                     result['remarks'] = remarks
 
+        except TimeoutError:
+            # רשומות שחולצו לפני החריגה אינן נשמרות - רשימה חלקית עלולה להטעות
+            self._record_timeout(field_errors, "remarks")
+
         except Exception as e:
-            logger.error(f"Error extracting remarks data: {str(e)}")
\ No newline at end of file
+            logger.error(f"Error extracting remarks data: {str(e)}")
+
+    def _record_timeout(self, field_errors, field_id):
+        """
+        רישום חריגה ממגבלת הזמן בחילוץ שדה.
+
+        Args:
+            field_errors (dict): דיקשנרי שגיאות השדות שיעודכן
+            field_id (str): מזהה השדה או החלק במסמך
+        """
+        logger.warning(f"Regex time budget exceeded while extracting {field_id}")
+        field_errors[field_id] = TIMEOUT_ERROR_MESSAGE
\ No newline at end of file
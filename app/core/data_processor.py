@@ -4,25 +4,85 @@
 מודול עיבוד נתונים - אחראי על עיבוד המידע המחולץ ממסמכי PDF.
 """
 
+import asyncio
+import itertools
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor, FIRST_COMPLETED, wait
+from concurrent.futures.process import BrokenProcessPool
+
+from app.config.constants import DEFAULT_MAX_WORKERS
 from app.models.extraction_result import ExtractionResult
 from app.core.pdf_parser import PDFParser
 from app.core.data_extractor import DataExtractor
+from app.core.extraction_plan import ExtractionPlan
+from app.core.isolated_pool import IsolatedWorkerPool
+from app.utils.file_utils import compute_file_hash
 from app.utils.logger import get_logger
 
 logger = get_logger(__name__)
 
+# מעבד הנתונים של תהליך העבודה הנוכחי (מאותחל פעם אחת לכל תהליך במאגר)
+_worker_processor = None
+
+
+def _init_worker(processor):
+    """
+    אתחול תהליך עבודה במאגר התהליכים.
+
+    Args:
+        processor (DataProcessor): מעבד הנתונים שישמש את תהליך העבודה
+    """
+    global _worker_processor
+    _worker_processor = processor
+
+
+def _process_in_worker(pdf_path, plan):
+    """
+    עיבוד קובץ PDF בתוך תהליך עבודה.
+
+    Args:
+        pdf_path (str): נתיב לקובץ ה-PDF
+        plan (ExtractionPlan): תוכנית החילוץ
+
+    Returns:
+        ExtractionResult: תוצאות החילוץ
+    """
+    return _worker_processor.process_pdf_file(pdf_path, plan)
+
 
 class DataProcessor:
     """
     אחראי על תהליך חילוץ ועיבוד המידע מקבצי PDF.
     """
 
-    def __init__(self):
+    def __init__(self, text_cache=None, result_cache=None, lazy_pages=True, async_workers=None):
         """
         אתחול מעבד הנתונים.
+
+        Args:
+            text_cache (TextCache, optional): מטמון הטקסט המחולץ (ללא מטמון אם לא סופק)
+            result_cache (ResultCache, optional): מטמון תוצאות החילוץ (ללא מטמון אם לא סופק)
+            lazy_pages (bool, optional): האם לקרוא עמודים רק עד שכל השדות שנבחרו נמצאו
+            async_workers (int, optional): מספר תהליכי העבודה בממשק האסינכרוני (ברירת מחדל - מספר המעבדים)
         """
         self.pdf_parser = PDFParser()
         self.data_extractor = DataExtractor()
+        self.text_cache = text_cache
+        self.result_cache = result_cache
+        self.lazy_pages = lazy_pages
+        self.async_workers = async_workers or DEFAULT_MAX_WORKERS
+
+        # מאגר התהליכים של הממשק האסינכרוני והסמפור שמגביל את הקבצים שנשלחים אליו -
+        # נוצרים בשימוש הראשון (ראו _get_async_pool)
+        self._async_pool = None
+        self._async_semaphore = None
+        self._async_loop = None
+
+    def __getstate__(self):
+        # המעבד מועתק לתהליכי העבודה - ללא מאגר התהליכים האסינכרוני (שאינו ניתן להעתקה)
+        state = self.__dict__.copy()
+        state.update(_async_pool=None, _async_semaphore=None, _async_loop=None)
+        return state
 
     def process_pdf_file(self, pdf_path, extraction_config):
         """
@@ -30,28 +90,46 @@ class DataProcessor:
 
         Args:
             pdf_path (str): נתיב לקובץ ה-PDF
-            extraction_config (ExtractionConfig): תצורת החילוץ
+            extraction_config (ExtractionConfig או ExtractionPlan): תצורת החילוץ או תוכנית מהודרת
 
         Returns:
             ExtractionResult: תוצאות החילוץ
         """
         try:
+            plan = ExtractionPlan.from_config(extraction_config)
+
             # יצירת אובייקט תוצאות
             result = ExtractionResult(pdf_path)
 
+            # גיבוב תוכן הקובץ - מפתח המטמונים, ונשמר בתוצאה גם ללא מטמון (עמודת הגיבוב בייצוא)
+            result.file_hash = compute_file_hash(pdf_path)
+
+            # תוצאה שמורה לאותו קובץ, אותם שדות ואותה גרסת חילוץ
+            if self.result_cache is not None:
+                cached_data = self.result_cache.get(result.file_hash, plan.selected_field_ids)
+                result.cache_lookups[self.result_cache.name] = cached_data is not None
+                if cached_data is not None:
+                    result.set_data(cached_data)
+                    return result
+
             # חילוץ טקסט מהקובץ
-            text_content = self.pdf_parser.extract_text_from_pdf(pdf_path)
+            text_content = self._extract_text(pdf_path, result, plan)
 
             if not text_content:
                 result.set_error("לא ניתן לחלץ טקסט מהקובץ")
                 return result
 
             # חילוץ נתונים מהטקסט
-            extracted_data = self.data_extractor.extract_data_from_text(text_content, extraction_config)
+            extracted_data = self.data_extractor.extract_data_from_text(text_content, plan,
+                                                                       field_errors=result.field_errors)
 
             # שמירת הנתונים המחולצים בתוצאה
             result.set_data(extracted_data)
 
+            # תוצאה חלקית (שדות שחרגו ממגבלת הזמן) אינה נשמרת במטמון
+            if self.result_cache is not None and not result.has_field_errors():
+                self.result_cache.put(result.file_hash, plan.selected_field_ids, extracted_data)
+
             return result
 
         except Exception as e:
@@ -63,7 +141,90 @@ class DataProcessor:
 
             return result
 
-    def process_multiple_pdf_files(self, pdf_paths, extraction_config, progress_callback=None):
+    def _extract_text(self, pdf_path, result, plan):
+        """
+        חילוץ הטקסט מקובץ PDF, דרך מטמון הטקסט אם הוגדר.
+
+        Args:
+            pdf_path (str): נתיב לקובץ ה-PDF
+            result (ExtractionResult): תוצאת החילוץ (גיבוב הקובץ ורישום החיפוש במטמון)
+            plan (ExtractionPlan): תוכנית החילוץ (קובעת מתי ניתן להפסיק לקרוא עמודים)
+
+        Returns:
+            str: הטקסט מהקובץ (ייתכן שרק מהעמודים הראשונים), או None במקרה של שגיאה
+        """
+        if self.text_cache is not None:
+            text_content = self.text_cache.get(result.file_hash)
+            result.cache_lookups[self.text_cache.name] = text_content is not None
+            if text_content is not None:
+                return text_content
+
+        if self.lazy_pages:
+            text_content, complete = self._extract_text_lazily(pdf_path, plan)
+        else:
+            text_content, complete = self.pdf_parser.extract_text_from_pdf(pdf_path), True
+
+        # רק טקסט של כל העמודים נשמר - תוכנית אחרת עשויה להזדקק לעמודים שלא נקראו
+        if self.text_cache is not None and text_content and complete:
+            self.text_cache.put(result.file_hash, text_content)
+
+        return text_content
+
+    def _extract_text_lazily(self, pdf_path, plan):
+        """
+        חילוץ הטקסט עמוד אחר עמוד, והפסקת הקריאה ברגע שהעמודים שנקראו מכילים את
+        הערכים הסופיים של כל השדות שנבחרו. החילוץ מהטקסט החלקי זהה לחילוץ מהטקסט המלא.
+
+        Args:
+            pdf_path (str): נתיב לקובץ ה-PDF
+            plan (ExtractionPlan): תוכנית החילוץ
+
+        Returns:
+            tuple: (הטקסט שנקרא או None במקרה של שגיאה, האם נקראו כל העמודים)
+        """
+        try:
+            with self.pdf_parser.open_document(pdf_path) as document:
+                text_content = ""
+                resolved = set()
+                check_resolved = True
+
+                for page_number, page_text in enumerate(document.iter_page_texts(release_pages=True)):
+                    if not page_text:
+                        continue
+
+                    text_content += page_text + "\n\n"
+
+                    if not check_resolved:
+                        continue
+
+                    try:
+                        if self.data_extractor.is_resolved(text_content, plan, resolved):
+                            return text_content, page_number == document.page_count - 1
+
+                    except TimeoutError:
+                        # הבדיקה עצמה חורגת ממגבלת הזמן - קריאת כל העמודים ללא בדיקות נוספות
+                        check_resolved = False
+
+                return text_content, True
+
+        except Exception as e:
+            logger.error(f"Error extracting text from PDF {pdf_path}: {str(e)}")
+            return None, True
+
+    def _record_cache_lookups(self, result):
+        """
+        עדכון מוני המטמונים בתהליך הנוכחי לפי החיפושים שבוצעו בתהליך עבודה (שבו
+        המטמונים הם עותקים, והמונים שלהם אינם חוזרים לתהליך הראשי).
+
+        Args:
+            result (ExtractionResult): תוצאה שהתקבלה מתהליך עבודה
+        """
+        for cache in (self.result_cache, self.text_cache):
+            if cache is not None and cache.name in result.cache_lookups:
+                cache.record_lookup(result.cache_lookups[cache.name])
+
+    def process_multiple_pdf_files(self, pdf_paths, extraction_config, progress_callback=None,
+                                   parallel=False, max_workers=None, isolated=False):
         """
         עיבוד מספר קבצי PDF וחילוץ נתונים מהם.
 
@@ -71,22 +232,91 @@ class DataProcessor:
             pdf_paths (list): רשימת נתיבים לקבצי PDF
             extraction_config (ExtractionConfig): תצורת החילוץ
             progress_callback (callable, optional): פונקציית קולבק לעדכון התקדמות
+            parallel (bool, optional): האם לעבד את הקבצים במקביל במאגר תהליכים
+            max_workers (int, optional): מספר תהליכי העבודה (ברירת מחדל - מספר המעבדים)
+            isolated (bool, optional): האם לעבד בתהליכי עבודה מבודדים עם מגבלת זמן וזיכרון
 
         Returns:
-            list: רשימת תוצאות החילוץ
+            list: רשימת תוצאות החילוץ, בסדר זהה לסדר הקבצים שהתקבלו
         """
-        results = []
+        results = [None] * len(pdf_paths)
         total_files = len(pdf_paths)
 
-        for idx, pdf_path in enumerate(pdf_paths):
+        for completed, (idx, result) in enumerate(
+                self.iter_process(pdf_paths, extraction_config, parallel=parallel,
+                                  max_workers=max_workers, with_index=True, isolated=isolated), 1):
+            results[idx] = result
+
+            # עדכון התקדמות (אם סופק קולבק)
+            if progress_callback:
+                progress_callback(pdf_paths[idx], completed / total_files * 100)
+
+        return results
+
+    def iter_process(self, pdf_paths, extraction_config, parallel=False, max_workers=None,
+                     with_index=False, isolated=False):
+        """
+        עיבוד מספר קבצי PDF והחזרת כל תוצאה מיד עם סיום עיבוד הקובץ.
+
+        בעיבוד מקבילי התוצאות מוחזרות לפי סדר הסיום ולא לפי סדר הקבצים,
+        ומספר הקבצים שנמצאים בעיבוד בו-זמנית מוגבל לחלון קבוע.
+
+        בעיבוד מבודד (isolated) כל קובץ מעובד בתהליך עבודה נפרד מהתהליך הנוכחי (גם
+        בעיבוד טורי - תהליך אחד), עם מגבלת זמן וזיכרון ראו IsolatedWorkerPool. קובץ
+        שחרג מהמגבלות או הפיל את התהליך מוחזר כתוצאה עם שגיאה.
+
+        Args:
+            pdf_paths (list): רשימת נתיבים לקבצי PDF
+            extraction_config (ExtractionConfig): תצורת החילוץ
+            parallel (bool, optional): האם לעבד את הקבצים במקביל במאגר תהליכים
+            max_workers (int, optional): מספר תהליכי העבודה (ברירת מחדל - מספר המעבדים)
+            with_index (bool, optional): האם להחזיר זוגות (אינדקס הקובץ, תוצאה)
+            isolated (bool, optional): האם לעבד בתהליכי עבודה מבודדים עם מגבלת זמן וזיכרון
+
+        Yields:
+            ExtractionResult: תוצאת החילוץ של כל קובץ (או זוג עם האינדקס שלו)
+        """
+        pending = dict(enumerate(pdf_paths))
+
+        # הידור תוכנית החילוץ פעם אחת לכל האצווה (משותפת גם לתהליכי העבודה)
+        plan = ExtractionPlan.from_config(extraction_config)
+
+        if isolated and pending:
+            workers = min(max_workers or DEFAULT_MAX_WORKERS, len(pending)) if parallel else 1
+            try:
+                for idx, result in self._iter_isolated(pending, plan, workers):
+                    yield (idx, result) if with_index else result
+            except OSError as e:
+                # לא ניתן להפעיל אף תהליך עבודה (המאגר מחזיר כישלונות מאוחרים יותר כתוצאות
+                # עם שגיאה) - עיבוד הקבצים באופן טורי
+                logger.warning(f"Isolated workers unavailable, falling back to serial processing: {str(e)}")
+
+        elif parallel and len(pending) > 1:
             try:
-                # עדכון התקדמות (אם סופק קולבק)
-                if progress_callback:
-                    progress_callback(pdf_path, (idx + 1) / total_files * 100)
+                for idx, result in self._iter_parallel(pending, plan, max_workers):
+                    yield (idx, result) if with_index else result
+            except (BrokenProcessPool, OSError) as e:
+                # מאגר התהליכים לא זמין - המשך עיבוד הקבצים שנותרו באופן טורי
+                logger.warning(f"Process pool unavailable, falling back to serial processing: {str(e)}")
 
+        for idx, result in self._iter_serial(pending, plan):
+            yield (idx, result) if with_index else result
+
+    def _iter_serial(self, pending, plan):
+        """
+        עיבוד טורי של הקבצים שטרם עובדו.
+
+        Args:
+            pending (dict): הקבצים שטרם עובדו {אינדקס: נתיב} - מתעדכן במהלך העיבוד
+            plan (ExtractionPlan): תוכנית החילוץ
+
+        Yields:
+            tuple: זוג (אינדקס הקובץ, ExtractionResult)
+        """
+        for idx, pdf_path in list(pending.items()):
+            try:
                 # עיבוד הקובץ הנוכחי
-                result = self.process_pdf_file(pdf_path, extraction_config)
-                results.append(result)
+                result = self.process_pdf_file(pdf_path, plan)
 
             except Exception as e:
                 logger.error(f"Error in process_multiple_pdf_files for {pdf_path}: {str(e)}")
@@ -94,6 +324,230 @@ class DataProcessor:
                 # יצירת תוצאה עם שגיאה
                 result = ExtractionResult(pdf_path)
                 result.set_error(f"שגיאה כללית: {str(e)}")
-                results.append(result)
 
-        return results
\ No newline at end of file
+            del pending[idx]
+            yield idx, result
+
+    def _iter_isolated(self, pending, plan, workers):
+        """
+        עיבוד הקבצים בתהליכי עבודה מבודדים.
+
+        Args:
+            pending (dict): הקבצים שטרם עובדו {אינדקס: נתיב} - מתעדכן במהלך העיבוד
+            plan (ExtractionPlan): תוכנית החילוץ
+            workers (int): מספר תהליכי העבודה
+
+        Yields:
+            tuple: זוג (אינדקס הקובץ, ExtractionResult) לפי סדר סיום העיבוד
+        """
+        with IsolatedWorkerPool(self, plan, workers) as pool:
+            for idx, result in pool.imap_unordered(list(pending.items())):
+                self._record_cache_lookups(result)
+                del pending[idx]
+                yield idx, result
+
+    def _iter_parallel(self, pending, plan, max_workers):
+        """
+        עיבוד מקבילי של הקבצים במאגר תהליכים.
+
+        Args:
+            pending (dict): הקבצים שטרם עובדו {אינדקס: נתיב} - מתעדכן במהלך העיבוד
+            plan (ExtractionPlan): תוכנית החילוץ
+            max_workers (int): מספר תהליכי העבודה
+
+        Yields:
+            tuple: זוג (אינדקס הקובץ, ExtractionResult) לפי סדר סיום העיבוד
+        """
+        workers = min(max_workers or DEFAULT_MAX_WORKERS, len(pending))
+
+        # חלון הקבצים שנשלחים לעיבוד בו-זמנית - מגביל את צריכת הזיכרון
+        window = workers * 2
+        queued = iter(list(pending.items()))
+
+        # שימוש ב-spawn ולא ב-fork - התהליך הראשי עשוי להריץ תהליכוני Qt
+        context = multiprocessing.get_context("spawn")
+        executor = ProcessPoolExecutor(max_workers=workers, mp_context=context,
+                                       initializer=_init_worker, initargs=(self,))
+
+        try:
+            in_flight = {}
+            for idx, pdf_path in itertools.islice(queued, window):
+                in_flight[executor.submit(_process_in_worker, pdf_path, plan)] = idx
+
+            while in_flight:
+                done, _ = wait(in_flight, return_when=FIRST_COMPLETED)
+
+                for future in done:
+                    idx = in_flight.pop(future)
+                    pdf_path = pending[idx]
+
+                    try:
+                        result = future.result()
+                        self._record_cache_lookups(result)
+
+                    except BrokenProcessPool:
+                        raise
+
+                    except Exception as e:
+                        logger.error(f"Error in process_multiple_pdf_files for {pdf_path}: {str(e)}")
+
+                        # יצירת תוצאה עם שגיאה
+                        result = ExtractionResult(pdf_path)
+                        result.set_error(f"שגיאה כללית: {str(e)}")
+
+                    # שליחת הקובץ הבא בתור במקום הקובץ שהסתיים
+                    for next_idx, next_path in itertools.islice(queued, 1):
+                        in_flight[executor.submit(_process_in_worker, next_path, plan)] = next_idx
+
+                    del pending[idx]
+                    yield idx, result
+
+        finally:
+            # ביטול קבצים שטרם התחילו אם הצרכן הפסיק לקרוא תוצאות
+            executor.shutdown(wait=True, cancel_futures=True)
+
+    def _get_async_pool(self):
+        """
+        מאגר התהליכים והסמפור של הממשק האסינכרוני, נוצרים בשימוש הראשון.
+
+        הסמפור מוגבל למספר תהליכי העבודה, כך שכל קובץ שנשלח למאגר מתחיל לרוץ מיד,
+        וקבצים שממתינים נשארים בסמפור - שם ביטול המשימה מסיר אותם מיידית.
+
+        Returns:
+            tuple: (ProcessPoolExecutor, asyncio.Semaphore)
+        """
+        if self._async_pool is None:
+            # spawn כמו בעיבוד המקבילי - התהליך הראשי עשוי להריץ תהליכוני Qt
+            context = multiprocessing.get_context("spawn")
+            self._async_pool = ProcessPoolExecutor(max_workers=self.async_workers, mp_context=context,
+                                                   initializer=_init_worker, initargs=(self,))
+
+        # סמפור של asyncio שייך ללולאת האירועים שבה נוצר
+        loop = asyncio.get_running_loop()
+        if self._async_loop is not loop:
+            self._async_semaphore = asyncio.Semaphore(self.async_workers)
+            self._async_loop = loop
+
+        return self._async_pool, self._async_semaphore
+
+    async def aprocess(self, pdf_path, extraction_config):
+        """
+        עיבוד קובץ PDF במאגר התהליכים בלי לחסום את לולאת האירועים.
+
+        ביטול המשימה בזמן שהקובץ ממתין לתהליך פנוי מונע את עיבודו. קובץ שכבר רץ
+        בתהליך עבודה מסתיים שם (התוצאה נזרקת), והמקום שלו מתפנה רק בסיום, כך
+        שמספר הקבצים שרצים בפועל לעולם אינו עולה על מספר התהליכים.
+
+        Args:
+            pdf_path (str): נתיב לקובץ ה-PDF
+            extraction_config (ExtractionConfig או ExtractionPlan): תצורת החילוץ או תוכנית מהודרת
+
+        Returns:
+            ExtractionResult: תוצאות החילוץ (שגיאות נרשמות בתוצאה)
+        """
+        plan = ExtractionPlan.from_config(extraction_config)
+        pool, semaphore = self._get_async_pool()
+        loop = asyncio.get_running_loop()
+
+        await semaphore.acquire()
+
+        def release_slot(_):
+            try:
+                loop.call_soon_threadsafe(semaphore.release)
+            except RuntimeError:
+                # לולאת האירועים כבר נסגרה
+                pass
+
+        try:
+            try:
+                future = pool.submit(_process_in_worker, pdf_path, plan)
+            except BaseException:
+                semaphore.release()
+                raise
+
+            # המקום בסמפור מתפנה כשהתהליך מסיים, גם אם המשימה בוטלה בינתיים
+            future.add_done_callback(release_slot)
+
+            result = await asyncio.wrap_future(future)
+            self._record_cache_lookups(result)
+            return result
+
+        except BrokenProcessPool as e:
+            logger.error(f"Worker pool crashed while processing {pdf_path}: {str(e)}")
+
+            # המאגר ייווצר מחדש בקריאה הבאה
+            if self._async_pool is pool:
+                self._async_pool = None
+                pool.shutdown(wait=False, cancel_futures=True)
+
+            result = ExtractionResult(pdf_path)
+            result.set_error(f"שגיאה כללית: {str(e)}")
+            return result
+
+        except Exception as e:
+            logger.error(f"Error in aprocess for {pdf_path}: {str(e)}")
+
+            # יצירת תוצאה עם שגיאה
+            result = ExtractionResult(pdf_path)
+            result.set_error(f"שגיאה כללית: {str(e)}")
+            return result
+
+    async def aiter_process(self, pdf_paths, extraction_config, with_index=False):
+        """
+        עיבוד מספר קבצי PDF במאגר התהליכים והחזרת כל תוצאה עם סיום עיבוד הקובץ
+        (async for). התוצאות מוחזרות לפי סדר הסיום, ומשימות נוצרות רק לחלון קבוע
+        של קבצים. יציאה מהלולאה (break) או ביטול המשימה מבטלים את הקבצים שנותרו.
+
+        Args:
+            pdf_paths (iterable): נתיבים לקבצי PDF
+            extraction_config (ExtractionConfig): תצורת החילוץ
+            with_index (bool, optional): האם להחזיר זוגות (אינדקס הקובץ, תוצאה)
+
+        Yields:
+            ExtractionResult: תוצאת החילוץ של כל קובץ (או זוג עם האינדקס שלו)
+        """
+        # הידור תוכנית החילוץ פעם אחת לכל האצווה
+        plan = ExtractionPlan.from_config(extraction_config)
+
+        queued = enumerate(pdf_paths)
+        window = self.async_workers * 2
+        tasks = {}
+
+        def submit(count):
+            for idx, pdf_path in itertools.islice(queued, count):
+                tasks[asyncio.ensure_future(self.aprocess(pdf_path, plan))] = idx
+
+        try:
+            submit(window)
+
+            while tasks:
+                done, _ = await asyncio.wait(tasks, return_when=asyncio.FIRST_COMPLETED)
+
+                for task in done:
+                    idx = tasks.pop(task)
+
+                    # שליחת הקובץ הבא בתור במקום הקובץ שהסתיים
+                    submit(1)
+
+                    result = task.result()
+                    yield (idx, result) if with_index else result
+
+        finally:
+            for task in tasks:
+                task.cancel()
+            if tasks:
+                await asyncio.gather(*tasks, return_exceptions=True)
+
+    def close(self):
+        """
+        עצירת מאגר התהליכים של הממשק האסינכרוני (אם נוצר).
+        """
+        if self._async_pool is not None:
+            self._async_pool.shutdown(wait=True, cancel_futures=True)
+            self._async_pool = None
+
+    async def aclose(self):
+        """
+        עצירת מאגר התהליכים של הממשק האסינכרוני בלי לחסום את לולאת האירועים.
+        """
+        await asyncio.to_thread(self.close)
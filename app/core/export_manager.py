@@ -5,13 +5,40 @@
 """
 
 import os
-import pandas as pd
-from app.config.constants import FIELD_ID_TO_NAME
+import csv
+import json
+import time
+import tempfile
+from contextlib import ExitStack
+
+try:
+    # orjson מהיר פי כמה מ-json בסריאליזציה - בשימוש אם מותקן
+    import orjson
+except ImportError:
+    orjson = None
+
+from app.config.constants import CSV_SINK_FLUSH_INTERVAL_SECONDS, JSONL_SINK_FLUSH_INTERVAL_SECONDS
+from app.models.extraction_result import ExtractionResult
+from app.core.column_plan import ColumnPlan, TablePlan
+from app.core.parquet_export import ParquetSink, SUPPORTS_PARQUET
 from app.utils.logger import get_logger
 
 logger = get_logger(__name__)
 
 
+def _json_line(obj):
+    """
+    Args:
+        obj (dict): אובייקט לסריאליזציה
+
+    Returns:
+        bytes: האובייקט כשורת JSON אחת בקידוד UTF-8, כולל תו סוף השורה
+    """
+    if orjson is not None:
+        return orjson.dumps(obj) + b"\n"
+    return json.dumps(obj, ensure_ascii=False, separators=(",", ":")).encode("utf-8") + b"\n"
+
+
 class ExportManager:
     """
     אחראי על ייצוא נתונים מחולצים לפורמטים שונים.
@@ -23,169 +50,889 @@ class ExportManager:
         """
         pass
 
-    def export_to_excel(self, results, selected_fields, file_path):
+    def export_to_excel(self, results, selected_fields, file_path, progress_callback=None, cancel_event=None):
         """
         ייצוא נתונים לקובץ אקסל.
 
         Args:
-            results (list): רשימת תוצאות החילוץ
+            results (iterable): תוצאות החילוץ (רשימה, או כל איטרטור של ExtractionResult)
             selected_fields (list): רשימת מזהי השדות שנבחרו
             file_path (str): נתיב לקובץ האקסל שייווצר
+            progress_callback (callable, optional): פונקציית קולבק לעדכון התקדמות (אחוזים)
+            cancel_event (threading.Event, optional): אירוע לביטול הייצוא
 
         Returns:
-            bool: האם הייצוא הצליח
+            bool: האם הייצוא הצליח (False גם אם בוטל)
         """
         try:
-            # הכנת הנתונים לייצוא
-            data_rows = self._prepare_data_for_export(results, selected_fields)
+            return self._write_file(
+                file_path,
+                lambda path: self._write_excel_rows(results, selected_fields, path, progress_callback, cancel_event),
+                progress_callback, cancel_event)
 
-            # יצירת DataFrame ושמירה לאקסל
-            df = pd.DataFrame(data_rows)
+        except Exception as e:
+            logger.error(f"Error exporting to Excel: {str(e)}")
+            return False
 
-            # בדיקה אם הקובץ קיים, ואם כן - ניסיון לסגור אותו
-            if os.path.exists(file_path):
-                try:
-                    # נסיון למחוק את הקובץ הקיים
-                    os.remove(file_path)
-                except Exception as e:
-                    logger.error(f"Error removing existing file {file_path}: {str(e)}")
-                    return False
+    def _write_excel_rows(self, results, selected_fields, file_path, progress_callback=None, cancel_event=None):
+        """
+        כתיבת התוצאות לקובץ אקסל בזרימה - כל שורה נכתבת מיד עם בנייתה, בחוברת
+        במצב write-only של openpyxl, כך שצריכת הזיכרון אינה תלויה במספר השורות.
 
-            # שמירה לקובץ אקסל
-            df.to_excel(file_path, index=False)
+        Args:
+            results (iterable): תוצאות החילוץ
+            selected_fields (list): רשימת מזהי השדות שנבחרו
+            file_path (str): נתיב הקובץ שייכתב
+            progress_callback (callable, optional): פונקציית קולבק לעדכון התקדמות (אחוזים)
+            cancel_event (threading.Event, optional): אירוע לביטול הייצוא
+        """
+        # openpyxl נטען רק בייצוא לאקסל
+        from openpyxl import Workbook
 
-            return True
+        column_plan = ColumnPlan(selected_fields, content_hash=True)
 
-        except Exception as e:
-            logger.error(f"Error exporting to Excel: {str(e)}")
-            return False
+        workbook = Workbook(write_only=True)
+        worksheet = workbook.create_sheet("Sheet1")
+        worksheet.append(column_plan.headers)
+
+        for result in self._iter_valid_results(results, progress_callback, cancel_event, 95):
+            worksheet.append(column_plan.row_values(result))
+
+        if self._is_cancelled(cancel_event):
+            # ייצוא שבוטל אינו נשמר - סגירת הגיליון עוצרת את הכתיבה לקובץ הביניים של openpyxl
+            worksheet.close()
+            return
 
-    def export_to_csv(self, results, selected_fields, file_path):
+        workbook.save(file_path)
+
+    def export_to_csv(self, results, selected_fields, file_path, progress_callback=None, cancel_event=None):
         """
         ייצוא נתונים לקובץ CSV.
 
         Args:
-            results (list): רשימת תוצאות החילוץ
+            results (iterable): תוצאות החילוץ (רשימה, או כל איטרטור של ExtractionResult)
             selected_fields (list): רשימת מזהי השדות שנבחרו
             file_path (str): נתיב לקובץ ה-CSV שייווצר
+            progress_callback (callable, optional): פונקציית קולבק לעדכון התקדמות (אחוזים)
+            cancel_event (threading.Event, optional): אירוע לביטול הייצוא
 
         Returns:
-            bool: האם הייצוא הצליח
+            bool: האם הייצוא הצליח (False גם אם בוטל)
         """
         try:
-            # הכנת הנתונים לייצוא
-            data_rows = self._prepare_data_for_export(results, selected_fields)
+            return self._write_file(
+                file_path,
+                lambda path: self._write_csv_rows(results, selected_fields, path, progress_callback, cancel_event),
+                progress_callback, cancel_event)
 
-            # יצירת DataFrame ושמירה ל-CSV
-            df = pd.DataFrame(data_rows)
+        except Exception as e:
+            logger.error(f"Error exporting to CSV: {str(e)}")
+            return False
+
+    def _write_csv_rows(self, results, selected_fields, file_path, progress_callback=None, cancel_event=None):
+        """
+        כתיבת התוצאות לקובץ CSV בזרימה, שורה אחר שורה.
+
+        Args:
+            results (iterable): תוצאות החילוץ
+            selected_fields (list): רשימת מזהי השדות שנבחרו
+            file_path (str): נתיב הקובץ שייכתב
+            progress_callback (callable, optional): פונקציית קולבק לעדכון התקדמות (אחוזים)
+            cancel_event (threading.Event, optional): אירוע לביטול הייצוא
+        """
+        # הקובץ נכתב לקובץ זמני ומוחלף בסיום - אין צורך בשמירה תקופתית לדיסק
+        with CsvSink(file_path, selected_fields, flush_interval=None) as sink:
+            for result in self._iter_valid_results(results, progress_callback, cancel_event, 95):
+                sink.write(result)
 
-            # שמירה לקובץ CSV עם קידוד UTF-8-sig (תומך בעברית)
-            df.to_csv(file_path, index=False, encoding='utf-8-sig')
+    def merge_into_excel(self, results, selected_fields, file_path, progress_callback=None, cancel_event=None):
+        """
+        מיזוג תוצאות לקובץ אקסל קיים שנוצר בייצוא קודם, לפי מספר הנסח (או גיבוב תוכן
+        הקובץ - ראו ColumnPlan.row_key): שורות קיימות של אותם מסמכים מוחלפות, ומסמכים חדשים
+        נוספים בסוף. הקובץ הקיים נקרא ונכתב מחדש בזרימה, שורה אחר שורה.
 
-            return True
+        Args:
+            results (iterable): תוצאות החילוץ החדשות
+            selected_fields (list): רשימת מזהי השדות שנבחרו (חייבים להתאים לעמודות הקובץ)
+            file_path (str): נתיב קובץ האקסל (אם אינו קיים - ייצוא רגיל)
+            progress_callback (callable, optional): פונקציית קולבק לעדכון התקדמות (אחוזים)
+            cancel_event (threading.Event, optional): אירוע לביטול הייצוא
+
+        Returns:
+            bool: האם המיזוג הצליח (False גם אם בוטל או שהעמודות אינן תואמות)
+        """
+        if not os.path.exists(file_path):
+            return self.export_to_excel(results, selected_fields, file_path, progress_callback, cancel_event)
+
+        try:
+            column_plan = ColumnPlan(selected_fields, content_hash=True)
+            pending_rows = self._collect_merge_rows(results, column_plan, progress_callback, cancel_event)
+            if pending_rows is None:
+                return False
+
+            return self._write_file(
+                file_path,
+                lambda path: self._merge_excel_rows(file_path, path, column_plan, pending_rows, cancel_event),
+                progress_callback, cancel_event)
 
         except Exception as e:
-            logger.error(f"Error exporting to CSV: {str(e)}")
+            logger.error(f"Error merging into Excel: {str(e)}")
             return False
 
-    def _prepare_data_for_export(self, results, selected_fields):
+    def _merge_excel_rows(self, source_path, file_path, column_plan, pending_rows, cancel_event=None):
+        """
+        כתיבת קובץ אקסל ממוזג: השורות הקיימות מועתקות (או מוחלפות) ואחריהן המסמכים החדשים.
+
+        Args:
+            source_path (str): נתיב קובץ האקסל הקיים
+            file_path (str): נתיב הקובץ שייכתב
+            column_plan (ColumnPlan): תוכנית העמודות
+            pending_rows (dict): {מפתח: ערכי השורה החדשה}
+            cancel_event (threading.Event, optional): אירוע לביטול הייצוא
+        """
+        from openpyxl import Workbook, load_workbook
+
+        source_workbook = load_workbook(source_path, read_only=True)
+        try:
+            source_rows = source_workbook.worksheets[0].iter_rows(values_only=True)
+            self._check_merge_headers(next(source_rows, None), column_plan, source_path)
+
+            workbook = Workbook(write_only=True)
+            worksheet = workbook.create_sheet("Sheet1")
+            worksheet.append(column_plan.headers)
+
+            for row in self._merged_rows(source_rows, column_plan, pending_rows, cancel_event):
+                worksheet.append(row)
+
+        finally:
+            source_workbook.close()
+
+        if self._is_cancelled(cancel_event):
+            worksheet.close()
+            return
+
+        workbook.save(file_path)
+
+    def merge_into_csv(self, results, selected_fields, file_path, progress_callback=None, cancel_event=None):
+        """
+        מיזוג תוצאות לקובץ CSV קיים שנוצר בייצוא קודם, לפי מספר הנסח (או גיבוב תוכן
+        הקובץ - ראו ColumnPlan.row_key). אם אין שורות קיימות שהשתנו, רק המסמכים החדשים נכתבים
+        לסוף הקובץ; אחרת הקובץ נכתב מחדש בזרימה עם השורות המעודכנות.
+
+        Args:
+            results (iterable): תוצאות החילוץ החדשות
+            selected_fields (list): רשימת מזהי השדות שנבחרו (חייבים להתאים לעמודות הקובץ)
+            file_path (str): נתיב קובץ ה-CSV (אם אינו קיים - ייצוא רגיל)
+            progress_callback (callable, optional): פונקציית קולבק לעדכון התקדמות (אחוזים)
+            cancel_event (threading.Event, optional): אירוע לביטול הייצוא
+
+        Returns:
+            bool: האם המיזוג הצליח (False גם אם בוטל או שהעמודות אינן תואמות)
+        """
+        if not os.path.exists(file_path) or os.path.getsize(file_path) == 0:
+            return self.export_to_csv(results, selected_fields, file_path, progress_callback, cancel_event)
+
+        try:
+            column_plan = ColumnPlan(selected_fields, content_hash=True)
+            pending_rows = self._collect_merge_rows(results, column_plan, progress_callback, cancel_event)
+            if pending_rows is None:
+                return False
+
+            # סריקת הקובץ הקיים: שורות זהות אינן נכתבות שוב, ושורות שהשתנו מחייבות כתיבה מחדש
+            changed_keys = set()
+            with open(file_path, newline='', encoding='utf-8-sig') as csv_file:
+                reader = csv.reader(csv_file)
+                self._check_merge_headers(next(reader, None), column_plan, file_path)
+
+                for idx, row in enumerate(reader, 1):
+                    if idx % 1000 == 0 and self._is_cancelled(cancel_event):
+                        return False
+
+                    key = column_plan.row_key(row)
+                    if key not in pending_rows:
+                        continue
+                    if self._csv_row(pending_rows[key]) == row:
+                        del pending_rows[key]
+                    else:
+                        changed_keys.add(key)
+
+            if not changed_keys:
+                self._append_csv_rows(file_path, pending_rows.values())
+                if progress_callback:
+                    progress_callback(100)
+                return True
+
+            return self._write_file(
+                file_path,
+                lambda path: self._merge_csv_rows(file_path, path, column_plan, pending_rows, cancel_event),
+                progress_callback, cancel_event)
+
+        except Exception as e:
+            logger.error(f"Error merging into CSV: {str(e)}")
+            return False
+
+    def _append_csv_rows(self, file_path, rows):
+        """
+        הוספת שורות לסוף קובץ CSV קיים.
+
+        Args:
+            file_path (str): נתיב קובץ ה-CSV
+            rows (iterable): ערכי השורות
+        """
+        with open(file_path, 'a', newline='', encoding='utf-8') as csv_file:
+            csv.writer(csv_file, lineterminator=os.linesep).writerows(rows)
+
+    def _merge_csv_rows(self, source_path, file_path, column_plan, pending_rows, cancel_event=None):
+        """
+        כתיבת קובץ CSV ממוזג: השורות הקיימות מועתקות (או מוחלפות) ואחריהן המסמכים החדשים.
+
+        Args:
+            source_path (str): נתיב קובץ ה-CSV הקיים
+            file_path (str): נתיב הקובץ שייכתב
+            column_plan (ColumnPlan): תוכנית העמודות
+            pending_rows (dict): {מפתח: ערכי השורה החדשה}
+            cancel_event (threading.Event, optional): אירוע לביטול הייצוא
+        """
+        with open(source_path, newline='', encoding='utf-8-sig') as source_file, \
+                open(file_path, 'w', newline='', encoding='utf-8-sig') as csv_file:
+            source_rows = csv.reader(source_file)
+            next(source_rows, None)
+
+            writer = csv.writer(csv_file, lineterminator=os.linesep)
+            writer.writerow(column_plan.headers)
+            writer.writerows(self._merged_rows(source_rows, column_plan, pending_rows, cancel_event))
+
+    def _collect_merge_rows(self, results, column_plan, progress_callback=None, cancel_event=None):
+        """
+        בניית שורות התוצאות החדשות למיזוג, לפי מפתח. למסמך שמופיע כמה פעמים (אותו מספר
+        נסח או אותו תוכן) - התוצאה האחרונה קובעת, ואם ערכיה שונים נרשמת אזהרה.
+
+        Args:
+            results (iterable): תוצאות החילוץ החדשות
+            column_plan (ColumnPlan): תוכנית העמודות
+            progress_callback (callable, optional): פונקציית קולבק לעדכון התקדמות (אחוזים)
+            cancel_event (threading.Event, optional): אירוע לביטול הייצוא
+
+        Returns:
+            dict: {מפתח: ערכי השורה}, או None אם הייצוא בוטל
+        """
+        pending_rows = {}
+        for result in self._iter_valid_results(results, progress_callback, cancel_event, 10):
+            row = column_plan.row_values(result)
+            key = column_plan.row_key(row)
+
+            previous_row = pending_rows.get(key)
+            if previous_row is not None and previous_row[1:] != row[1:]:
+                logger.warning(f"{row[0]} has the same {key[0]} as {previous_row[0]} ({key[1]}) "
+                               f"with different values, keeping the later result")
+
+            pending_rows[key] = row
+
+        if self._is_cancelled(cancel_event):
+            return None
+
+        return pending_rows
+
+    @staticmethod
+    def _csv_row(row):
+        """
+        Args:
+            row (list): ערכי השורה
+
+        Returns:
+            list: הערכים כפי שהם נקראים מקובץ CSV (מחרוזות, None כמחרוזת ריקה)
+        """
+        return ["" if value is None else str(value) for value in row]
+
+    def _check_merge_headers(self, headers, column_plan, file_path):
+        """
+        Args:
+            headers (iterable): שורת הכותרות בקובץ הקיים (None אם הקובץ ריק)
+            column_plan (ColumnPlan): תוכנית העמודות
+            file_path (str): נתיב הקובץ הקיים
+
+        Raises:
+            ValueError: אם עמודות הקובץ אינן תואמות לשדות שנבחרו
+        """
+        if headers is None or list(headers) != column_plan.headers:
+            raise ValueError(f"The columns of {file_path} do not match the selected fields")
+
+    def _merged_rows(self, source_rows, column_plan, pending_rows, cancel_event=None):
+        """
+        מעבר על השורות הממוזגות: כל שורה קיימת (או השורה החדשה במקומה), ואחריהן
+        השורות של מסמכים שאינם בקובץ הקיים.
+
+        Args:
+            source_rows (iterable): שורות הנתונים בקובץ הקיים (ללא הכותרות)
+            column_plan (ColumnPlan): תוכנית העמודות
+            pending_rows (dict): {מפתח: ערכי השורה החדשה}
+            cancel_event (threading.Event, optional): אירוע לביטול הייצוא - המעבר נעצר כשהוא מופעל
+
+        Yields:
+            list: ערכי השורה לפי סדר העמודות
+        """
+        existing_keys = set()
+
+        for idx, row in enumerate(source_rows, 1):
+            if idx % 1000 == 0 and self._is_cancelled(cancel_event):
+                return
+
+            key = column_plan.row_key(row)
+            existing_keys.add(key)
+            yield pending_rows.get(key, row)
+
+        for key, row in pending_rows.items():
+            if key not in existing_keys:
+                yield row
+
+    def export_to_parquet(self, results, selected_fields, file_path, progress_callback=None, cancel_event=None):
+        """
+        ייצוא נתונים לקובץ Parquet עם עמודות מסוגים מתאימים ועמודות רשימה לבעלים,
+        משכנתאות והערות (ראו ParquetPlan). דורש את החבילה pyarrow.
+
+        Args:
+            results (iterable): תוצאות החילוץ (רשימה, או כל איטרטור של ExtractionResult)
+            selected_fields (list): רשימת מזהי השדות שנבחרו
+            file_path (str): נתיב לקובץ ה-Parquet שייווצר
+            progress_callback (callable, optional): פונקציית קולבק לעדכון התקדמות (אחוזים)
+            cancel_event (threading.Event, optional): אירוע לביטול הייצוא
+
+        Returns:
+            bool: האם הייצוא הצליח (False גם אם בוטל או ש-pyarrow אינו מותקן)
+        """
+        if not SUPPORTS_PARQUET:
+            logger.error("Error exporting to Parquet: the 'pyarrow' package is not installed")
+            return False
+
+        try:
+            return self._write_file(
+                file_path,
+                lambda path: self._write_parquet_rows(results, selected_fields, path, progress_callback, cancel_event),
+                progress_callback, cancel_event)
+
+        except Exception as e:
+            logger.error(f"Error exporting to Parquet: {str(e)}")
+            return False
+
+    def _write_parquet_rows(self, results, selected_fields, file_path, progress_callback=None, cancel_event=None):
+        """
+        כתיבת התוצאות לקובץ Parquet בזרימה, קבוצת שורות אחר קבוצת שורות.
+
+        Args:
+            results (iterable): תוצאות החילוץ
+            selected_fields (list): רשימת מזהי השדות שנבחרו
+            file_path (str): נתיב הקובץ שייכתב
+            progress_callback (callable, optional): פונקציית קולבק לעדכון התקדמות (אחוזים)
+            cancel_event (threading.Event, optional): אירוע לביטול הייצוא
+        """
+        with ParquetSink(file_path, selected_fields) as sink:
+            for result in self._iter_valid_results(results, progress_callback, cancel_event, 95):
+                sink.write(result)
+
+    def export_to_jsonl(self, results, selected_fields, file_path, progress_callback=None, cancel_event=None):
+        """
+        ייצוא נתונים לקובץ JSON Lines - שורה לכל מסמך עם ExtractionResult.to_dict(),
+        כולל מסמכים עם שגיאות (השגיאה נשמרת בשדה error).
+
+        Args:
+            results (iterable): תוצאות החילוץ (רשימה, או כל איטרטור של ExtractionResult)
+            selected_fields (list): רשימת מזהי השדות שנבחרו (נתוני התוצאה כוללים רק אותם)
+            file_path (str): נתיב לקובץ ה-JSON Lines שייווצר
+            progress_callback (callable, optional): פונקציית קולבק לעדכון התקדמות (אחוזים)
+            cancel_event (threading.Event, optional): אירוע לביטול הייצוא
+
+        Returns:
+            bool: האם הייצוא הצליח (False גם אם בוטל)
+        """
+        try:
+            return self._write_file(
+                file_path,
+                lambda path: self._write_jsonl_rows(results, path, progress_callback, cancel_event),
+                progress_callback, cancel_event)
+
+        except Exception as e:
+            logger.error(f"Error exporting to JSON Lines: {str(e)}")
+            return False
+
+    def _write_jsonl_rows(self, results, file_path, progress_callback=None, cancel_event=None):
+        """
+        כתיבת התוצאות לקובץ JSON Lines בזרימה, שורה אחר שורה.
+
+        Args:
+            results (iterable): תוצאות החילוץ
+            file_path (str): נתיב הקובץ שייכתב
+            progress_callback (callable, optional): פונקציית קולבק לעדכון התקדמות (אחוזים)
+            cancel_event (threading.Event, optional): אירוע לביטול הייצוא
+        """
+        with JsonLinesSink(file_path, flush_interval=None) as sink:
+            for result in self._iter_valid_results(results, progress_callback, cancel_event, 95,
+                                                   include_errors=True):
+                sink.write(result)
+
+    def export_tables_to_excel(self, results, selected_fields, file_path, progress_callback=None, cancel_event=None):
+        """
+        ייצוא מנורמל לקובץ אקסל - גיליון לכל טבלה (מסמכים, בעלים, משכנתאות, הערות)
+        במקום ערכים מופרדים בפסיקים בתא אחד.
+
+        Args:
+            results (iterable): תוצאות החילוץ (רשימה, או כל איטרטור של ExtractionResult)
+            selected_fields (list): רשימת מזהי השדות שנבחרו
+            file_path (str): נתיב לקובץ האקסל שייווצר
+            progress_callback (callable, optional): פונקציית קולבק לעדכון התקדמות (אחוזים)
+            cancel_event (threading.Event, optional): אירוע לביטול הייצוא
+
+        Returns:
+            bool: האם הייצוא הצליח (False גם אם בוטל)
+        """
+        try:
+            return self._write_file(
+                file_path,
+                lambda path: self._write_excel_tables(results, selected_fields, path, progress_callback, cancel_event),
+                progress_callback, cancel_event)
+
+        except Exception as e:
+            logger.error(f"Error exporting tables to Excel: {str(e)}")
+            return False
+
+    def _write_excel_tables(self, results, selected_fields, file_path, progress_callback=None, cancel_event=None):
+        """
+        כתיבת הטבלאות המנורמלות לחוברת אקסל בזרימה. כל גיליון במצב write-only נכתב
+        לקובץ ביניים משלו, כך שניתן להוסיף שורות לכל הגיליונות במעבר אחד על התוצאות.
+
+        Args:
+            results (iterable): תוצאות החילוץ
+            selected_fields (list): רשימת מזהי השדות שנבחרו
+            file_path (str): נתיב הקובץ שייכתב
+            progress_callback (callable, optional): פונקציית קולבק לעדכון התקדמות (אחוזים)
+            cancel_event (threading.Event, optional): אירוע לביטול הייצוא
+        """
+        from openpyxl import Workbook
+
+        table_plan = TablePlan(selected_fields)
+
+        workbook = Workbook(write_only=True)
+        worksheets = {}
+        for table in table_plan.tables:
+            worksheets[table] = workbook.create_sheet(table)
+            worksheets[table].append(table_plan.headers[table])
+
+        for result in self._iter_valid_results(results, progress_callback, cancel_event, 95):
+            for table, row in table_plan.iter_rows(result):
+                worksheets[table].append(row)
+
+        if self._is_cancelled(cancel_event):
+            for worksheet in worksheets.values():
+                worksheet.close()
+            return
+
+        workbook.save(file_path)
+
+    def export_tables_to_csv(self, results, selected_fields, file_path, progress_callback=None, cancel_event=None):
         """
-        הכנת נתונים לייצוא.
+        ייצוא מנורמל לקבצי CSV - קובץ לכל טבלה לצד הנתיב שנבחר (למשל out_owners.csv).
 
         Args:
-            results (list): רשימת תוצאות החילוץ
+            results (iterable): תוצאות החילוץ (רשימה, או כל איטרטור של ExtractionResult)
             selected_fields (list): רשימת מזהי השדות שנבחרו
+            file_path (str): נתיב הבסיס לקבצי ה-CSV
+            progress_callback (callable, optional): פונקציית קולבק לעדכון התקדמות (אחוזים)
+            cancel_event (threading.Event, optional): אירוע לביטול הייצוא
 
         Returns:
-            list: רשימת שורות נתונים מוכנה לייצוא
+            bool: האם הייצוא הצליח (False גם אם בוטל)
         """
-        data_rows = []
+        try:
+            table_plan = TablePlan(selected_fields)
+            file_paths = self.table_file_paths(file_path, table_plan.tables)
+
+            return self._write_files(
+                list(file_paths.values()),
+                lambda paths: self._write_csv_tables(
+                    results, table_plan, dict(zip(file_paths, paths)), progress_callback, cancel_event),
+                progress_callback, cancel_event)
+
+        except Exception as e:
+            logger.error(f"Error exporting tables to CSV: {str(e)}")
+            return False
+
+    @staticmethod
+    def table_file_paths(file_path, tables):
+        """
+        Args:
+            file_path (str): נתיב הבסיס שנבחר
+            tables (list): שמות הטבלאות
+
+        Returns:
+            dict: {שם טבלה: נתיב הקובץ שלה}
+        """
+        base_path, extension = os.path.splitext(file_path)
+        return {table: f"{base_path}_{table}{extension}" for table in tables}
+
+    def _write_csv_tables(self, results, table_plan, file_paths, progress_callback=None, cancel_event=None):
+        """
+        כתיבת הטבלאות המנורמלות לקבצי CSV בזרימה, במעבר אחד על התוצאות.
+
+        Args:
+            results (iterable): תוצאות החילוץ
+            table_plan (TablePlan): תוכנית הטבלאות
+            file_paths (dict): {שם טבלה: נתיב הקובץ שייכתב}
+            progress_callback (callable, optional): פונקציית קולבק לעדכון התקדמות (אחוזים)
+            cancel_event (threading.Event, optional): אירוע לביטול הייצוא
+        """
+        with ExitStack() as stack:
+            writers = {}
+            for table, path in file_paths.items():
+                csv_file = stack.enter_context(open(path, 'w', newline='', encoding='utf-8-sig'))
+                writers[table] = csv.writer(csv_file, lineterminator=os.linesep)
+                writers[table].writerow(table_plan.headers[table])
+
+            for result in self._iter_valid_results(results, progress_callback, cancel_event, 95):
+                for table, row in table_plan.iter_rows(result):
+                    writers[table].writerow(row)
+
+    def _write_file(self, file_path, write_function, progress_callback=None, cancel_event=None):
+        """
+        כתיבת קובץ ייצוא יחיד דרך _write_files.
+
+        Args:
+            file_path (str): נתיב קובץ היעד
+            write_function (callable): פונקציה שכותבת את הנתונים לנתיב שהיא מקבלת
+            progress_callback (callable, optional): פונקציית קולבק לעדכון התקדמות (אחוזים)
+            cancel_event (threading.Event, optional): אירוע לביטול הייצוא
+
+        Returns:
+            bool: האם הקובץ נכתב (False אם הייצוא בוטל)
+        """
+        return self._write_files([file_path], lambda paths: write_function(paths[0]),
+                                 progress_callback, cancel_event)
+
+    def _write_files(self, file_paths, write_function, progress_callback=None, cancel_event=None):
+        """
+        כתיבת קבצי הייצוא לקבצים זמניים באותה תיקייה והחלפת קבצי היעד רק בסיום מוצלח.
+        ייצוא שבוטל או נכשל אינו משאיר קבצים חלקיים, וקבצים קיימים ביעד נשארים ללא שינוי.
+
+        Args:
+            file_paths (list): נתיבי קבצי היעד
+            write_function (callable): פונקציה שכותבת את הנתונים לרשימת הנתיבים שהיא מקבלת
+            progress_callback (callable, optional): פונקציית קולבק לעדכון התקדמות (אחוזים)
+            cancel_event (threading.Event, optional): אירוע לביטול הייצוא
+
+        Returns:
+            bool: האם הקבצים נכתבו (False אם הייצוא בוטל)
+        """
+        if self._is_cancelled(cancel_event):
+            return False
+
+        temp_paths = []
+        try:
+            for file_path in file_paths:
+                directory = os.path.dirname(os.path.abspath(file_path))
+                fd, temp_path = tempfile.mkstemp(dir=directory, prefix=".export-",
+                                                 suffix=os.path.splitext(file_path)[1])
+                os.close(fd)
+                temp_paths.append(temp_path)
+
+            write_function(temp_paths)
+
+            if self._is_cancelled(cancel_event):
+                for temp_path in temp_paths:
+                    self._remove_partial_file(temp_path)
+                return False
+
+            for temp_path, file_path in zip(temp_paths, file_paths):
+                os.replace(temp_path, file_path)
+
+        except Exception:
+            for temp_path in temp_paths:
+                if os.path.exists(temp_path):
+                    self._remove_partial_file(temp_path)
+            raise
+
+        if progress_callback:
+            progress_callback(100)
+
+        return True
+
+    def _remove_partial_file(self, file_path):
+        """
+        Args:
+            file_path (str): נתיב קובץ ייצוא חלקי למחיקה
+        """
+        try:
+            os.remove(file_path)
+        except OSError as e:
+            logger.error(f"Error removing partial export file {file_path}: {str(e)}")
+
+    def _is_cancelled(self, cancel_event):
+        """
+        Args:
+            cancel_event (threading.Event): אירוע לביטול הייצוא (או None)
+
+        Returns:
+            bool: האם התבקש ביטול הייצוא
+        """
+        return cancel_event is not None and cancel_event.is_set()
+
+    def _iter_valid_results(self, results, progress_callback=None, cancel_event=None, progress_scale=100,
+                            include_errors=False):
+        """
+        מעבר על תוצאות החילוץ התקינות, אחת בכל פעם, עם דיווח התקדמות ובדיקת ביטול.
+
+        Args:
+            results (iterable): תוצאות החילוץ (רשימה, או כל איטרטור של ExtractionResult)
+            progress_callback (callable, optional): פונקציית קולבק לעדכון התקדמות (אחוזים)
+            cancel_event (threading.Event, optional): אירוע לביטול הייצוא - המעבר נעצר כשהוא מופעל
+            progress_scale (int, optional): האחוז המדווח בסיום המעבר על כל התוצאות
+            include_errors (bool, optional): האם להחזיר גם תוצאות עם שגיאות
+
+        Yields:
+            ExtractionResult: כל תוצאה ללא שגיאה (או כל תוצאה, אם include_errors)
+        """
+        # התקדמות מדווחת רק כשמספר התוצאות ידוע מראש
+        total_results = len(results) if hasattr(results, "__len__") else None
+        report_every = max(total_results // 100, 1) if total_results else 1000
+
+        for idx, result in enumerate(results, 1):
+            if idx % report_every == 0:
+                if self._is_cancelled(cancel_event):
+                    return
+
+                if progress_callback and total_results:
+                    progress_callback(int(idx / total_results * progress_scale))
 
-        for result in results:
             # דלג על תוצאות עם שגיאות
-            if result.has_error():
+            if not include_errors and result.has_error():
                 continue
 
-            # בסיס השורה - שם הקובץ
-            row_data = {"שם קובץ": result.file_name}
-            data = result.data
-
-            # הוספת נתונים פשוטים
-            for field_id in selected_fields:
-                if field_id.startswith("owner_"):
-                    # טיפול בשדות בעלים
-                    owners = data.get("owners", [])
-                    if owners:
-                        field_parts = field_id.split("_", 1)
-                        if len(field_parts) > 1:
-                            field_type = field_parts[1]
-                            owners_data = []
-
-                            mapping = {
-                                "name": "name",
-                                "id": "id_number",
-                                "id_type": "id_type",
-                                "share": "share"
-                            }
-
-                            if field_type in mapping:
-                                for owner in owners:
-                                    value = owner.get(mapping[field_type], "")
-                                    if value:
-                                        owners_data.append(str(value))
-
-                            row_data[FIELD_ID_TO_NAME.get(field_id, field_id)] = ", ".join(owners_data)
-
-                elif field_id.startswith("mortgage_"):
-                    # טיפול בשדות משכנתאות
-                    mortgages = data.get("mortgages", [])
-                    if mortgages:
-                        field_parts = field_id.split("_", 1)
-                        if len(field_parts) > 1:
-                            field_type = field_parts[1]
-                            mortgage_data = []
-
-                            mapping = {
-                                "holder": "holder",
-                                "amount": "amount",
-                                "rank": "rank"
-                            }
-
-                            if field_type in mapping:
-                                for mortgage in mortgages:
-                                    value = mortgage.get(mapping[field_type], "")
-                                    if value:
-                                        mortgage_data.append(str(value))
-
-                            row_data[FIELD_ID_TO_NAME.get(field_id, field_id)] = ", ".join(mortgage_data)
-
-                elif field_id.startswith("remark_"):
-                    # טיפול בשדות הערות
-                    remarks = data.get("remarks", [])
-                    if remarks:
-                        field_parts = field_id.split("_", 1)
-                        if len(field_parts) > 1:
-                            field_type = field_parts[1]
-                            remark_data = []
-
-                            mapping = {
-                                "type": "type",
-                                "content": "content"
-                            }
-
-                            if field_type in mapping:
-                                for remark in remarks:
-                                    value = remark.get(mapping[field_type], "")
-                                    if value:
-                                        remark_data.append(str(value))
-
-                            row_data[FIELD_ID_TO_NAME.get(field_id, field_id)] = ", ".join(remark_data)
-
-                else:
-                    # שדות רגילים
-                    display_name = FIELD_ID_TO_NAME.get(field_id, field_id)
-                    row_data[display_name] = data.get(field_id, "")
-
-            data_rows.append(row_data)
-
-        return data_rows
\ No newline at end of file
+            yield result
+
+
+class CsvSink:
+    """
+    כתיבת תוצאות חילוץ לקובץ CSV שורה אחר שורה, בזמן שהאצווה עדיין רצה.
+
+    כל תוצאה נכתבת מיד עם קבלתה, והקובץ נשמר לדיסק (flush + fsync) כל flush_interval
+    שניות, כך שאם התהליך קורס - השורות שהסתיימו כבר נמצאות בקובץ. הזיכרון אינו
+    תלוי במספר התוצאות. תוצאות עם שגיאות אינן נכתבות, כמו בייצוא הרגיל.
+    """
+
+    def __init__(self, file_path, selected_fields, flush_interval=CSV_SINK_FLUSH_INTERVAL_SECONDS, append=False):
+        """
+        אתחול ופתיחת קובץ ה-CSV.
+
+        Args:
+            file_path (str): נתיב קובץ ה-CSV
+            selected_fields (list): רשימת מזהי השדות שנבחרו
+            flush_interval (float, optional): מספר השניות בין שמירות לדיסק (None - רק בסגירה)
+            append (bool, optional): האם להוסיף לקובץ קיים במקום לדרוס אותו
+        """
+        self.file_path = file_path
+        self.selected_fields = list(selected_fields)
+        self.flush_interval = flush_interval
+        self.rows_written = 0
+
+        self.column_plan = ColumnPlan(self.selected_fields, content_hash=True)
+
+        # בהוספה לקובץ קיים אין לכתוב שוב כותרות או סימן BOM
+        is_new_file = not (append and os.path.exists(file_path) and os.path.getsize(file_path) > 0)
+
+        # קידוד UTF-8-sig (תומך בעברית באקסל), ושורות כמו בייצוא של pandas
+        self._file = open(file_path, 'w' if is_new_file else 'a', newline='',
+                          encoding='utf-8-sig' if is_new_file else 'utf-8')
+        self._writer = csv.writer(self._file, lineterminator=os.linesep)
+
+        if is_new_file:
+            self._writer.writerow(self.column_plan.headers)
+
+        self._last_flush = time.monotonic()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+    def write(self, result):
+        """
+        כתיבת תוצאת חילוץ כשורה בקובץ.
+
+        Args:
+            result (ExtractionResult): תוצאת החילוץ
+        """
+        if result.has_error():
+            return
+
+        self._writer.writerow(["" if value is None else value for value in self.column_plan.row_values(result)])
+        self.rows_written += 1
+
+        if self.flush_interval is not None and time.monotonic() - self._last_flush >= self.flush_interval:
+            self.flush()
+
+    def flush(self):
+        """
+        שמירת השורות שנכתבו עד כה לדיסק.
+        """
+        self._file.flush()
+        os.fsync(self._file.fileno())
+        self._last_flush = time.monotonic()
+
+    def close(self):
+        """
+        שמירה לדיסק וסגירת הקובץ.
+        """
+        if self._file.closed:
+            return
+
+        try:
+            self.flush()
+        finally:
+            self._file.close()
+
+
+class JsonLinesSink:
+    """
+    כתיבת תוצאות חילוץ לקובץ JSON Lines - שורה לכל מסמך עם ExtractionResult.to_dict(),
+    בזמן שהאצווה עדיין רצה.
+
+    בניגוד ל-CsvSink, גם תוצאות עם שגיאות נכתבות, כך שהקובץ הוא רישום מלא של הקבצים
+    שעובדו: ניתן להוסיף לו שורות (append) ולהמשיך אצווה שנקטעה מהקובץ הראשון שאינו
+    מופיע בו (ראו completed_file_paths). שורה אחרונה שנכתבה חלקית בקריסה נחתכת
+    לפני ההוספה.
+    """
+
+    def __init__(self, file_path, flush_interval=JSONL_SINK_FLUSH_INTERVAL_SECONDS, append=False):
+        """
+        אתחול ופתיחת קובץ ה-JSON Lines.
+
+        Args:
+            file_path (str): נתיב הקובץ
+            flush_interval (float, optional): מספר השניות בין שמירות לדיסק (None - רק בסגירה)
+            append (bool, optional): האם להוסיף לקובץ קיים במקום לדרוס אותו
+        """
+        self.file_path = file_path
+        self.flush_interval = flush_interval
+        self.rows_written = 0
+
+        if append and os.path.exists(file_path):
+            self._truncate_partial_line(file_path)
+
+        self._file = open(file_path, 'ab' if append else 'wb')
+        self._last_flush = time.monotonic()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+    @staticmethod
+    def _truncate_partial_line(file_path):
+        """
+        חיתוך שורה אחרונה שלא הסתיימה (כתיבה שנקטעה), כדי שהשורה הבאה תתחיל בשורה חדשה.
+
+        Args:
+            file_path (str): נתיב הקובץ
+        """
+        with open(file_path, 'rb+') as jsonl_file:
+            file_size = jsonl_file.seek(0, os.SEEK_END)
+            position = file_size
+
+            # סריקה לאחור בבלוקים עד לתו סוף השורה האחרון
+            while position > 0:
+                block_start = max(position - 65536, 0)
+                jsonl_file.seek(block_start)
+                block = jsonl_file.read(position - block_start)
+                newline_at = block.rfind(b"\n")
+                if newline_at != -1:
+                    position = block_start + newline_at + 1
+                    break
+                position = block_start
+
+            if position != file_size:
+                logger.warning(f"Truncating incomplete last line of {file_path}")
+                jsonl_file.truncate(position)
+
+    @staticmethod
+    def read_results(file_path):
+        """
+        קריאת התוצאות שנכתבו לקובץ JSON Lines. שורות פגומות (למשל שורה אחרונה שנקטעה)
+        מדולגות.
+
+        Args:
+            file_path (str): נתיב הקובץ
+
+        Yields:
+            ExtractionResult: כל תוצאה בקובץ לפי הסדר
+        """
+        loads = orjson.loads if orjson is not None else json.loads
+
+        with open(file_path, 'rb') as jsonl_file:
+            for line_number, line in enumerate(jsonl_file, 1):
+                if not line.strip():
+                    continue
+                try:
+                    yield ExtractionResult.from_dict(loads(line))
+                except ValueError:
+                    logger.warning(f"Skipping malformed line {line_number} in {file_path}")
+
+    @classmethod
+    def completed_results(cls, file_path):
+        """
+        התוצאות התקינות שכבר נכתבו לקובץ, להמשך אצווה שנקטעה. תוצאות עם שגיאה (למשל חריגה
+        ממגבלת הזמן) אינן נחשבות כמושלמות, כך שהקבצים שלהן מעובדים שוב בהמשך - ואם קובץ
+        מופיע יותר מפעם אחת, התוצאה התקינה האחרונה שלו היא הקובעת.
+
+        Args:
+            file_path (str): נתיב קובץ JSON Lines קיים
+
+        Returns:
+            dict: {נתיב קובץ ה-PDF: ExtractionResult} (ריק אם הקובץ לא קיים)
+        """
+        if not os.path.exists(file_path):
+            return {}
+
+        return {result.file_path: result for result in cls.read_results(file_path) if not result.has_error()}
+
+    @classmethod
+    def completed_file_paths(cls, file_path):
+        """
+        Args:
+            file_path (str): נתיב קובץ JSON Lines קיים
+
+        Returns:
+            set: נתיבי קבצי ה-PDF שכבר חולצו בהצלחה לקובץ (קבוצה ריקה אם הקובץ לא קיים)
+        """
+        return set(cls.completed_results(file_path))
+
+    def write(self, result):
+        """
+        כתיבת תוצאת חילוץ כשורה בקובץ.
+
+        Args:
+            result (ExtractionResult): תוצאת החילוץ
+        """
+        self._file.write(_json_line(result.to_dict()))
+        self.rows_written += 1
+
+        if self.flush_interval is not None and time.monotonic() - self._last_flush >= self.flush_interval:
+            self.flush()
+
+    def flush(self):
+        """
+        שמירת השורות שנכתבו עד כה לדיסק.
+        """
+        self._file.flush()
+        os.fsync(self._file.fileno())
+        self._last_flush = time.monotonic()
+
+    def close(self):
+        """
+        שמירה לדיסק וסגירת הקובץ.
+        """
+        if self._file.closed:
+            return
+
+        try:
+            self.flush()
+        finally:
+            self._file.close()
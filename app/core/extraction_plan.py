@@ -0,0 +1,135 @@
+# -*- coding: utf-8 -*-
+
+"""
+מודול תוכנית חילוץ - הידור תצורת חילוץ פעם אחת לכל אצווה.
+"""
+
+from types import MappingProxyType
+from functools import lru_cache
+
+try:
+    # מנוע regex תומך במגבלת זמן לכל הרצה - מונע תקיעה בביטויים עם backtracking מעריכי
+    import regex as re
+    SUPPORTS_TIMEOUT = True
+except ImportError:
+    import re
+    SUPPORTS_TIMEOUT = False
+
+from app.config.constants import DEFAULT_FIELDS
+from app.utils.regex_patterns import PATTERNS, PATTERNS_VERSION, GENERAL_FIELD_ANCHORS
+
+# מזהי השדות הכלליים לפי סדר ההגדרה
+GENERAL_FIELD_IDS = tuple(field["id"] for field in DEFAULT_FIELDS["general"])
+
+# מזהי השדות של כל חלק במסמך
+SECTION_FIELD_IDS = {
+    "owners": frozenset(field["id"] for field in DEFAULT_FIELDS["owners"]),
+    "mortgages": frozenset(field["id"] for field in DEFAULT_FIELDS["mortgages"]),
+    "remarks": frozenset(field["id"] for field in DEFAULT_FIELDS["remarks"])
+}
+
+# הביטוי הרגולרי של רשומה בכל חלק במסמך
+SECTION_ENTRY_PATTERNS = {
+    "owners": "owner_entry",
+    "mortgages": "mortgage_entry",
+    "remarks": "remark_entry"
+}
+
+
+class ExtractionPlan:
+    """
+    תוכנית חילוץ מהודרת - קבוצה קפואה של השדות שנבחרו, ביטויים רגולריים מהודרים
+    ורשימת החלקים במסמך שיש לסרוק. התוכנית לקריאה בלבד (התכונות אינן ניתנות להחלפה
+    והמילונים הם תצוגות לקריאה בלבד), ולכן ניתן לשתף אותה בין כל הקבצים באצווה ובין
+    תהליכי עבודה, ולהשתמש בה כמפתח.
+    """
+
+    __slots__ = ("selected_field_ids", "version", "general_field_ids", "sections", "general_anchors", "patterns")
+
+    def __init__(self, selected_field_ids):
+        """
+        הידור תוכנית חילוץ.
+
+        Args:
+            selected_field_ids (iterable): מזהי השדות שנבחרו לחילוץ
+        """
+        selected_field_ids = frozenset(selected_field_ids)
+
+        # שדות כלליים שנבחרו, לפי סדר ההגדרה
+        general_field_ids = tuple(
+            field_id for field_id in GENERAL_FIELD_IDS if field_id in selected_field_ids
+        )
+
+        # חלקי המסמך שיש לסרוק (רק אם נבחר לפחות שדה אחד מהם)
+        sections = tuple(
+            section for section, field_ids in SECTION_FIELD_IDS.items()
+            if field_ids & selected_field_ids
+        )
+
+        # מילות עוגן לשדות כלליים שנסרקים בחיפוש מחרוזת ולא בחיפוש ביטוי
+        general_anchors = {
+            field_id: GENERAL_FIELD_ANCHORS[field_id]
+            for field_id in general_field_ids if field_id in GENERAL_FIELD_ANCHORS
+        }
+
+        # הידור הביטויים הרגולריים הנדרשים בלבד
+        patterns = {field_id: re.compile(PATTERNS[field_id]) for field_id in general_field_ids}
+        for section in sections:
+            pattern_name = SECTION_ENTRY_PATTERNS[section]
+            patterns[pattern_name] = re.compile(PATTERNS[pattern_name], re.DOTALL)
+
+        object.__setattr__(self, "selected_field_ids", selected_field_ids)
+        object.__setattr__(self, "version", PATTERNS_VERSION)
+        object.__setattr__(self, "general_field_ids", general_field_ids)
+        object.__setattr__(self, "sections", sections)
+        object.__setattr__(self, "general_anchors", MappingProxyType(general_anchors))
+        object.__setattr__(self, "patterns", MappingProxyType(patterns))
+
+    @classmethod
+    def from_config(cls, extraction_config):
+        """
+        קבלת תוכנית חילוץ עבור תצורת חילוץ. תוכניות זהות משותפות ואינן מהודרות מחדש.
+
+        Args:
+            extraction_config (ExtractionConfig או ExtractionPlan): תצורת החילוץ
+
+        Returns:
+            ExtractionPlan: תוכנית החילוץ
+        """
+        if isinstance(extraction_config, cls):
+            return extraction_config
+
+        return _build_plan(frozenset(extraction_config.selected_field_ids))
+
+    def __setattr__(self, name, value):
+        raise AttributeError(f"ExtractionPlan is read-only (cannot set '{name}')")
+
+    def __delattr__(self, name):
+        raise AttributeError(f"ExtractionPlan is read-only (cannot delete '{name}')")
+
+    def __reduce__(self):
+        # התוכנית מועברת לתהליכי עבודה לפי השדות בלבד, ומהודרת שם מחדש (פעם אחת לכל תהליך)
+        return _build_plan, (self.selected_field_ids,)
+
+    def __eq__(self, other):
+        if not isinstance(other, ExtractionPlan):
+            return NotImplemented
+        return (self.selected_field_ids, self.version) == (other.selected_field_ids, other.version)
+
+    def __hash__(self):
+        return hash((self.selected_field_ids, self.version))
+
+    def __repr__(self):
+        return f"ExtractionPlan({sorted(self.selected_field_ids)})"
+
+
+@lru_cache(maxsize=32)
+def _build_plan(selected_field_ids):
+    """
+    Args:
+        selected_field_ids (frozenset): מזהי השדות שנבחרו
+
+    Returns:
+        ExtractionPlan: תוכנית החילוץ המהודרת
+    """
+    return ExtractionPlan(selected_field_ids)
@@ -0,0 +1,339 @@
+# -*- coding: utf-8 -*-
+
+"""
+מאגר תהליכי עבודה מבודדים - כל קובץ מעובד בתהליך נפרד מהתהליך הראשי, עם מגבלת זמן
+ומגבלת זיכרון. קובץ שנתקע או מפיל את התהליך הופך לתוצאה עם שגיאה, ושאר האצווה ממשיכה.
+
+בניגוד ל-ProcessPoolExecutor, שבו קריסה של תהליך אחד שוברת את כל המאגר, כל תהליך כאן
+מנוהל בנפרד: תהליך שחרג מהזמן נעצר, תהליך שקרס מוחלף, ותהליך שעיבד מספר קבצים מסוים
+מוחלף בתהליך חדש כדי להגביל את גדילת הזיכרון של pdfminer.
+"""
+
+import time
+import multiprocessing
+from multiprocessing.connection import wait
+
+from app.config.constants import (DEFAULT_MAX_WORKERS, ISOLATED_FILE_TIMEOUT_SECONDS, ISOLATED_MEMORY_LIMIT_MB,
+                                  ISOLATED_MAX_FILES_PER_WORKER)
+from app.models.extraction_result import ExtractionResult
+from app.utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+# זמן ההמתנה (בשניות) לסיום מסודר של תהליך עבודה לפני עצירתו בכוח
+WORKER_EXIT_TIMEOUT_SECONDS = 5.0
+
+
+def _limit_memory(memory_limit_mb):
+    """
+    הגבלת מרחב הכתובות של התהליך הנוכחי. הקצאה מעבר למגבלה נכשלת ב-MemoryError
+    (שנרשם כשגיאה בתוצאה) במקום שמערכת ההפעלה תעצור את התהליך.
+
+    Args:
+        memory_limit_mb (int): המגבלה במגה-בייט (None או 0 - ללא מגבלה)
+    """
+    if not memory_limit_mb:
+        return
+
+    try:
+        import resource
+    except ImportError:
+        # אין RLIMIT ב-Windows - מגבלת הזמן עדיין חלה
+        logger.warning("Memory limit is not supported on this platform, running without it")
+        return
+
+    limit = memory_limit_mb * 1024 * 1024
+    _, hard_limit = resource.getrlimit(resource.RLIMIT_AS)
+    if hard_limit != resource.RLIM_INFINITY:
+        limit = min(limit, hard_limit)
+
+    resource.setrlimit(resource.RLIMIT_AS, (limit, hard_limit))
+
+
+def _isolated_worker_main(conn, processor, plan, memory_limit_mb):
+    """
+    לולאת תהליך העבודה - קבלת נתיב, עיבוד הקובץ ושליחת התוצאה, עד לקבלת None.
+
+    Args:
+        conn (Connection): צד תהליך העבודה של הצינור
+        processor (DataProcessor): מעבד הנתונים
+        plan (ExtractionPlan): תוכנית החילוץ
+        memory_limit_mb (int): מגבלת הזיכרון במגה-בייט
+    """
+    _limit_memory(memory_limit_mb)
+
+    while True:
+        try:
+            pdf_path = conn.recv()
+        except EOFError:
+            break
+
+        if pdf_path is None:
+            break
+
+        conn.send(processor.process_pdf_file(pdf_path, plan))
+
+
+class _IsolatedWorker:
+    """
+    תהליך עבודה בודד והקובץ שהוא מעבד כרגע.
+    """
+
+    def __init__(self, context, processor, plan, memory_limit_mb):
+        parent_conn, child_conn = context.Pipe()
+
+        self.process = context.Process(target=_isolated_worker_main, daemon=True,
+                                       args=(child_conn, processor, plan, memory_limit_mb))
+        self.process.start()
+        child_conn.close()
+
+        self.conn = parent_conn
+        self.files_done = 0
+
+        # הקובץ בעיבוד: (מפתח, נתיב, מועד חריגה מהזמן) או None
+        self.task = None
+
+    def send(self, key, pdf_path, file_timeout):
+        deadline = time.monotonic() + file_timeout if file_timeout else None
+        self.conn.send(pdf_path)
+        self.task = (key, pdf_path, deadline)
+
+    def stop(self):
+        """
+        סיום מסודר של התהליך (ועצירה בכוח אם לא הסתיים בזמן).
+        """
+        try:
+            self.conn.send(None)
+        except OSError:
+            pass
+
+        self.process.join(WORKER_EXIT_TIMEOUT_SECONDS)
+        self.kill()
+
+    def kill(self):
+        """
+        עצירת התהליך בכוח (אם עדיין רץ) ושחרור הצינור.
+        """
+        if self.process.is_alive():
+            self.process.kill()
+        self.process.join()
+        self.conn.close()
+
+
+class IsolatedWorkerPool:
+    """
+    מאגר תהליכי עבודה מבודדים לעיבוד קבצי PDF עם מגבלת זמן וזיכרון לכל קובץ.
+    """
+
+    def __init__(self, processor, plan, workers=None, file_timeout=ISOLATED_FILE_TIMEOUT_SECONDS,
+                 memory_limit_mb=ISOLATED_MEMORY_LIMIT_MB, max_files_per_worker=ISOLATED_MAX_FILES_PER_WORKER):
+        """
+        אתחול המאגר. התהליכים נוצרים רק כשיש להם קובץ לעבד.
+
+        Args:
+            processor (DataProcessor): מעבד הנתונים שמועתק לכל תהליך עבודה
+            plan (ExtractionPlan): תוכנית החילוץ (מועברת לתהליך פעם אחת, לא עם כל קובץ)
+            workers (int, optional): מספר תהליכי העבודה (ברירת מחדל - מספר המעבדים)
+            file_timeout (float, optional): מגבלת הזמן לקובץ בודד בשניות (None - ללא מגבלה)
+            memory_limit_mb (int, optional): מגבלת הזיכרון לתהליך במגה-בייט (None - ללא מגבלה)
+            max_files_per_worker (int, optional): מספר הקבצים עד להחלפת התהליך (None - ללא החלפה)
+        """
+        self.processor = processor
+        self.plan = plan
+        self.file_timeout = file_timeout
+        self.memory_limit_mb = memory_limit_mb
+        self.max_files_per_worker = max_files_per_worker
+
+        # spawn ולא fork - התהליך הראשי עשוי להריץ תהליכוני Qt
+        self._context = multiprocessing.get_context("spawn")
+        self._workers = [None] * (workers or DEFAULT_MAX_WORKERS)
+
+        # האם תהליך עבודה כלשהו הופעל - עד אז כישלון בהפעלה מועבר לקורא (שעובר לעיבוד רגיל)
+        self._started = False
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+    def imap_unordered(self, items):
+        """
+        עיבוד הקבצים והחזרת כל תוצאה עם סיומה (לפי סדר הסיום).
+
+        Args:
+            items (iterable): זוגות (מפתח, נתיב לקובץ PDF)
+
+        Yields:
+            tuple: זוג (מפתח, ExtractionResult) - חריגה מהזמן וקריסה מוחזרות כתוצאה עם שגיאה
+        """
+        queued = iter(items)
+        exhausted = False
+
+        while True:
+            # שליחת קובץ לכל תהליך פנוי (ויצירת תהליך אם צריך)
+            for slot, worker in enumerate(self._workers):
+                if worker is not None and worker.task is not None:
+                    continue
+
+                next_item = next(queued, None)
+                if next_item is None:
+                    exhausted = True
+                    break
+
+                key, pdf_path = next_item
+                if not self._dispatch(slot, key, pdf_path):
+                    result = ExtractionResult(pdf_path)
+                    result.set_error("לא ניתן להפעיל תהליך עבודה לעיבוד הקובץ")
+                    yield key, result
+
+            busy = [worker for worker in self._workers if worker is not None and worker.task is not None]
+            if not busy:
+                if exhausted:
+                    return
+                continue
+
+            # המתנה לתוצאה, לקריסת תהליך או למועד החריגה הקרוב
+            deadlines = [worker.task[2] for worker in busy if worker.task[2] is not None]
+            timeout = max(min(deadlines) - time.monotonic(), 0) if deadlines else None
+            ready = set(wait([worker.conn for worker in busy] + [worker.process.sentinel for worker in busy], timeout))
+
+            for worker in busy:
+                key, pdf_path, deadline = worker.task
+
+                if worker.conn in ready or worker.process.sentinel in ready:
+                    result = self._receive(worker)
+                elif deadline is not None and time.monotonic() >= deadline:
+                    result = self._timed_out(worker)
+                else:
+                    continue
+
+                yield key, result
+
+    def _dispatch(self, slot, key, pdf_path):
+        """
+        שליחת קובץ לתהליך שבמקום הנתון. תהליך פנוי שהסתיים בינתיים (למשל נעצר על ידי
+        מערכת ההפעלה בגלל זיכרון) מוחלף בתהליך חדש, והקובץ נשלח אליו.
+
+        Args:
+            slot (int): מקום התהליך במאגר
+            key: מפתח הקובץ
+            pdf_path (str): נתיב קובץ ה-PDF
+
+        Returns:
+            bool: האם הקובץ נשלח (False - לא ניתן להפעיל תהליך חדש)
+
+        Raises:
+            OSError: אם עוד לא הופעל אף תהליך עבודה ולא ניתן להפעיל תהליך
+        """
+        worker = self._workers[slot]
+
+        if worker is not None:
+            try:
+                worker.send(key, pdf_path, self.file_timeout)
+                return True
+
+            except OSError:
+                worker.process.join(WORKER_EXIT_TIMEOUT_SECONDS)
+                logger.warning(f"Idle worker process exited (exit code {worker.process.exitcode}), replacing it")
+                worker.kill()
+                self._workers[slot] = None
+
+        worker = None
+        try:
+            worker = _IsolatedWorker(self._context, self.processor, self.plan, self.memory_limit_mb)
+            worker.send(key, pdf_path, self.file_timeout)
+
+        except OSError as e:
+            if worker is not None:
+                worker.kill()
+
+            if not self._started:
+                raise
+
+            logger.error(f"Could not start a worker process for {pdf_path}: {str(e)}")
+            return False
+
+        self._workers[slot] = worker
+        self._started = True
+        return True
+
+    def _receive(self, worker):
+        """
+        קבלת התוצאה מתהליך שסיים (או קריסתו), והחלפת התהליך במידת הצורך.
+
+        Args:
+            worker (_IsolatedWorker): תהליך העבודה
+
+        Returns:
+            ExtractionResult: תוצאת החילוץ
+        """
+        _, pdf_path, _ = worker.task
+        worker.task = None
+
+        try:
+            result = worker.conn.recv()
+
+        except (EOFError, OSError):
+            # קוד היציאה נקרא לפני העצירה בכוח, כדי שלא יוחלף בקוד של העצירה
+            worker.process.join(WORKER_EXIT_TIMEOUT_SECONDS)
+            exit_code = worker.process.exitcode
+
+            worker.kill()
+            self._remove(worker)
+
+            logger.error(f"Worker process crashed while processing {pdf_path} (exit code {exit_code})")
+
+            result = ExtractionResult(pdf_path)
+            result.set_error(f"תהליך העבודה קרס במהלך עיבוד הקובץ (קוד יציאה {exit_code})")
+            return result
+
+        # החלפת תהליך שעיבד את מספר הקבצים המרבי (הגבלת גדילת הזיכרון)
+        worker.files_done += 1
+        if self.max_files_per_worker and worker.files_done >= self.max_files_per_worker:
+            worker.stop()
+            self._remove(worker)
+
+        return result
+
+    def _timed_out(self, worker):
+        """
+        עצירת תהליך שחרג ממגבלת הזמן.
+
+        Args:
+            worker (_IsolatedWorker): תהליך העבודה
+
+        Returns:
+            ExtractionResult: תוצאה עם שגיאת חריגה מהזמן
+        """
+        _, pdf_path, _ = worker.task
+        worker.task = None
+
+        worker.kill()
+        self._remove(worker)
+
+        logger.error(f"Processing {pdf_path} exceeded the time limit of {self.file_timeout:g}s, worker stopped")
+
+        result = ExtractionResult(pdf_path)
+        result.set_error(f"עיבוד הקובץ חרג ממגבלת הזמן ({self.file_timeout:g} שניות)")
+        return result
+
+    def _remove(self, worker):
+        """
+        פינוי המקום של תהליך שהסתיים - תהליך חדש ייווצר עם הקובץ הבא.
+        """
+        self._workers[self._workers.index(worker)] = None
+
+    def close(self):
+        """
+        סיום כל התהליכים. תהליך שעדיין מעבד קובץ (הצרכן הפסיק לקרוא תוצאות) נעצר בכוח.
+        """
+        for worker in self._workers:
+            if worker is None:
+                continue
+            if worker.task is not None:
+                worker.kill()
+            else:
+                worker.stop()
+
+        self._workers = [None] * len(self._workers)
@@ -0,0 +1,259 @@
+# -*- coding: utf-8 -*-
+
+"""
+מודול ייצוא Parquet - כתיבת תוצאות החילוץ בפורמט עמודות עם סוגי נתונים.
+"""
+
+import re
+from decimal import Decimal, InvalidOperation
+from importlib.util import find_spec
+
+from app.config.constants import PARQUET_ROW_GROUP_SIZE
+from app.core.column_plan import LIST_FIELD_KEYS, ENTITY_TABLES, ColumnPlan, TablePlan
+
+# pyarrow הוא תלות רשות - בלעדיו ייצוא Parquet אינו זמין. החבילה נטענת רק בייצוא
+# הראשון (ראו _load_pyarrow), כי טעינתה איטית
+SUPPORTS_PARQUET = find_spec("pyarrow") is not None
+pa = None
+pq = None
+
+# שדות שנשמרים כמספרים שלמים
+INTEGER_FIELDS = frozenset({"gush", "helka"})
+
+# שדות שנשמרים כמספרים עשרוניים (שטח וסכומים)
+DECIMAL_FIELDS = frozenset({"area", "mortgage_amount"})
+DECIMAL_PRECISION = 18
+DECIMAL_SCALE = 2
+
+# מספר בטקסט חופשי (כולל מפרידי אלפים), למשל "1,000,000 ש"ח" או "450.5"
+NUMBER_PATTERN = re.compile(r'\d[\d,]*(?:\.\d+)?')
+
+# עמודות המפתח בתחילת כל שורה
+DOCUMENT_KEY_COLUMN = "document_key"
+FILE_NAME_COLUMN = "file_name"
+CONTENT_HASH_COLUMN = "content_hash"
+
+
+def _load_pyarrow():
+    """
+    טעינת pyarrow בשימוש הראשון.
+    """
+    global pa, pq
+
+    if pa is None:
+        import pyarrow
+        import pyarrow.parquet
+
+        pa, pq = pyarrow, pyarrow.parquet
+
+
+def _to_integer(value):
+    """
+    Args:
+        value: ערך שחולץ
+
+    Returns:
+        int: הערך כמספר שלם, או None אם חסר או אינו מספר
+    """
+    try:
+        return int(str(value).strip())
+    except (TypeError, ValueError):
+        return None
+
+
+def _to_decimal(value):
+    """
+    Args:
+        value: ערך שחולץ
+
+    Returns:
+        Decimal: המספר הראשון בערך (ללא מפרידי אלפים), או None אם אין בו מספר
+    """
+    match = NUMBER_PATTERN.search(str(value or ""))
+    if not match:
+        return None
+
+    try:
+        return Decimal(match.group().replace(",", "")).quantize(Decimal(1).scaleb(-DECIMAL_SCALE))
+    except InvalidOperation:
+        return None
+
+
+def _to_string(value):
+    """
+    Args:
+        value: ערך שחולץ
+
+    Returns:
+        str: הערך כמחרוזת, או None אם חסר
+    """
+    if value is None or value == "":
+        return None
+    return str(value)
+
+
+def _field_column(field_id):
+    """
+    Args:
+        field_id (str): מזהה השדה
+
+    Returns:
+        tuple: (סוג העמודה ב-pyarrow, פונקציית ההמרה לערך)
+    """
+    if field_id in INTEGER_FIELDS:
+        return pa.int64(), _to_integer
+    if field_id in DECIMAL_FIELDS:
+        return pa.decimal128(DECIMAL_PRECISION, DECIMAL_SCALE), _to_decimal
+    return pa.string(), _to_string
+
+
+class ParquetPlan:
+    """
+    תוכנית עמודות מהודרת לייצוא Parquet - סכמה עם סוגי נתונים וממיר לכל עמודה.
+
+    שורה לכל מסמך: מזהה המסמך (נתיב הקובץ), שם הקובץ, גיבוב התוכן והשדות הכלליים (גוש וחלקה כמספרים שלמים,
+    שטח כמספר עשרוני). כל רשימה שנבחרו ממנה שדות נשמרת בעמודת רשימה של רשומות
+    (list<struct>) בשם הרשימה (owners, mortgages, remarks), עם שדה לכל ערך שנבחר.
+    ערך שאינו ניתן להמרה לסוג העמודה נשמר כ-null.
+    """
+
+    def __init__(self, selected_field_ids):
+        """
+        הידור תוכנית העמודות.
+
+        Args:
+            selected_field_ids (iterable): מזהי השדות שנבחרו, לפי סדר העמודות
+        """
+        _load_pyarrow()
+        field_ids = tuple(selected_field_ids)
+
+        schema_fields = [
+            pa.field(DOCUMENT_KEY_COLUMN, pa.string()),
+            pa.field(FILE_NAME_COLUMN, pa.string()),
+            pa.field(CONTENT_HASH_COLUMN, pa.string())
+        ]
+
+        # עמודות כלליות: (שם העמודה, מזהה השדה, ממיר)
+        self.general_columns = []
+        for field_id in field_ids:
+            if ColumnPlan.is_list_field(field_id):
+                continue
+            column_type, converter = _field_column(field_id)
+            schema_fields.append(pa.field(field_id, column_type))
+            self.general_columns.append((field_id, converter))
+
+        # עמודות רשימה: {שם הרשימה: [(מפתח הערך, ממיר)]}, לפי סדר הבחירה
+        entry_fields = {}
+        entry_converters = {}
+        for field_id in field_ids:
+            if field_id not in LIST_FIELD_KEYS:
+                continue
+            list_key, value_key = LIST_FIELD_KEYS[field_id]
+            column_type, converter = _field_column(field_id)
+            entry_fields.setdefault(list_key, []).append(pa.field(value_key, column_type))
+            entry_converters.setdefault(list_key, []).append((value_key, converter))
+
+        self.list_columns = {table: entry_converters[table] for table in ENTITY_TABLES if table in entry_converters}
+        for table in self.list_columns:
+            schema_fields.append(pa.field(table, pa.list_(pa.struct(entry_fields[table]))))
+
+        self.schema = pa.schema(schema_fields)
+
+    def row(self, result):
+        """
+        Args:
+            result (ExtractionResult): תוצאת החילוץ
+
+        Returns:
+            dict: {שם עמודה: ערך מומר} לכל עמודות הסכמה
+        """
+        data = result.data
+        row = {
+            DOCUMENT_KEY_COLUMN: TablePlan.document_key(result),
+            FILE_NAME_COLUMN: result.file_name,
+            CONTENT_HASH_COLUMN: result.file_hash
+        }
+
+        for field_id, converter in self.general_columns:
+            row[field_id] = converter(data.get(field_id))
+
+        for table, converters in self.list_columns.items():
+            row[table] = [
+                {value_key: converter(entry.get(value_key)) for value_key, converter in converters}
+                for entry in data.get(table) or ()
+            ]
+
+        return row
+
+
+class ParquetSink:
+    """
+    כתיבת תוצאות חילוץ לקובץ Parquet בזרימה. השורות נאגרות עד row_group_size ונכתבות
+    כקבוצת שורות אחת, כך שהזיכרון תלוי בגודל הקבוצה ולא במספר התוצאות. תוצאות עם
+    שגיאות אינן נכתבות, כמו בייצוא הרגיל.
+    """
+
+    def __init__(self, file_path, selected_fields, row_group_size=PARQUET_ROW_GROUP_SIZE):
+        """
+        אתחול ופתיחת קובץ ה-Parquet.
+
+        Args:
+            file_path (str): נתיב קובץ ה-Parquet
+            selected_fields (list): רשימת מזהי השדות שנבחרו
+            row_group_size (int, optional): מספר השורות בכל קבוצת שורות
+        """
+        if not SUPPORTS_PARQUET:
+            raise RuntimeError("Parquet export requires the 'pyarrow' package")
+
+        self.file_path = file_path
+        self.row_group_size = row_group_size
+        self.rows_written = 0
+
+        self.parquet_plan = ParquetPlan(selected_fields)
+        self._rows = []
+        self._writer = pq.ParquetWriter(file_path, self.parquet_plan.schema)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+    def write(self, result):
+        """
+        הוספת תוצאת חילוץ כשורה בקובץ.
+
+        Args:
+            result (ExtractionResult): תוצאת החילוץ
+        """
+        if result.has_error():
+            return
+
+        self._rows.append(self.parquet_plan.row(result))
+
+        if len(self._rows) >= self.row_group_size:
+            self.flush()
+
+    def flush(self):
+        """
+        כתיבת השורות שנאגרו כקבוצת שורות.
+        """
+        if not self._rows:
+            return
+
+        self._writer.write_table(pa.Table.from_pylist(self._rows, schema=self.parquet_plan.schema))
+        self.rows_written += len(self._rows)
+        self._rows = []
+
+    def close(self):
+        """
+        כתיבת השורות שנותרו וסגירת הקובץ.
+        """
+        if self._writer is None:
+            return
+
+        try:
+            self.flush()
+        finally:
+            self._writer.close()
+            self._writer = None
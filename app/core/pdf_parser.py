@@ -4,12 +4,169 @@
 מודול לחילוץ טקסט מקבצי PDF.
 """
 
-import pdfplumber
 from app.utils.logger import get_logger
 
 logger = get_logger(__name__)
 
 
+class PDFDocument:
+    """
+    מסמך PDF פתוח - פותח את הקובץ פעם אחת ומאפשר לחלץ טקסט, טבלאות ומילים
+    מאותם עמודים, כך שפריסת כל עמוד (pdfminer) מחושבת פעם אחת בלבד.
+    """
+
+    def __init__(self, pdf_path):
+        """
+        פתיחת מסמך PDF.
+
+        Args:
+            pdf_path (str): נתיב לקובץ ה-PDF
+        """
+        # pdfplumber (ו-pdfminer) נטענים רק בפתיחת המסמך הראשון
+        import pdfplumber
+
+        self.pdf_path = pdf_path
+        self._pdf = pdfplumber.open(pdf_path)
+
+        # תוצאות שחולצו מכל עמוד {מספר עמוד: ערך}
+        self._page_texts = {}
+        self._page_tables = {}
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+    @property
+    def page_count(self):
+        """
+        Returns:
+            int: מספר העמודים במסמך
+        """
+        return len(self._pdf.pages)
+
+    def extract_page_text(self, page_number):
+        """
+        חילוץ הטקסט של עמוד.
+
+        Args:
+            page_number (int): מספר העמוד (מ-0)
+
+        Returns:
+            str: טקסט העמוד (מחרוזת ריקה אם אין טקסט)
+        """
+        if page_number not in self._page_texts:
+            self._page_texts[page_number] = self._pdf.pages[page_number].extract_text() or ""
+
+        return self._page_texts[page_number]
+
+    def extract_page_tables(self, page_number):
+        """
+        חילוץ הטבלאות של עמוד.
+
+        Args:
+            page_number (int): מספר העמוד (מ-0)
+
+        Returns:
+            list: רשימת הטבלאות בעמוד
+        """
+        if page_number not in self._page_tables:
+            self._page_tables[page_number] = self._pdf.pages[page_number].extract_tables() or []
+
+        return self._page_tables[page_number]
+
+    def extract_page_words(self, page_number):
+        """
+        חילוץ המילים של עמוד יחד עם תיבות המיקום שלהן.
+
+        Args:
+            page_number (int): מספר העמוד (מ-0)
+
+        Returns:
+            list: רשימת דיקשנרי לכל מילה (טקסט וקואורדינטות)
+        """
+        return self._pdf.pages[page_number].extract_words()
+
+    def iter_page_texts(self, release_pages=False):
+        """
+        חילוץ הטקסט עמוד אחר עמוד - עמוד נפרס רק כשהצרכן מבקש אותו, כך שהפסקת
+        הקריאה חוסכת את פריסת העמודים הבאים.
+
+        Args:
+            release_pages (bool, optional): האם לשחרר את מטמון כל עמוד לאחר החילוץ
+
+        Yields:
+            str: טקסט כל עמוד (מחרוזת ריקה אם אין טקסט)
+        """
+        for page_number in range(self.page_count):
+            page_text = self.extract_page_text(page_number)
+
+            if release_pages:
+                self.release_page(page_number)
+
+            yield page_text
+
+    def extract_text(self, release_pages=False):
+        """
+        חילוץ הטקסט המלא של המסמך.
+
+        Args:
+            release_pages (bool, optional): האם לשחרר את מטמון כל עמוד לאחר החילוץ
+
+        Returns:
+            str: הטקסט המלא, עם שורה ריקה בין עמודים
+        """
+        text_content = ""
+
+        for page_text in self.iter_page_texts(release_pages):
+            if page_text:
+                text_content += page_text + "\n\n"
+
+        return text_content
+
+    def extract_tables(self, release_pages=False):
+        """
+        חילוץ כל הטבלאות במסמך.
+
+        Args:
+            release_pages (bool, optional): האם לשחרר את מטמון כל עמוד לאחר החילוץ
+
+        Returns:
+            list: רשימת כל הטבלאות במסמך
+        """
+        tables = []
+
+        for page_number in range(self.page_count):
+            tables.extend(self.extract_page_tables(page_number))
+
+            if release_pages:
+                self.release_page(page_number)
+
+        return tables
+
+    def release_page(self, page_number):
+        """
+        שחרור מטמון הפריסה של עמוד. טקסט וטבלאות שכבר חולצו נשמרים.
+
+        Args:
+            page_number (int): מספר העמוד (מ-0)
+        """
+        page = self._pdf.pages[page_number]
+
+        # בגרסאות חדשות של pdfplumber close משחרר את כל המטמונים של העמוד
+        release = getattr(page, "close", None) or page.flush_cache
+        release()
+
+    def close(self):
+        """
+        סגירת המסמך ושחרור כל המשאבים.
+        """
+        self._page_texts.clear()
+        self._page_tables.clear()
+        self._pdf.close()
+
+
 class PDFParser:
     """
     מחלקה לחילוץ טקסט מקבצי PDF.
@@ -22,6 +179,30 @@ class PDFParser:
         """
         pass
 
+    @staticmethod
+    def get_backend_id():
+        """
+        מזהה מנוע חילוץ הטקסט וגרסתו - טקסט שחולץ בגרסה אחרת עשוי להיות שונה.
+
+        Returns:
+            str: מזהה המנוע והגרסה
+        """
+        import pdfplumber
+
+        return f"pdfplumber-{pdfplumber.__version__}"
+
+    def open_document(self, pdf_path):
+        """
+        פתיחת מסמך PDF לחילוץ מספר סוגי מידע מאותם עמודים.
+
+        Args:
+            pdf_path (str): נתיב לקובץ ה-PDF
+
+        Returns:
+            PDFDocument: המסמך הפתוח (יש לסגור אותו, או להשתמש ב-with)
+        """
+        return PDFDocument(pdf_path)
+
     def extract_text_from_pdf(self, pdf_path):
         """
         חילוץ טקסט מלא מקובץ PDF.
@@ -33,16 +214,8 @@ class PDFParser:
             str: הטקסט המלא מהקובץ, או None במקרה של שגיאה
         """
         try:
-            with pdfplumber.open(pdf_path) as pdf:
-                text_content = ""
-
-                # איסוף הטקסט מכל העמודים
-                for page in pdf.pages:
-                    page_text = page.extract_text()
-                    if page_text:
-                        text_content += page_text + "\n\n"
-
-                return text_content
+            with self.open_document(pdf_path) as document:
+                return document.extract_text(release_pages=True)
 
         except Exception as e:
             logger.error(f"Error extracting text from PDF {pdf_path}: {str(e)}")
@@ -59,16 +232,40 @@ class PDFParser:
             list: רשימה של טבלאות מהקובץ, או רשימה ריקה במקרה של שגיאה
         """
         try:
-            tables = []
+            with self.open_document(pdf_path) as document:
+                return document.extract_tables(release_pages=True)
+
+        except Exception as e:
+            logger.error(f"Error extracting tables from PDF {pdf_path}: {str(e)}")
+            return []
+
+    def extract_text_and_tables_from_pdf(self, pdf_path):
+        """
+        חילוץ טקסט וטבלאות מקובץ PDF בפתיחה אחת ובפריסה אחת של כל עמוד.
+
+        Args:
+            pdf_path (str): נתיב לקובץ ה-PDF
+
+        Returns:
+            tuple: (הטקסט המלא או None, רשימת הטבלאות) - (None, []) במקרה של שגיאה
+        """
+        try:
+            with self.open_document(pdf_path) as document:
+                text_content = ""
+                tables = []
 
-            with pdfplumber.open(pdf_path) as pdf:
-                for page in pdf.pages:
-                    page_tables = page.extract_tables()
-                    if page_tables:
-                        tables.extend(page_tables)
+                for page_number in range(document.page_count):
+                    page_text = document.extract_page_text(page_number)
+                    if page_text:
+                        text_content += page_text + "\n\n"
 
-            return tables
+                    tables.extend(document.extract_page_tables(page_number))
+
+                    # שני החילוצים הסתיימו - אין צורך בפריסת העמוד יותר
+                    document.release_page(page_number)
+
+                return text_content, tables
 
         except Exception as e:
-            logger.error(f"Error extracting tables from PDF {pdf_path}: {str(e)}")
-            return []
\ No newline at end of file
+            logger.error(f"Error extracting text and tables from PDF {pdf_path}: {str(e)}")
+            return None, []
@@ -0,0 +1,111 @@
+# -*- coding: utf-8 -*-
+
+"""
+מודול אינדקס חלקים - איתור גבולות חלקי הנסח (בעלויות, משכנתאות, הערות).
+"""
+
+from bisect import bisect_left
+
+from app.utils.regex_patterns import SECTION_HEADERS, SECTION_TERMINATORS
+
+
+class SectionIndex:
+    """
+    אינדקס של חלקי המסמך, מחושב פעם אחת לכל מסמך בסריקה לינארית של כותרות החלקים.
+    מחליף את הביטויים העצלים (.*? עם lookahead) שהופעלו על כל הטקסט בנפרד לכל חלק.
+
+    כל חלק מתחיל בכותרת שלו ונמשך עד הכותרת המסיימת הקרובה שאחריה (ראו
+    SECTION_TERMINATORS) או עד סוף הטקסט. הגבולות מוחזרים כהיסטים בטקסט המקורי,
+    כך שהמחלצים יכולים לסרוק את החלק ללא העתקת הטקסט.
+    """
+
+    def __init__(self, text_content):
+        """
+        בניית האינדקס.
+
+        Args:
+            text_content (str): הטקסט המלא
+        """
+        # סוף הטקסט לצורך חלקים שאין להם כותרת מסיימת (לפני שורה חדשה אחרונה, כמו $)
+        self.text_end = len(text_content)
+        if text_content.endswith("\n"):
+            self.text_end -= 1
+
+        # מיקומי כל הופעות הכותרת של כל חלק, בסדר עולה
+        self.header_positions = {}
+        for section, header in SECTION_HEADERS.items():
+            positions = []
+            pos = text_content.find(header)
+            while pos != -1:
+                positions.append(pos)
+                pos = text_content.find(header, pos + len(header))
+            self.header_positions[section] = positions
+
+        # מיקומי הכותרות המסיימות של כל חלק, ממוזגים וממוינים
+        self._terminator_positions = {
+            section: sorted(pos for terminator in terminators for pos in self.header_positions[terminator])
+            for section, terminators in SECTION_TERMINATORS.items()
+        }
+
+    def _section_end(self, section, start):
+        """
+        Args:
+            section (str): שם החלק
+            start (int): מיקום כותרת החלק
+
+        Returns:
+            int: מיקום סוף החלק (לא כולל)
+        """
+        terminators = self._terminator_positions[section]
+        idx = bisect_left(terminators, start + len(SECTION_HEADERS[section]))
+
+        if idx < len(terminators):
+            return min(terminators[idx], self.text_end)
+
+        return self.text_end
+
+    def span(self, section):
+        """
+        גבולות ההופעה הראשונה של חלק.
+
+        Args:
+            section (str): שם החלק (owners, mortgages, remarks)
+
+        Returns:
+            tuple או None: (התחלה, סוף) בטקסט, או None אם החלק לא נמצא
+        """
+        positions = self.header_positions[section]
+        if not positions:
+            return None
+
+        return positions[0], self._section_end(section, positions[0])
+
+    def spans(self, section):
+        """
+        גבולות כל ההופעות של חלק (במסמכים עם בלוקים חוזרים).
+
+        Args:
+            section (str): שם החלק (owners, mortgages, remarks)
+
+        Returns:
+            list: רשימת (התחלה, סוף) לכל הופעה של כותרת החלק
+        """
+        return [(start, self._section_end(section, start)) for start in self.header_positions[section]]
+
+    def is_closed(self, section):
+        """
+        בדיקה אם ההופעה הראשונה של חלק מסתיימת בכותרת מסיימת. גבולות של חלק סגור
+        לא ישתנו אם יתווסף טקסט בסוף (למשל עמודים נוספים של המסמך).
+
+        Args:
+            section (str): שם החלק (owners, mortgages, remarks)
+
+        Returns:
+            bool: האם החלק נמצא ויש אחריו כותרת מסיימת
+        """
+        positions = self.header_positions[section]
+        if not positions:
+            return False
+
+        terminators = self._terminator_positions[section]
+        return bisect_left(terminators, positions[0] + len(SECTION_HEADERS[section])) < len(terminators)
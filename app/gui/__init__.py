@@ -8,4 +8,5 @@ from app.gui.main_window import MainWindow
 from app.gui.widgets.field_selection import FieldSelectionWidget
 from app.gui.widgets.template_settings import TemplateSettingsWidget
 from app.gui.widgets.result_widget import ResultsWidget
-from app.gui.threads.extraction_thread import ExtractionThread
\ No newline at end of file
+from app.gui.threads.extraction_thread import ExtractionThread
+from app.gui.threads.export_thread import ExportThread
\ No newline at end of file
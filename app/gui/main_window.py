@@ -7,14 +7,17 @@
 import os
 from PyQt5.QtWidgets import (QMainWindow, QVBoxLayout, QHBoxLayout,
                              QWidget, QPushButton, QLabel, QFileDialog,
-                             QSplitter, QProgressBar, QMessageBox)
-from PyQt5.QtCore import Qt
+                             QSplitter, QProgressBar, QMessageBox, QCheckBox,
+                             QSpinBox)
+from PyQt5.QtCore import Qt, QTimer
 
-from app.config.constants import APP_NAME, DEFAULT_WINDOW_SIZE
+from app.config.constants import APP_NAME, DEFAULT_WINDOW_SIZE, DEFAULT_MAX_WORKERS, RESULTS_FLUSH_INTERVAL_MS
 from app.gui.widgets.field_selection import FieldSelectionWidget
 from app.gui.widgets.template_settings import TemplateSettingsWidget
-from app.gui.widgets.results_widget import ResultsWidget
+from app.gui.widgets.result_widget import ResultsWidget
 from app.gui.threads.extraction_thread import ExtractionThread
+from app.core.cache import TextCache, ResultCache
+from app.core.export_manager import CsvSink, JsonLinesSink
 from app.models.extraction_config import ExtractionConfig
 
 
@@ -34,6 +37,19 @@ class MainWindow(QMainWindow):
 
         self.config = config
         self.selected_pdf_files = []
+        self.text_cache = TextCache(self.config.cache_dir)
+        self.result_cache = ResultCache(self.config.cache_dir)
+
+        # תוצאות שהתקבלו מתהליכון החילוץ וטרם נוספו לטבלה - מתווספות במנות
+        self.pending_results = []
+        self.results_flush_timer = QTimer(self)
+        self.results_flush_timer.setInterval(RESULTS_FLUSH_INTERVAL_MS)
+        self.results_flush_timer.timeout.connect(self.flush_pending_results)
+
+        # קבצי החילוץ הנוכחי (לפי סדר הבחירה) ותוצאות שנטענו מקובץ JSON Lines בהמשך אצווה -
+        # בסיום החילוץ הטבלה נבנית מחדש לפי סדר הקבצים
+        self.extraction_files = []
+        self.resumed_results = []
 
         # אתחול רכיבי הממשק
         self.init_ui()
@@ -94,10 +110,15 @@ class MainWindow(QMainWindow):
         # תווית מצב קבצים
         self.files_label = QLabel("לא נבחרו קבצים")
 
+        # כפתור ניקוי המטמונים
+        self.clear_cache_btn = QPushButton("נקה מטמון")
+        self.clear_cache_btn.clicked.connect(self.clear_cache)
+
         # הוספת הרכיבים ללייאאוט
         self.top_layout.addWidget(self.select_files_btn)
         self.top_layout.addWidget(self.select_folder_btn)
         self.top_layout.addWidget(self.files_label)
+        self.top_layout.addWidget(self.clear_cache_btn)
 
         # הוספת הלייאאוט ללייאאוט הראשי
         self.main_layout.addLayout(self.top_layout)
@@ -143,6 +164,23 @@ class MainWindow(QMainWindow):
         self.extract_btn.clicked.connect(self.extract_data)
         self.extract_btn.setEnabled(False)  # לא פעיל עד שייבחרו קבצים
 
+        # הגדרות עיבוד מקבילי
+        self.parallel_checkbox = QCheckBox("עיבוד מקבילי")
+        self.parallel_checkbox.setChecked(DEFAULT_MAX_WORKERS > 1)
+
+        self.workers_label = QLabel("תהליכים:")
+        self.workers_spinbox = QSpinBox()
+        self.workers_spinbox.setRange(1, max(DEFAULT_MAX_WORKERS * 2, 1))
+        self.workers_spinbox.setValue(DEFAULT_MAX_WORKERS)
+        self.workers_spinbox.setEnabled(self.parallel_checkbox.isChecked())
+        self.parallel_checkbox.toggled.connect(self.workers_spinbox.setEnabled)
+
+        # כתיבת התוצאות לקובץ CSV במהלך החילוץ (נשמרות גם אם החילוץ נקטע)
+        self.live_csv_checkbox = QCheckBox("שמירה רציפה ל-CSV")
+
+        # כתיבת התוצאות לקובץ JSON Lines במהלך החילוץ - ניתן להמשיך ממנו אצווה שנקטעה
+        self.live_jsonl_checkbox = QCheckBox("שמירה רציפה ל-JSON Lines")
+
         # פס התקדמות
         self.progress_bar = QProgressBar()
         self.progress_bar.setTextVisible(True)
@@ -153,6 +191,11 @@ class MainWindow(QMainWindow):
 
         # הוספת הרכיבים ללייאאוט
         self.bottom_layout.addWidget(self.extract_btn)
+        self.bottom_layout.addWidget(self.parallel_checkbox)
+        self.bottom_layout.addWidget(self.workers_label)
+        self.bottom_layout.addWidget(self.workers_spinbox)
+        self.bottom_layout.addWidget(self.live_csv_checkbox)
+        self.bottom_layout.addWidget(self.live_jsonl_checkbox)
         self.bottom_layout.addWidget(self.progress_bar)
         self.bottom_layout.addWidget(self.status_label)
 
@@ -200,6 +243,14 @@ class MainWindow(QMainWindow):
                 self.files_label.setText("לא נמצאו קבצי PDF בתיקייה")
                 self.extract_btn.setEnabled(False)
 
+    def clear_cache(self):
+        """
+        ניקוי מטמון הטקסט ומטמון התוצאות.
+        """
+        self.text_cache.clear()
+        self.result_cache.clear()
+        self.status_label.setText("המטמון נוקה")
+
     def extract_data(self):
         """
         הפעלת תהליך חילוץ הנתונים.
@@ -219,8 +270,32 @@ class MainWindow(QMainWindow):
         extraction_config = ExtractionConfig()
         extraction_config.update_from_field_ids(selected_field_ids)
 
-        # איפוס רכיב התוצאות
-        self.results_widget.clear_results()
+        # קובץ CSV שהתוצאות ייכתבו אליו במהלך החילוץ (אם נבחר)
+        result_sinks = []
+        if self.live_csv_checkbox.isChecked():
+            csv_sink = self._create_live_csv_sink(selected_field_ids)
+            if csv_sink is None:
+                return
+            result_sinks.append(csv_sink)
+
+        # קובץ JSON Lines - בהמשך אצווה שנקטעה, קבצים שכבר מופיעים בו אינם מעובדים שוב
+        pdf_files = self.selected_pdf_files
+        previous_results = []
+        if self.live_jsonl_checkbox.isChecked():
+            jsonl_sink, previous_results = self._create_live_jsonl_sink()
+            if jsonl_sink is None:
+                self._close_sinks(result_sinks)
+                return
+            result_sinks.append(jsonl_sink)
+
+            completed_paths = {result.file_path for result in previous_results}
+            pdf_files = [pdf_path for pdf_path in pdf_files if pdf_path not in completed_paths]
+
+        # איפוס רכיב התוצאות - התוצאות יתווספו לטבלה במהלך החילוץ
+        self.extraction_files = list(self.selected_pdf_files)
+        self.resumed_results = previous_results
+        self.pending_results = list(previous_results)
+        self.results_widget.begin_results(selected_field_ids)
 
         # עדכון ממשק המשתמש
         self.progress_bar.setValue(0)
@@ -228,16 +303,106 @@ class MainWindow(QMainWindow):
         self.status_label.setText("מתחיל חילוץ...")
 
         # הפעלת תהליכון החילוץ
-        self.extraction_thread = ExtractionThread(self.selected_pdf_files, extraction_config)
+        self.extraction_thread = ExtractionThread(
+            pdf_files,
+            extraction_config,
+            parallel=self.parallel_checkbox.isChecked(),
+            max_workers=self.workers_spinbox.value(),
+            text_cache=self.text_cache,
+            result_cache=self.result_cache,
+            result_sinks=result_sinks
+        )
 
         # חיבור אותות התהליכון
         self.extraction_thread.progress.connect(self.update_progress)
         self.extraction_thread.file_progress.connect(self.update_status)
+        self.extraction_thread.result_ready.connect(self.queue_result)
         self.extraction_thread.extraction_complete.connect(self.handle_extraction_results)
 
         # הפעלת התהליכון
+        self.results_flush_timer.start()
         self.extraction_thread.start()
 
+    def _create_live_csv_sink(self, selected_field_ids):
+        """
+        בחירת קובץ CSV ופתיחתו לכתיבה רציפה של התוצאות.
+
+        Args:
+            selected_field_ids (list): רשימת מזהי השדות שנבחרו
+
+        Returns:
+            CsvSink: היעד הפתוח, או None אם המשתמש ביטל או שהקובץ לא נפתח
+        """
+        file_name, _ = QFileDialog.getSaveFileName(
+            self, "שמירה רציפה לקובץ CSV", "", "CSV Files (*.csv);;All Files (*)")
+
+        if not file_name:
+            return None
+
+        # הוספת סיומת אם צריך
+        if not file_name.lower().endswith(".csv"):
+            file_name += ".csv"
+
+        try:
+            return CsvSink(file_name, selected_field_ids)
+        except OSError as e:
+            QMessageBox.critical(self, "שגיאה", f"לא ניתן לפתוח את הקובץ לכתיבה:\n{str(e)}")
+            return None
+
+    def _create_live_jsonl_sink(self):
+        """
+        בחירת קובץ JSON Lines ופתיחתו לכתיבה רציפה של התוצאות. אם הקובץ קיים, המשתמש
+        בוחר אם להמשיך ממנו (הוספה לסופו ודילוג על קבצים שכבר חולצו בהצלחה) או לדרוס אותו.
+
+        Returns:
+            tuple: (JsonLinesSink או None אם המשתמש ביטל או שהקובץ לא נפתח,
+                    רשימת התוצאות הקודמות בקובץ עבור הקבצים שנבחרו)
+        """
+        file_name, _ = QFileDialog.getSaveFileName(
+            self, "שמירה רציפה לקובץ JSON Lines", "", "JSON Lines Files (*.jsonl);;All Files (*)",
+            options=QFileDialog.DontConfirmOverwrite)
+
+        if not file_name:
+            return None, []
+
+        # הוספת סיומת אם צריך
+        if not file_name.lower().endswith(".jsonl"):
+            file_name += ".jsonl"
+
+        append = False
+        if os.path.exists(file_name) and os.path.getsize(file_name) > 0:
+            answer = QMessageBox.question(
+                self, "קובץ קיים",
+                "הקובץ כבר קיים. להמשיך ממנו ולדלג על קבצים שכבר עובדו?\n(לא - הקובץ יידרס)",
+                QMessageBox.Yes | QMessageBox.No | QMessageBox.Cancel)
+
+            if answer == QMessageBox.Cancel:
+                return None, []
+            append = answer == QMessageBox.Yes
+
+        try:
+            previous_results = []
+            if append:
+                selected_paths = set(self.selected_pdf_files)
+                previous_results = [result for pdf_path, result in JsonLinesSink.completed_results(file_name).items()
+                                    if pdf_path in selected_paths]
+
+            return JsonLinesSink(file_name, append=append), previous_results
+
+        except OSError as e:
+            QMessageBox.critical(self, "שגיאה", f"לא ניתן לפתוח את הקובץ לכתיבה:\n{str(e)}")
+            return None, []
+
+    def _close_sinks(self, result_sinks):
+        """
+        סגירת יעדי תוצאות שנפתחו לחילוץ שלא התחיל.
+
+        Args:
+            result_sinks (list): היעדים לסגירה
+        """
+        for sink in result_sinks:
+            sink.close()
+
     def update_progress(self, value):
         """
         עדכון פס ההתקדמות.
@@ -258,6 +423,25 @@ class MainWindow(QMainWindow):
         message = f"מעבד קובץ {os.path.basename(file_name)}... ({int(percent)}%)"
         self.status_label.setText(message)
 
+    def queue_result(self, result):
+        """
+        שמירת תוצאה שהתקבלה מתהליכון החילוץ עד לעדכון הבא של הטבלה.
+
+        Args:
+            result (ExtractionResult): תוצאת החילוץ של קובץ
+        """
+        self.pending_results.append(result)
+
+    def flush_pending_results(self):
+        """
+        הוספת כל התוצאות שהצטברו לטבלת התוצאות בפעולה אחת.
+        """
+        if not self.pending_results:
+            return
+
+        results, self.pending_results = self.pending_results, []
+        self.results_widget.append_results(results)
+
     def handle_extraction_results(self, results):
         """
         טיפול בתוצאות החילוץ.
@@ -265,12 +449,22 @@ class MainWindow(QMainWindow):
         Args:
             results (list): רשימת תוצאות החילוץ
         """
+        # הוספת התוצאות האחרונות שטרם הוצגו
+        self.results_flush_timer.stop()
+        self.flush_pending_results()
+
+        # התוצאות נוספו לטבלה לפי סדר הסיום - בנייה מחדש לפי סדר הקבצים שנבחרו
+        # (רשימה ריקה - החילוץ נכשל, והטבלה נשארת עם מה שהתקבל)
+        ordered_results = None
+        if results:
+            file_order = {pdf_path: idx for idx, pdf_path in enumerate(self.extraction_files)}
+            ordered_results = sorted(self.resumed_results + results,
+                                     key=lambda result: file_order.get(result.file_path, len(file_order)))
+        self.results_widget.finish_results(ordered_results)
+
         # עדכון ממשק המשתמש
         self.extract_btn.setEnabled(True)
         self.status_label.setText(f"הסתיים חילוץ של {len(results)} קבצים")
 
-        # הצגת התוצאות
-        self.results_widget.update_results(results, self.field_selection.get_selected_field_ids())
-
         # התאמת גדלים שוב לאחר מילוי התוצאות
         self.splitter.setSizes([200, 600])
\ No newline at end of file
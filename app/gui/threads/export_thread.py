@@ -0,0 +1,84 @@
+# -*- coding: utf-8 -*-
+
+"""
+תהליכון לייצוא תוצאות החילוץ לקובץ.
+"""
+
+import threading
+from PyQt5.QtCore import QThread, pyqtSignal
+
+from app.core.export_manager import ExportManager
+from app.utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+# פורמטי הייצוא הנתמכים ושם המתודה המתאימה במנהל הייצוא
+EXPORT_METHODS = {
+    "excel": "export_to_excel",
+    "csv": "export_to_csv",
+    "excel_merge": "merge_into_excel",
+    "csv_merge": "merge_into_csv",
+    "parquet": "export_to_parquet",
+    "jsonl": "export_to_jsonl",
+    "excel_tables": "export_tables_to_excel",
+    "csv_tables": "export_tables_to_csv"
+}
+
+
+class ExportThread(QThread):
+    """
+    תהליכון לביצוע ייצוא התוצאות ברקע, עם דיווח התקדמות ואפשרות ביטול.
+    """
+
+    # אותות להודעות והתקדמות
+    progress = pyqtSignal(int)
+    export_complete = pyqtSignal(bool, str)
+
+    def __init__(self, export_format, results, selected_field_ids, file_path):
+        """
+        אתחול תהליכון הייצוא.
+
+        Args:
+            export_format (str): פורמט הייצוא (מפתח ב-EXPORT_METHODS)
+            results (list): רשימת תוצאות החילוץ לייצוא
+            selected_field_ids (list): רשימת מזהי השדות שנבחרו
+            file_path (str): נתיב הקובץ שייווצר
+        """
+        super().__init__()
+        self.export_format = export_format
+
+        # עותק של הרשימות - חילוץ חדש שמתחיל במהלך הייצוא לא ישנה את הנתונים המיוצאים
+        self.results = list(results)
+        self.selected_field_ids = list(selected_field_ids)
+
+        self.file_path = file_path
+        self.export_manager = ExportManager()
+        self.cancel_event = threading.Event()
+
+    def cancel(self):
+        """
+        בקשת ביטול הייצוא. הקובץ החלקי נמחק והתהליכון מסתיים עם export_complete(False).
+        """
+        self.cancel_event.set()
+
+    def is_cancelled(self):
+        """
+        Returns:
+            bool: האם התבקש ביטול הייצוא
+        """
+        return self.cancel_event.is_set()
+
+    def run(self):
+        """
+        מתודת הריצה העיקרית של התהליכון.
+        """
+        try:
+            export_method = getattr(self.export_manager, EXPORT_METHODS[self.export_format])
+            success = export_method(self.results, self.selected_field_ids, self.file_path,
+                                    progress_callback=self.progress.emit, cancel_event=self.cancel_event)
+
+        except Exception as e:
+            logger.error(f"Error in export thread: {str(e)}")
+            success = False
+
+        self.export_complete.emit(success, self.file_path)
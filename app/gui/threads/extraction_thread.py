@@ -21,20 +21,31 @@ class ExtractionThread(QThread):
     # אותות להודעות והתקדמות
     progress = pyqtSignal(int)
     file_progress = pyqtSignal(str, float)
+    result_ready = pyqtSignal(object)
     extraction_complete = pyqtSignal(list)
 
-    def __init__(self, pdf_files, extraction_config):
+    def __init__(self, pdf_files, extraction_config, parallel=False, max_workers=None, text_cache=None,
+                 result_cache=None, result_sinks=None):
         """
         אתחול תהליכון החילוץ.
 
         Args:
             pdf_files (list): רשימת נתיבים לקבצי PDF
             extraction_config (ExtractionConfig): הגדרות החילוץ
+            parallel (bool, optional): האם לעבד את הקבצים במקביל
+            max_workers (int, optional): מספר תהליכי העבודה בעיבוד מקבילי
+            text_cache (TextCache, optional): מטמון הטקסט המחולץ
+            result_cache (ResultCache, optional): מטמון תוצאות החילוץ
+            result_sinks (list, optional): יעדים (למשל CsvSink) שכל תוצאה נכתבת אליהם עם סיומה -
+                נסגרים בסוף החילוץ
         """
         super().__init__()
         self.pdf_files = pdf_files
         self.extraction_config = extraction_config
-        self.data_processor = DataProcessor()
+        self.parallel = parallel
+        self.max_workers = max_workers
+        self.data_processor = DataProcessor(text_cache=text_cache, result_cache=result_cache)
+        self.result_sinks = list(result_sinks or [])
 
     def run(self):
         """
@@ -42,12 +53,22 @@ class ExtractionThread(QThread):
         מבצעת את חילוץ המידע ומעדכנת את ההתקדמות.
         """
         try:
-            # עיבוד הקבצים באמצעות מעבד הנתונים
-            results = self.data_processor.process_multiple_pdf_files(
-                self.pdf_files,
-                self.extraction_config,
-                self._progress_callback
-            )
+            results = [None] * len(self.pdf_files)
+            total_files = len(self.pdf_files)
+
+            # עיבוד הקבצים באמצעות מעבד הנתונים - כל תוצאה נשלחת מיד עם סיומה. העיבוד
+            # בתהליכי עבודה מבודדים, כך שקובץ שנתקע או מפיל את התהליך לא עוצר את האצווה
+            for completed, (idx, result) in enumerate(self.data_processor.iter_process(
+                    self.pdf_files,
+                    self.extraction_config,
+                    parallel=self.parallel,
+                    max_workers=self.max_workers,
+                    with_index=True,
+                    isolated=True), 1):
+                results[idx] = result
+                self._write_to_sinks(result)
+                self.result_ready.emit(result)
+                self._progress_callback(result.file_path, completed / total_files * 100)
 
             # סיום החילוץ - שליחת הנתונים חזרה לממשק המשתמש
             self.extraction_complete.emit(results)
@@ -57,6 +78,43 @@ class ExtractionThread(QThread):
             # במקרה של שגיאה - שליחת רשימה ריקה
             self.extraction_complete.emit([])
 
+        finally:
+            self._close_sinks()
+
+    def _write_to_sinks(self, result):
+        """
+        כתיבת תוצאה לכל היעדים. יעד שנכשל מוסר, והחילוץ ממשיך.
+
+        Args:
+            result (ExtractionResult): תוצאת החילוץ
+        """
+        for sink in list(self.result_sinks):
+            try:
+                sink.write(result)
+            except Exception as e:
+                logger.error(f"Error writing result to sink {sink.file_path}: {str(e)}")
+                self.result_sinks.remove(sink)
+                self._close_sink(sink)
+
+    def _close_sinks(self):
+        """
+        סגירת כל היעדים (שמירת השורות האחרונות לדיסק).
+        """
+        for sink in self.result_sinks:
+            self._close_sink(sink)
+
+        self.result_sinks = []
+
+    def _close_sink(self, sink):
+        """
+        Args:
+            sink: היעד לסגירה
+        """
+        try:
+            sink.close()
+        except Exception as e:
+            logger.error(f"Error closing sink {sink.file_path}: {str(e)}")
+
     def _progress_callback(self, file_path, percent):
         """
         פונקציית קולבק להתקדמות עיבוד הקבצים.
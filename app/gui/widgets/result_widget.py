@@ -6,18 +6,26 @@
 
 import os
 from PyQt5.QtWidgets import (QWidget, QVBoxLayout, QHBoxLayout,
-                             QLabel, QPushButton, QTableWidget, QTableWidgetItem,
+                             QLabel, QPushButton, QTableView,
                              QHeaderView, QFileDialog, QMessageBox, QTabWidget,
-                             QSplitter, QTextEdit)
-from PyQt5.QtGui import QFont, QColor
+                             QSplitter, QTextEdit, QProgressBar, QCheckBox)
+from PyQt5.QtGui import QFont
 from PyQt5.QtCore import Qt
 
 from app.config.constants import FIELD_ID_TO_NAME
-from app.core.export_manager import ExportManager
+from app.core.parquet_export import SUPPORTS_PARQUET
+from app.gui.threads.export_thread import ExportThread
+from app.gui.widgets.results_table_model import ResultsTableModel, FilesTableModel
 from app.utils.logger import get_logger
 
 logger = get_logger(__name__)
 
+# מספר השורות שלפיהן נקבע רוחב העמודות (במקום מדידת כל התאים בטבלה)
+COLUMN_WIDTH_SAMPLE_ROWS = 100
+
+# רוחב מקסימלי של עמודה בפיקסלים בעת התאמה אוטומטית
+MAX_COLUMN_WIDTH = 400
+
 
 class ResultsWidget(QWidget):
     """
@@ -33,7 +41,8 @@ class ResultsWidget(QWidget):
         """
         super().__init__(parent)
 
-        self.export_manager = ExportManager()
+        # תהליכוני ייצוא פעילים והתקדמות כל אחד מהם {ExportThread: אחוזים}
+        self.export_threads = {}
         self.extraction_results = []
         self.selected_field_ids = []
 
@@ -58,11 +67,17 @@ class ResultsWidget(QWidget):
         self.table_tab = QWidget()
         self.table_layout = QVBoxLayout(self.table_tab)
 
-        # טבלה להצגת התוצאות
-        self.results_table = QTableWidget()
+        # טבלה להצגת התוצאות - מודל שמחשב רק את התאים הנראים
+        self.results_model = ResultsTableModel(self)
+
+        self.results_table = QTableView()
+        self.results_table.setModel(self.results_model)
         self.results_table.setAlternatingRowColors(True)
-        self.results_table.setSelectionBehavior(QTableWidget.SelectRows)
-        self.results_table.horizontalHeader().setSectionResizeMode(QHeaderView.Stretch)
+        self.results_table.setSelectionBehavior(QTableView.SelectRows)
+        self.results_table.setEditTriggers(QTableView.NoEditTriggers)
+        self.results_table.setSortingEnabled(True)
+        self.results_table.horizontalHeader().setSectionResizeMode(QHeaderView.Interactive)
+        self.results_table.horizontalHeader().setStretchLastSection(True)
 
         self.table_layout.addWidget(self.results_table)
 
@@ -74,11 +89,11 @@ class ResultsWidget(QWidget):
         self.details_splitter = QSplitter(Qt.Horizontal)
 
         # טבלת קבצים בצד ימין
-        self.files_table = QTableWidget()
-        self.files_table.setColumnCount(2)
-        self.files_table.setHorizontalHeaderLabels(["שם קובץ", "סטטוס"])
+        self.files_model = FilesTableModel(self)
+        self.files_table = QTableView()
+        self.files_table.setModel(self.files_model)
         self.files_table.horizontalHeader().setSectionResizeMode(QHeaderView.Stretch)
-        self.files_table.setSelectionBehavior(QTableWidget.SelectRows)
+        self.files_table.setSelectionBehavior(QTableView.SelectRows)
         self.files_table.selectionModel().selectionChanged.connect(self.file_selected)
 
         # פרטי המסמך בצד שמאל
@@ -106,12 +121,49 @@ class ResultsWidget(QWidget):
         self.export_csv_btn = QPushButton("ייצא ל-CSV")
         self.export_csv_btn.clicked.connect(self.export_to_csv)
 
+        # ייצוא Parquet זמין רק כש-pyarrow מותקן
+        self.export_parquet_btn = QPushButton("ייצא ל-Parquet")
+        self.export_parquet_btn.clicked.connect(self.export_to_parquet)
+        self.export_parquet_btn.setEnabled(SUPPORTS_PARQUET)
+        if not SUPPORTS_PARQUET:
+            self.export_parquet_btn.setToolTip("ייצוא Parquet דורש את החבילה pyarrow")
+
+        self.export_jsonl_btn = QPushButton("ייצא ל-JSON Lines")
+        self.export_jsonl_btn.clicked.connect(self.export_to_jsonl)
+
+        # ייצוא מנורמל - טבלה נפרדת לבעלים, משכנתאות והערות עם מזהה המסמך
+        self.tables_export_checkbox = QCheckBox("טבלה נפרדת לכל רשימה")
+        self.tables_export_checkbox.setToolTip(
+            "ייצוא המסמכים, הבעלים, המשכנתאות וההערות כטבלאות נפרדות (גיליונות או קבצי CSV) "
+            "המקושרות במזהה המסמך, במקום ערכים מופרדים בפסיקים")
+
+        # מיזוג לקובץ אקסל/CSV קיים - החלפת שורות של אותם מסמכים והוספת מסמכים חדשים
+        self.merge_export_checkbox = QCheckBox("מיזוג לקובץ קיים")
+        self.merge_export_checkbox.setToolTip(
+            "עדכון קובץ שנוצר בייצוא קודם עם אותם שדות: שורות של אותו מספר נסח (או שם קובץ) "
+            "מוחלפות ומסמכים חדשים נוספים בסוף")
+
         self.edit_btn = QPushButton("ערוך נתונים")
         self.edit_btn.clicked.connect(self.edit_data)
 
+        # התקדמות וביטול הייצוא - מוצגים רק בזמן ייצוא
+        self.export_progress_bar = QProgressBar()
+        self.export_progress_bar.setTextVisible(True)
+        self.export_progress_bar.setVisible(False)
+
+        self.cancel_export_btn = QPushButton("בטל ייצוא")
+        self.cancel_export_btn.clicked.connect(self.cancel_exports)
+        self.cancel_export_btn.setVisible(False)
+
         self.buttons_layout.addWidget(self.export_excel_btn)
         self.buttons_layout.addWidget(self.export_csv_btn)
+        self.buttons_layout.addWidget(self.export_parquet_btn)
+        self.buttons_layout.addWidget(self.export_jsonl_btn)
+        self.buttons_layout.addWidget(self.tables_export_checkbox)
+        self.buttons_layout.addWidget(self.merge_export_checkbox)
         self.buttons_layout.addWidget(self.edit_btn)
+        self.buttons_layout.addWidget(self.export_progress_bar)
+        self.buttons_layout.addWidget(self.cancel_export_btn)
 
         self.layout.addLayout(self.buttons_layout)
 
@@ -135,82 +187,102 @@ class ResultsWidget(QWidget):
         # מעבר לטאב הטבלה
         self.tabs.setCurrentIndex(0)
 
-    def _update_results_table(self):
+    def begin_results(self, selected_field_ids):
         """
-        עדכון טבלת התוצאות הראשית.
+        התחלת הצגה הדרגתית של תוצאות (במהלך החילוץ) - ניקוי הטבלאות והגדרת העמודות.
+
+        Args:
+            selected_field_ids (list): רשימת מזהי השדות שנבחרו
         """
-        # ניקוי הטבלה
-        self.results_table.clear()
-        self.results_table.setRowCount(0)
-        self.results_table.setColumnCount(0)
+        self.extraction_results = []
+        self.selected_field_ids = selected_field_ids
 
-        if not self.extraction_results or not self.selected_field_ids:
-            return
+        # המיון מושבת עד סיום החילוץ - שורות חדשות נוספות תמיד בסוף הטבלה
+        self.results_table.setSortingEnabled(False)
 
-        # קביעת כותרות הטבלה
-        headers = ["שם קובץ"]
-        for field_id in self.selected_field_ids:
-            headers.append(FIELD_ID_TO_NAME.get(field_id, field_id))
+        self._update_results_table()
+        self._update_files_table()
+        self.details_text.clear()
 
-        self.results_table.setColumnCount(len(headers))
-        self.results_table.setHorizontalHeaderLabels(headers)
+        # מעבר לטאב הטבלה
+        self.tabs.setCurrentIndex(0)
 
-        # מילוי הטבלה בנתונים
-        for idx, result in enumerate(self.extraction_results):
-            if result.has_error():
-                continue  # דלג על תוצאות עם שגיאות
+    def append_results(self, results):
+        """
+        הוספת תוצאות חדשות לטבלאות מבלי לבנות אותן מחדש.
 
-            self.results_table.insertRow(idx)
+        Args:
+            results (list): תוצאות החילוץ החדשות
+        """
+        if not results:
+            return
 
-            # הוספת שם הקובץ
-            file_item = QTableWidgetItem(result.file_name)
-            self.results_table.setItem(idx, 0, file_item)
+        sampled_rows = self.results_model.rowCount()
 
-            # הוספת הנתונים שחולצו
-            data = result.data
+        self.extraction_results.extend(results)
+        self.results_model.append_results(results)
+        self.files_model.append_results(results)
 
-            for col_idx, field_id in enumerate(self.selected_field_ids, 1):
-                cell_value = self._get_field_display_value(data, field_id)
-                item = QTableWidgetItem(cell_value)
-                self.results_table.setItem(idx, col_idx, item)
+        # רוחב העמודות נקבע מחדש רק כל עוד השורות הראשונות (המדגם) עדיין מתמלאות
+        if sampled_rows < COLUMN_WIDTH_SAMPLE_ROWS:
+            self._resize_columns_from_sample()
 
-        # התאמת גודל הטבלה
-        self.results_table.resizeColumnsToContents()
-        self.results_table.resizeRowsToContents()
+    def finish_results(self, results=None):
+        """
+        סיום הצגה הדרגתית של תוצאות - הפעלת המיון מחדש.
 
-    def _update_files_table(self):
+        Args:
+            results (list, optional): כל התוצאות לפי סדר הקבצים. התוצאות נוספו לטבלה לפי סדר
+                הסיום (בעיבוד מקבילי הוא שונה מסדר הקבצים), ולכן הטבלאות נבנות מחדש לפיהן
         """
-        עדכון טבלת הקבצים בטאב הפרטים.
+        if results is not None:
+            self.extraction_results = list(results)
+            self._update_results_table()
+            self._update_files_table()
+
+        self.results_table.horizontalHeader().setSortIndicator(-1, Qt.AscendingOrder)
+        self.results_table.setSortingEnabled(True)
+
+    def _update_results_table(self):
+        """
+        עדכון טבלת התוצאות הראשית.
         """
-        # ניקוי הטבלה
-        self.files_table.setRowCount(0)
+        self.results_model.set_editable(False)
+        self.results_table.setEditTriggers(QTableView.NoEditTriggers)
+        self.results_model.set_results(self.extraction_results, self.selected_field_ids)
 
-        if not self.extraction_results:
-            return
+        # ביטול המיון הקודם - התוצאות מוצגות לפי סדר הקבצים עד שהמשתמש ממיין
+        self.results_table.horizontalHeader().setSortIndicator(-1, Qt.AscendingOrder)
 
-        # מילוי טבלת הקבצים
-        for idx, result in enumerate(self.extraction_results):
-            self.files_table.insertRow(idx)
+        # התאמת רוחב העמודות
+        self._resize_columns_from_sample()
+
+    def _resize_columns_from_sample(self):
+        """
+        קביעת רוחב העמודות לפי הכותרות והשורות הראשונות בלבד, במקום מדידת כל התאים.
+        """
+        header = self.results_table.horizontalHeader()
+        font_metrics = self.results_table.fontMetrics()
+        header_metrics = header.fontMetrics()
+        padding = 2 * font_metrics.averageCharWidth() + 4
 
-            # שם הקובץ
-            file_item = QTableWidgetItem(result.file_name)
-            self.files_table.setItem(idx, 0, file_item)
+        sample_rows = min(self.results_model.rowCount(), COLUMN_WIDTH_SAMPLE_ROWS)
 
-            # סטטוס
-            status = "שגיאה: " + result.error if result.has_error() else "חולץ בהצלחה"
-            status_item = QTableWidgetItem(status)
+        for column in range(self.results_model.columnCount()):
+            title = self.results_model.headerData(column, Qt.Horizontal)
+            width = header_metrics.horizontalAdvance(title)
 
-            # צביעת סטטוס לפי הצלחה/כישלון
-            if result.has_error():
-                status_item.setForeground(QColor("red"))
-            else:
-                status_item.setForeground(QColor("green"))
+            for row in range(sample_rows):
+                text = self.results_model.display_value(row, column)
+                width = max(width, font_metrics.horizontalAdvance(text))
 
-            self.files_table.setItem(idx, 1, status_item)
+            header.resizeSection(column, min(width + padding, MAX_COLUMN_WIDTH))
 
-        # התאמת גודל הטבלה
-        self.files_table.resizeColumnsToContents()
-        self.files_table.resizeRowsToContents()
+    def _update_files_table(self):
+        """
+        עדכון טבלת הקבצים בטאב הפרטים.
+        """
+        self.files_model.set_results(self.extraction_results)
 
     def file_selected(self):
         """
@@ -339,96 +411,6 @@ class ResultsWidget(QWidget):
 
         self.details_text.setHtml(details)
 
-    def _get_field_display_value(self, data, field_id):
-        """
-        חילוץ ערך להצגה עבור שדה.
-
-        Args:
-            data (dict): נתוני החילוץ
-            field_id (str): מזהה השדה
-
-        Returns:
-            str: הערך להצגה
-        """
-        # טיפול בשדות בעלים
-        if field_id.startswith("owner_"):
-            owners = data.get("owners", [])
-            if not owners:
-                return ""
-
-            field_parts = field_id.split("_", 1)
-            if len(field_parts) > 1:
-                field_type = field_parts[1]
-                owners_data = []
-
-                mapping = {
-                    "name": "name",
-                    "id": "id_number",
-                    "id_type": "id_type",
-                    "share": "share"
-                }
-
-                if field_type in mapping:
-                    for owner in owners:
-                        value = owner.get(mapping[field_type], "")
-                        if value:
-                            owners_data.append(str(value))
-
-                return ", ".join(owners_data)
-
-        # טיפול בשדות משכנתאות
-        elif field_id.startswith("mortgage_"):
-            mortgages = data.get("mortgages", [])
-            if not mortgages:
-                return ""
-
-            field_parts = field_id.split("_", 1)
-            if len(field_parts) > 1:
-                field_type = field_parts[1]
-                mortgage_data = []
-
-                mapping = {
-                    "holder": "holder",
-                    "amount": "amount",
-                    "rank": "rank"
-                }
-
-                if field_type in mapping:
-                    for mortgage in mortgages:
-                        value = mortgage.get(mapping[field_type], "")
-                        if value:
-                            mortgage_data.append(str(value))
-
-                return ", ".join(mortgage_data)
-
-        # טיפול בשדות הערות
-        elif field_id.startswith("remark_"):
-            remarks = data.get("remarks", [])
-            if not remarks:
-                return ""
-
-            field_parts = field_id.split("_", 1)
-            if len(field_parts) > 1:
-                field_type = field_parts[1]
-                remark_data = []
-
-                mapping = {
-                    "type": "type",
-                    "content": "content"
-                }
-
-                if field_type in mapping:
-                    for remark in remarks:
-                        value = remark.get(mapping[field_type], "")
-                        if value:
-                            remark_data.append(str(value))
-
-                return ", ".join(remark_data)
-
-        # שדות רגילים
-        else:
-            return str(data.get(field_id, ""))
-
     def clear_results(self):
         """
         ניקוי כל התוצאות.
@@ -437,11 +419,11 @@ class ResultsWidget(QWidget):
         self.selected_field_ids = []
 
         # ניקוי הטבלאות
-        self.results_table.clear()
-        self.results_table.setRowCount(0)
-        self.results_table.setColumnCount(0)
+        self.results_model.set_editable(False)
+        self.results_table.setEditTriggers(QTableView.NoEditTriggers)
+        self.results_model.clear()
 
-        self.files_table.setRowCount(0)
+        self.files_model.clear()
         self.details_text.clear()
 
     def export_to_excel(self):
@@ -452,8 +434,10 @@ class ResultsWidget(QWidget):
             QMessageBox.warning(self, "שגיאה", "אין נתונים לייצוא")
             return
 
-        # בחירת מיקום לשמירת הקובץ
+        # בחירת מיקום לשמירת הקובץ (במיזוג - הקובץ הקיים אינו נדרס)
         options = QFileDialog.Options()
+        if self.merge_export_checkbox.isChecked():
+            options |= QFileDialog.DontConfirmOverwrite
         file_name, _ = QFileDialog.getSaveFileName(
             self, "שמירת קובץ אקסל", "", "Excel Files (*.xlsx);;All Files (*)",
             options=options)
@@ -465,16 +449,8 @@ class ResultsWidget(QWidget):
         if not file_name.lower().endswith(".xlsx"):
             file_name += ".xlsx"
 
-        # ייצוא הנתונים
-        success = self.export_manager.export_to_excel(
-            self.extraction_results, self.selected_field_ids, file_name)
-
-        if success:
-            QMessageBox.information(self, "ייצוא לאקסל",
-                                    f"הנתונים יוצאו בהצלחה לקובץ:\n{file_name}")
-        else:
-            QMessageBox.critical(self, "שגיאה בייצוא",
-                                 "אירעה שגיאה בייצוא הנתונים לאקסל")
+        # ייצוא הנתונים ברקע
+        self._start_export(self._export_format("excel"), file_name)
 
     def export_to_csv(self):
         """
@@ -484,8 +460,10 @@ class ResultsWidget(QWidget):
             QMessageBox.warning(self, "שגיאה", "אין נתונים לייצוא")
             return
 
-        # בחירת מיקום לשמירת הקובץ
+        # בחירת מיקום לשמירת הקובץ (במיזוג - הקובץ הקיים אינו נדרס)
         options = QFileDialog.Options()
+        if self.merge_export_checkbox.isChecked():
+            options |= QFileDialog.DontConfirmOverwrite
         file_name, _ = QFileDialog.getSaveFileName(
             self, "שמירת קובץ CSV", "", "CSV Files (*.csv);;All Files (*)",
             options=options)
@@ -497,16 +475,141 @@ class ResultsWidget(QWidget):
         if not file_name.lower().endswith(".csv"):
             file_name += ".csv"
 
-        # ייצוא הנתונים
-        success = self.export_manager.export_to_csv(
-            self.extraction_results, self.selected_field_ids, file_name)
+        # ייצוא הנתונים ברקע (בייצוא מנורמל - קובץ לכל טבלה לצד הנתיב שנבחר)
+        self._start_export(self._export_format("csv"), file_name)
+
+    def export_to_parquet(self):
+        """
+        ייצוא הנתונים לקובץ Parquet (הבעלים, המשכנתאות וההערות נשמרים כעמודות רשימה).
+        """
+        if not self.extraction_results:
+            QMessageBox.warning(self, "שגיאה", "אין נתונים לייצוא")
+            return
+
+        # בחירת מיקום לשמירת הקובץ
+        options = QFileDialog.Options()
+        file_name, _ = QFileDialog.getSaveFileName(
+            self, "שמירת קובץ Parquet", "", "Parquet Files (*.parquet);;All Files (*)",
+            options=options)
+
+        if not file_name:
+            return
+
+        # הוספת סיומת אם צריך
+        if not file_name.lower().endswith(".parquet"):
+            file_name += ".parquet"
+
+        # ייצוא הנתונים ברקע
+        self._start_export("parquet", file_name)
+
+    def export_to_jsonl(self):
+        """
+        ייצוא הנתונים לקובץ JSON Lines (שורה לכל מסמך).
+        """
+        if not self.extraction_results:
+            QMessageBox.warning(self, "שגיאה", "אין נתונים לייצוא")
+            return
+
+        # בחירת מיקום לשמירת הקובץ
+        options = QFileDialog.Options()
+        file_name, _ = QFileDialog.getSaveFileName(
+            self, "שמירת קובץ JSON Lines", "", "JSON Lines Files (*.jsonl);;All Files (*)",
+            options=options)
+
+        if not file_name:
+            return
+
+        # הוספת סיומת אם צריך
+        if not file_name.lower().endswith(".jsonl"):
+            file_name += ".jsonl"
+
+        # ייצוא הנתונים ברקע
+        self._start_export("jsonl", file_name)
+
+    def _export_format(self, base_format):
+        """
+        Args:
+            base_format (str): פורמט הקובץ (excel או csv)
+
+        Returns:
+            str: פורמט הייצוא לפי האפשרויות שנבחרו (מיזוג קודם לייצוא מנורמל)
+        """
+        if self.merge_export_checkbox.isChecked():
+            return f"{base_format}_merge"
+        if self.tables_export_checkbox.isChecked():
+            return f"{base_format}_tables"
+        return base_format
+
+    def _start_export(self, export_format, file_name):
+        """
+        הפעלת תהליכון ייצוא. ניתן להפעיל ייצוא נוסף (או חילוץ חדש) לפני שהייצוא הסתיים.
+
+        Args:
+            export_format (str): פורמט הייצוא (מפתח ב-EXPORT_METHODS)
+            file_name (str): נתיב הקובץ שייווצר
+        """
+        export_thread = ExportThread(export_format, self.extraction_results, self.selected_field_ids, file_name)
+
+        export_thread.progress.connect(
+            lambda value, thread=export_thread: self._update_export_progress(thread, value))
+        export_thread.export_complete.connect(
+            lambda success, path, thread=export_thread: self._handle_export_complete(thread, success, path))
+
+        self.export_threads[export_thread] = 0
+        self._update_export_progress(export_thread, 0)
+
+        export_thread.start()
+
+    def _update_export_progress(self, export_thread, value):
+        """
+        עדכון פס ההתקדמות - ממוצע ההתקדמות של כל הייצואים הפעילים.
+
+        Args:
+            export_thread (ExportThread): תהליכון הייצוא שדיווח
+            value (int): ההתקדמות שלו באחוזים
+        """
+        if export_thread not in self.export_threads:
+            return
+
+        self.export_threads[export_thread] = value
+        self.export_progress_bar.setValue(sum(self.export_threads.values()) // len(self.export_threads))
+
+        self.export_progress_bar.setVisible(True)
+        self.cancel_export_btn.setVisible(True)
+
+    def _handle_export_complete(self, export_thread, success, file_name):
+        """
+        טיפול בסיום ייצוא.
+
+        Args:
+            export_thread (ExportThread): תהליכון הייצוא שהסתיים
+            success (bool): האם הייצוא הצליח
+            file_name (str): נתיב הקובץ
+        """
+        self.export_threads.pop(export_thread, None)
+        export_thread.wait()
+        export_thread.deleteLater()
+
+        if not self.export_threads:
+            self.export_progress_bar.setVisible(False)
+            self.cancel_export_btn.setVisible(False)
+
+        if export_thread.is_cancelled():
+            return
 
         if success:
-            QMessageBox.information(self, "ייצוא ל-CSV",
+            QMessageBox.information(self, "ייצוא נתונים",
                                     f"הנתונים יוצאו בהצלחה לקובץ:\n{file_name}")
         else:
             QMessageBox.critical(self, "שגיאה בייצוא",
-                                 "אירעה שגיאה בייצוא הנתונים ל-CSV")
+                                 f"אירעה שגיאה בייצוא הנתונים לקובץ:\n{file_name}")
+
+    def cancel_exports(self):
+        """
+        ביטול כל הייצואים הפעילים. קבצים חלקיים נמחקים.
+        """
+        for export_thread in self.export_threads:
+            export_thread.cancel()
 
     def edit_data(self):
         """
@@ -517,8 +620,9 @@ class ResultsWidget(QWidget):
             return
 
         # הפיכת הטבלה לניתנת לעריכה
+        self.results_model.set_editable(True)
         self.results_table.setEditTriggers(
-            QTableWidget.DoubleClicked | QTableWidget.EditKeyPressed)
+            QTableView.DoubleClicked | QTableView.EditKeyPressed)
 
         QMessageBox.information(self, "עריכת נתונים",
                                 "ניתן לערוך את הנתונים ישירות בטבלה על ידי לחיצה כפולה על התא המבוקש")
@@ -0,0 +1,284 @@
+# -*- coding: utf-8 -*-
+
+"""
+מודלים (Qt model/view) להצגת תוצאות החילוץ בטבלאות.
+"""
+
+from PyQt5.QtCore import Qt, QAbstractTableModel, QModelIndex, QVariant
+from PyQt5.QtGui import QColor
+
+from app.core.column_plan import ColumnPlan, FILE_NAME_HEADER
+
+
+class ResultsTableModel(QAbstractTableModel):
+    """
+    מודל טבלת התוצאות - שורה לכל תוצאה שחולצה בהצלחה ועמודה לכל שדה שנבחר.
+
+    המודל מחזיק הפניה לרשימת התוצאות עצמה ואינו יוצר פריט לכל תא: ערכי התצוגה
+    מחושבים רק כשהתצוגה מבקשת אותם, כלומר רק עבור השורות שנראות על המסך.
+    """
+
+    def __init__(self, parent=None):
+        """
+        אתחול המודל.
+
+        Args:
+            parent (QObject, optional): אובייקט האב
+        """
+        super().__init__(parent)
+
+        self.extraction_results = []
+        self.selected_field_ids = []
+        self.column_plan = ColumnPlan([])
+
+        # אינדקסים (ברשימת התוצאות) של התוצאות המוצגות - תוצאות עם שגיאות אינן מוצגות
+        self._rows = []
+
+        self.editable = False
+
+    def set_results(self, results, selected_field_ids):
+        """
+        החלפת התוצאות המוצגות.
+
+        Args:
+            results (list): רשימת תוצאות החילוץ
+            selected_field_ids (list): רשימת מזהי השדות שנבחרו
+        """
+        self.beginResetModel()
+
+        self.extraction_results = list(results)
+        self.selected_field_ids = list(selected_field_ids)
+        self.column_plan = ColumnPlan(self.selected_field_ids)
+        self._rows = [idx for idx, result in enumerate(results) if not result.has_error()]
+
+        self.endResetModel()
+
+    def append_results(self, results):
+        """
+        הוספת תוצאות בסוף הטבלה. העלות תלויה במספר התוצאות החדשות בלבד.
+
+        Args:
+            results (list): תוצאות החילוץ החדשות
+        """
+        first_idx = len(self.extraction_results)
+        new_rows = [first_idx + offset for offset, result in enumerate(results) if not result.has_error()]
+
+        if not new_rows:
+            self.extraction_results.extend(results)
+            return
+
+        first_row = len(self._rows)
+        self.beginInsertRows(QModelIndex(), first_row, first_row + len(new_rows) - 1)
+
+        self.extraction_results.extend(results)
+        self._rows.extend(new_rows)
+
+        self.endInsertRows()
+
+    def clear(self):
+        """
+        ניקוי כל התוצאות.
+        """
+        self.set_results([], [])
+
+    def set_editable(self, editable):
+        """
+        Args:
+            editable (bool): האם ניתן לערוך את תאי הנתונים
+        """
+        self.editable = editable
+
+    def result_at(self, row):
+        """
+        Args:
+            row (int): מספר השורה במודל
+
+        Returns:
+            ExtractionResult: התוצאה שמוצגת בשורה
+        """
+        return self.extraction_results[self._rows[row]]
+
+    def display_value(self, row, column):
+        """
+        Args:
+            row (int): מספר השורה במודל
+            column (int): מספר העמודה (0 - שם הקובץ)
+
+        Returns:
+            str: הטקסט המוצג בתא
+        """
+        return self.column_plan.display_value(self.extraction_results[self._rows[row]], column)
+
+    def rowCount(self, parent=QModelIndex()):
+        if parent.isValid() or not self.selected_field_ids:
+            return 0
+        return len(self._rows)
+
+    def columnCount(self, parent=QModelIndex()):
+        if parent.isValid() or not self.selected_field_ids:
+            return 0
+        return len(self.selected_field_ids) + 1
+
+    def data(self, index, role=Qt.DisplayRole):
+        if not index.isValid():
+            return QVariant()
+
+        if role in (Qt.DisplayRole, Qt.EditRole):
+            return self.display_value(index.row(), index.column())
+
+        return QVariant()
+
+    def headerData(self, section, orientation, role=Qt.DisplayRole):
+        if role != Qt.DisplayRole:
+            return QVariant()
+
+        if orientation == Qt.Vertical:
+            return section + 1
+
+        return self.column_plan.headers[section]
+
+    def flags(self, index):
+        if not index.isValid():
+            return Qt.NoItemFlags
+
+        flags = Qt.ItemIsEnabled | Qt.ItemIsSelectable
+
+        # שם הקובץ ושדות רשימה (מוצגים כערכים מופרדים בפסיקים) אינם ניתנים לעריכה
+        if self.editable and index.column() > 0 and not self._is_list_column(index.column()):
+            flags |= Qt.ItemIsEditable
+
+        return flags
+
+    def sort(self, column, order=Qt.AscendingOrder):
+        """
+        מיון השורות לפי עמודה. ערך התצוגה של כל שורה מחושב פעם אחת בלבד (ולא בכל
+        השוואה), ועמודה -1 מחזירה את השורות לסדר הקבצים המקורי.
+        """
+        self.layoutAboutToBeChanged.emit()
+
+        # שמירת המיקום של אינדקסים קבועים (למשל הבחירה) לפי התוצאה שהם מצביעים עליה
+        persistent = [(index, self._rows[index.row()]) for index in self.persistentIndexList()]
+
+        if column < 0 or column >= self.columnCount():
+            self._rows.sort()
+        else:
+            keys = {result_idx: self.display_value(row, column) for row, result_idx in enumerate(self._rows)}
+            self._rows.sort(key=keys.__getitem__, reverse=order == Qt.DescendingOrder)
+
+        positions = {result_idx: row for row, result_idx in enumerate(self._rows)}
+        self.changePersistentIndexList(
+            [index for index, _ in persistent],
+            [self.index(positions[result_idx], index.column()) for index, result_idx in persistent])
+
+        self.layoutChanged.emit()
+
+    def _is_list_column(self, column):
+        """
+        Args:
+            column (int): מספר העמודה (0 - שם הקובץ)
+
+        Returns:
+            bool: האם העמודה מציגה שדה מתוך רשימה (בעלים, משכנתאות, הערות)
+        """
+        return ColumnPlan.is_list_field(self.selected_field_ids[column - 1])
+
+    def setData(self, index, value, role=Qt.EditRole):
+        """
+        שמירת ערך שנערך בטבלה בנתוני התוצאה, כך שהעריכה מגיעה גם לייצוא. שדות רשימה
+        אינם ניתנים לעריכה - הטקסט המופרד בפסיקים אינו ניתן לפירוק חד-משמעי לרשומות.
+        """
+        if role != Qt.EditRole or not index.isValid() or index.column() == 0:
+            return False
+        if self._is_list_column(index.column()):
+            return False
+
+        field_id = self.selected_field_ids[index.column() - 1]
+        self.extraction_results[self._rows[index.row()]].data[field_id] = str(value)
+
+        self.dataChanged.emit(index, index, [Qt.DisplayRole, Qt.EditRole])
+        return True
+
+
+class FilesTableModel(QAbstractTableModel):
+    """
+    מודל טבלת הקבצים - שורה לכל קובץ שעובד (כולל קבצים עם שגיאות) עם סטטוס החילוץ.
+    """
+
+    HEADERS = [FILE_NAME_HEADER, "סטטוס"]
+
+    def __init__(self, parent=None):
+        """
+        אתחול המודל.
+
+        Args:
+            parent (QObject, optional): אובייקט האב
+        """
+        super().__init__(parent)
+
+        self.extraction_results = []
+
+    def set_results(self, results):
+        """
+        Args:
+            results (list): רשימת תוצאות החילוץ
+        """
+        self.beginResetModel()
+        self.extraction_results = list(results)
+        self.endResetModel()
+
+    def append_results(self, results):
+        """
+        הוספת קבצים בסוף הטבלה. העלות תלויה במספר הקבצים החדשים בלבד.
+
+        Args:
+            results (list): תוצאות החילוץ החדשות
+        """
+        if not results:
+            return
+
+        first_row = len(self.extraction_results)
+        self.beginInsertRows(QModelIndex(), first_row, first_row + len(results) - 1)
+        self.extraction_results.extend(results)
+        self.endInsertRows()
+
+    def clear(self):
+        """
+        ניקוי כל התוצאות.
+        """
+        self.set_results([])
+
+    def rowCount(self, parent=QModelIndex()):
+        if parent.isValid():
+            return 0
+        return len(self.extraction_results)
+
+    def columnCount(self, parent=QModelIndex()):
+        if parent.isValid():
+            return 0
+        return len(self.HEADERS)
+
+    def data(self, index, role=Qt.DisplayRole):
+        if not index.isValid():
+            return QVariant()
+
+        result = self.extraction_results[index.row()]
+
+        if role == Qt.DisplayRole:
+            if index.column() == 0:
+                return result.file_name
+            return "שגיאה: " + result.error if result.has_error() else "חולץ בהצלחה"
+
+        # צביעת סטטוס לפי הצלחה/כישלון
+        if role == Qt.ForegroundRole and index.column() == 1:
+            return QColor("red") if result.has_error() else QColor("green")
+
+        return QVariant()
+
+    def headerData(self, section, orientation, role=Qt.DisplayRole):
+        if role != Qt.DisplayRole:
+            return QVariant()
+
+        if orientation == Qt.Vertical:
+            return section + 1
+
+        return self.HEADERS[section]
@@ -23,6 +23,9 @@ class ExtractionResult:
         self.file_name = os.path.basename(file_path)
         self.data = {}  # נתונים שחולצו
         self.error = None  # שגיאה (אם היתה)
+        self.file_hash = None  # גיבוב תוכן הקובץ (None אם הקובץ לא נקרא)
+        self.field_errors = {}  # שגיאות בחילוץ שדות בודדים {מזהה שדה: הודעה} - ממולא על ידי DataExtractor
+        self.cache_lookups = {}  # חיפושים במטמונים {שם המטמון: האם נמצא} - לא נשמר ב-to_dict
 
     def set_data(self, data):
         """
@@ -42,6 +45,15 @@ class ExtractionResult:
         """
         self.error = error_message
 
+    def has_field_errors(self):
+        """
+        בדיקה אם היו שגיאות בחילוץ שדות בודדים.
+
+        Returns:
+            bool: האם יש שגיאות בשדות
+        """
+        return bool(self.field_errors)
+
     def has_error(self):
         """
         בדיקה אם יש שגיאה בתוצאת החילוץ.
@@ -62,7 +74,9 @@ class ExtractionResult:
             "file_path": self.file_path,
             "file_name": self.file_name,
             "data": self.data,
-            "error": self.error
+            "error": self.error,
+            "field_errors": self.field_errors,
+            "file_hash": self.file_hash
         }
 
     @classmethod
@@ -80,5 +94,7 @@ class ExtractionResult:
         result.file_name = result_dict.get("file_name", "")
         result.data = result_dict.get("data", {})
         result.error = result_dict.get("error", None)
+        result.field_errors = result_dict.get("field_errors", {})
+        result.file_hash = result_dict.get("file_hash", None)
 
         return result
\ No newline at end of file
@@ -0,0 +1,495 @@
+# -*- coding: utf-8 -*-
+
+"""
+שירות חילוץ מקומי - שרת HTTP על localhost שמקבל קבצי PDF (או נתיבים) ומחזיר את
+תוצאת החילוץ כ-JSON, באמצעות מאגר קבוע של תהליכי עבודה שמאותחלים מראש.
+
+נקודות קצה:
+    POST /extract   גוף הבקשה הוא קובץ ה-PDF עצמו (application/pdf), או JSON עם
+                    {"path": "..."} לקובץ מקומי. שדות: ?fields=a,b או ?template=NAME
+                    (או המפתחות fields/template ב-JSON). שם הקובץ להעלאה: ?name=...
+    GET  /stats     עומק התור, בקשות בעיבוד, מונים ואחוזוני זמן התגובה
+    GET  /health    בדיקת חיות
+
+מספר הבקשות המתקבלות מוגבל למספר תהליכי העבודה ועוד גודל התור; בקשה מעבר לכך
+נדחית מיד עם 429 (ו-Retry-After), במקום להצטבר בזיכרון.
+
+הרצה:
+    python -m app.cli serve [--port 8765] [--workers 4] [--queue-size 32]
+"""
+
+import os
+import json
+import time
+import tempfile
+import threading
+import multiprocessing
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor, wait
+from concurrent.futures.process import BrokenProcessPool
+from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
+from urllib.parse import urlparse, parse_qs
+
+from app.config.application_config import ApplicationConfig
+from app.config.constants import (DEFAULT_MAX_WORKERS, SERVICE_DEFAULT_HOST, SERVICE_DEFAULT_PORT,
+                                  SERVICE_QUEUE_SIZE, SERVICE_MAX_UPLOAD_MB, SERVICE_LATENCY_WINDOW)
+from app.core.data_processor import DataProcessor, _init_worker, _process_in_worker
+from app.core.extraction_plan import ExtractionPlan
+from app.models.extraction_config import ExtractionConfig
+from app.utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+# גודל הבלוק בקריאת גוף הבקשה
+READ_CHUNK_SIZE = 1024 * 1024
+
+
+def _warm_up_worker():
+    """
+    טעינת מנוע החילוץ בתהליך עבודה, כדי שהבקשה הראשונה לא תשלם על הטעינה.
+
+    Returns:
+        int: מזהה התהליך
+    """
+    from app.core.pdf_parser import PDFParser
+
+    PDFParser.get_backend_id()
+    return os.getpid()
+
+
+def percentile(sorted_values, fraction):
+    """
+    Args:
+        sorted_values (list): ערכים ממוינים
+        fraction (float): האחוזון כשבר (למשל 0.99)
+
+    Returns:
+        float: הערך באחוזון (nearest-rank), או None אם אין ערכים
+    """
+    if not sorted_values:
+        return None
+    rank = max(int(round(fraction * len(sorted_values) + 0.5)) - 1, 0)
+    return sorted_values[min(rank, len(sorted_values) - 1)]
+
+
+class ServiceError(Exception):
+    """
+    שגיאה בבקשה לשירות, עם קוד מצב HTTP.
+    """
+
+    def __init__(self, status, message):
+        super().__init__(message)
+        self.status = status
+
+
+def parse_field_ids(fields):
+    """
+    Args:
+        fields: מזהי שדות - רשימה, מחרוזת מופרדת בפסיקים, או None
+
+    Returns:
+        list: מזהי השדות, או None אם לא צוינו
+
+    Raises:
+        ServiceError: אם הערך אינו רשימה של מחרוזות או מחרוזת
+    """
+    if fields is None:
+        return None
+    if isinstance(fields, str):
+        return [field_id.strip() for field_id in fields.split(",") if field_id.strip()]
+    if isinstance(fields, list) and all(isinstance(field_id, str) for field_id in fields):
+        return fields
+
+    raise ServiceError(400, "'fields' must be a list of field ids or a comma-separated string")
+
+
+class ExtractionService:
+    """
+    מאגר תהליכי העבודה של השירות, הגבלת הבקשות המתקבלות ומדדי הביצועים.
+    """
+
+    def __init__(self, processor=None, workers=None, queue_size=SERVICE_QUEUE_SIZE, config=None):
+        """
+        אתחול השירות והפעלת תהליכי העבודה.
+
+        Args:
+            processor (DataProcessor, optional): מעבד הנתונים שמועתק לכל תהליך עבודה
+            workers (int, optional): מספר תהליכי העבודה (ברירת מחדל - מספר המעבדים)
+            queue_size (int, optional): מספר הבקשות שממתינות לתהליך פנוי
+            config (ApplicationConfig, optional): הגדרות האפליקציה (לטעינת תבניות)
+        """
+        self.processor = processor or DataProcessor()
+        self.workers = workers or DEFAULT_MAX_WORKERS
+        self.queue_size = queue_size
+        self.capacity = self.workers + queue_size
+        self.config = config or ApplicationConfig()
+
+        # בקשות שהתקבלו (בעיבוד או בהמתנה) - מוגבל ל-capacity
+        self._slots = threading.BoundedSemaphore(self.capacity)
+        self._lock = threading.Lock()
+        self.in_flight = 0
+
+        # מונים וזמני תגובה (שניות) של הבקשות האחרונות
+        self.processed = 0
+        self.failed = 0
+        self.rejected = 0
+        self._latencies = deque(maxlen=SERVICE_LATENCY_WINDOW)
+        self.started_at = time.monotonic()
+
+        # הפעלה מחדש של מאגר שקרס - נעילה נפרדת, כדי שהמונים ו-/stats לא ייחסמו בזמן ההפעלה
+        self._restart_lock = threading.Lock()
+        self._executor = None
+        self._start_pool()
+
+    def _start_pool(self):
+        """
+        הפעלת מאגר תהליכי העבודה וטעינת מנוע החילוץ בכל אחד מהם.
+        """
+        # spawn כמו בעיבוד המקבילי באפליקציה - תהליכים נקיים ללא מצב של התהליך הראשי
+        context = multiprocessing.get_context("spawn")
+        executor = ProcessPoolExecutor(max_workers=self.workers, mp_context=context,
+                                       initializer=_init_worker, initargs=(self.processor,))
+
+        wait([executor.submit(_warm_up_worker) for _ in range(self.workers)])
+        self._executor = executor
+
+    def close(self):
+        """
+        עצירת תהליכי העבודה.
+        """
+        if self._executor is not None:
+            self._executor.shutdown(wait=True, cancel_futures=True)
+            self._executor = None
+
+    def try_acquire(self):
+        """
+        קבלת בקשה חדשה אם יש מקום בתור.
+
+        Returns:
+            bool: האם הבקשה התקבלה (False - יש להחזיר 429)
+        """
+        if not self._slots.acquire(blocking=False):
+            with self._lock:
+                self.rejected += 1
+            return False
+
+        with self._lock:
+            self.in_flight += 1
+        return True
+
+    def release(self, elapsed, failed):
+        """
+        שחרור מקום של בקשה שהסתיימה ורישום זמן התגובה שלה.
+
+        Args:
+            elapsed (float): זמן התגובה בשניות
+            failed (bool): האם החילוץ נכשל
+        """
+        with self._lock:
+            self.in_flight -= 1
+            self.processed += 1
+            if failed:
+                self.failed += 1
+            self._latencies.append(elapsed)
+
+        self._slots.release()
+
+    def build_plan(self, template_name=None, field_ids=None):
+        """
+        Args:
+            template_name (str, optional): שם תבנית שמורה
+            field_ids (list, optional): מזהי שדות מפורשים
+
+        Returns:
+            ExtractionPlan: תוכנית החילוץ (תוכניות זהות משותפות, ראו ExtractionPlan.from_config)
+
+        Raises:
+            ServiceError: אם השדות או התבנית אינם תקינים
+        """
+        try:
+            selected_field_ids = self.config.resolve_field_ids(template_name, field_ids)
+        except ValueError as e:
+            raise ServiceError(400, str(e))
+
+        extraction_config = ExtractionConfig()
+        extraction_config.update_from_field_ids(selected_field_ids)
+        return ExtractionPlan.from_config(extraction_config)
+
+    def extract(self, pdf_path, plan):
+        """
+        חילוץ קובץ בתהליך עבודה.
+
+        Args:
+            pdf_path (str): נתיב קובץ ה-PDF
+            plan (ExtractionPlan): תוכנית החילוץ
+
+        Returns:
+            ExtractionResult: תוצאת החילוץ
+
+        Raises:
+            ServiceError: אם מאגר התהליכים קרס (המאגר מופעל מחדש)
+        """
+        executor = self._executor
+
+        try:
+            return executor.submit(_process_in_worker, pdf_path, plan).result()
+
+        except BrokenProcessPool:
+            logger.error(f"Worker pool crashed while processing {pdf_path}, restarting it")
+            with self._restart_lock:
+                if self._executor is executor:
+                    executor.shutdown(wait=False, cancel_futures=True)
+                    self._start_pool()
+            raise ServiceError(503, "Worker pool crashed, please retry")
+
+    def stats(self):
+        """
+        Returns:
+            dict: מצב השירות - תור, מונים ואחוזוני זמן התגובה במילישניות
+        """
+        with self._lock:
+            latencies = sorted(self._latencies)
+            in_flight = self.in_flight
+            counters = {"processed": self.processed, "failed": self.failed, "rejected": self.rejected}
+
+        def in_ms(value):
+            return None if value is None else round(value * 1000, 1)
+
+        return {
+            "workers": self.workers,
+            "capacity": self.capacity,
+            "in_flight": in_flight,
+            "queue_depth": max(in_flight - self.workers, 0),
+            **counters,
+            "latency_ms": {
+                "p50": in_ms(percentile(latencies, 0.50)),
+                "p90": in_ms(percentile(latencies, 0.90)),
+                "p99": in_ms(percentile(latencies, 0.99)),
+                "max": in_ms(latencies[-1] if latencies else None),
+                "window": len(latencies)
+            },
+            "uptime_seconds": round(time.monotonic() - self.started_at, 1)
+        }
+
+
+class ExtractionRequestHandler(BaseHTTPRequestHandler):
+    """
+    טיפול בבקשות HTTP לשירות החילוץ. כל בקשה רצה בתהליכון משלה וממתינה לתהליך עבודה.
+    """
+
+    protocol_version = "HTTP/1.1"
+
+    @property
+    def service(self):
+        return self.server.service
+
+    def log_message(self, format, *args):
+        # בקשות תקינות אינן נרשמות (יומן לכל בקשה מאט את השירות תחת עומס)
+        pass
+
+    def _send_json(self, status, body, headers=None):
+        """
+        Args:
+            status (int): קוד המצב
+            body (dict): גוף התשובה
+            headers (dict, optional): כותרות נוספות
+        """
+        payload = json.dumps(body, ensure_ascii=False).encode("utf-8")
+
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json; charset=utf-8")
+        self.send_header("Content-Length", str(len(payload)))
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        self.end_headers()
+        self.wfile.write(payload)
+
+    def _read_body(self, target_file=None):
+        """
+        קריאת גוף הבקשה לזיכרון, או לקובץ בבלוקים.
+
+        Args:
+            target_file (file, optional): קובץ בינארי לכתיבת הגוף (None - החזרת הגוף)
+
+        Returns:
+            bytes: גוף הבקשה (ריק אם נכתב לקובץ)
+
+        Raises:
+            ServiceError: אם הגוף חסר או גדול מהמותר
+        """
+        length = int(self.headers.get("Content-Length") or 0)
+        if length <= 0:
+            raise ServiceError(400, "Request body is empty")
+        if length > SERVICE_MAX_UPLOAD_MB * 1024 * 1024:
+            self.close_connection = True
+            raise ServiceError(413, f"Request body is larger than {SERVICE_MAX_UPLOAD_MB}MB")
+
+        chunks = []
+        remaining = length
+        while remaining > 0:
+            chunk = self.rfile.read(min(READ_CHUNK_SIZE, remaining))
+            if not chunk:
+                raise ServiceError(400, "Request body is truncated")
+            remaining -= len(chunk)
+            if target_file is not None:
+                target_file.write(chunk)
+            else:
+                chunks.append(chunk)
+
+        return b"".join(chunks)
+
+    def _discard_body(self):
+        """
+        קריאת גוף בקשה שנדחתה, כדי שהחיבור יישאר תקין.
+        """
+        remaining = int(self.headers.get("Content-Length") or 0)
+        if remaining > SERVICE_MAX_UPLOAD_MB * 1024 * 1024:
+            self.close_connection = True
+            return
+
+        while remaining > 0:
+            chunk = self.rfile.read(min(READ_CHUNK_SIZE, remaining))
+            if not chunk:
+                break
+            remaining -= len(chunk)
+
+    def do_GET(self):
+        path = urlparse(self.path).path
+
+        if path == "/health":
+            self._send_json(200, {"status": "ok"})
+        elif path == "/stats":
+            self._send_json(200, self.service.stats())
+        else:
+            self._send_json(404, {"error": f"Unknown path: {path}"})
+
+    def do_POST(self):
+        url = urlparse(self.path)
+        if url.path != "/extract":
+            self._discard_body()
+            self._send_json(404, {"error": f"Unknown path: {url.path}"})
+            return
+
+        if not self.service.try_acquire():
+            self._discard_body()
+            self._send_json(429, {"error": "Extraction queue is full"}, {"Retry-After": "1"})
+            return
+
+        started_at = time.perf_counter()
+        failed = True
+        try:
+            result = self._handle_extract(url)
+            failed = result.has_error()
+            self._send_json(200, result.to_dict())
+
+        except ServiceError as e:
+            self._send_json(e.status, {"error": str(e)})
+
+        except Exception as e:
+            logger.error(f"Error handling extraction request: {str(e)}")
+            self._send_json(500, {"error": str(e)})
+
+        finally:
+            self.service.release(time.perf_counter() - started_at, failed)
+
+    def _handle_extract(self, url):
+        """
+        חילוץ הקובץ שבבקשה.
+
+        Args:
+            url (ParseResult): כתובת הבקשה
+
+        Returns:
+            ExtractionResult: תוצאת החילוץ
+        """
+        query = parse_qs(url.query)
+        template_name = query.get("template", [None])[0]
+        field_ids = parse_field_ids(query.get("fields", [None])[0])
+
+        # נתיב לקובץ מקומי
+        if self.headers.get("Content-Type", "").startswith("application/json"):
+            try:
+                request = json.loads(self._read_body())
+            except ValueError:
+                raise ServiceError(400, "Invalid JSON body")
+
+            if not isinstance(request, dict):
+                raise ServiceError(400, "JSON body must be an object")
+
+            pdf_path = request.get("path")
+            if not isinstance(pdf_path, str) or not os.path.isfile(pdf_path):
+                raise ServiceError(400, f"File not found: {pdf_path}")
+
+            template_name = request.get("template", template_name)
+            if template_name is not None and not isinstance(template_name, str):
+                raise ServiceError(400, "'template' must be a string")
+
+            if "fields" in request:
+                field_ids = parse_field_ids(request["fields"])
+
+            plan = self.service.build_plan(template_name, field_ids)
+            return self.service.extract(pdf_path, plan)
+
+        # העלאת הקובץ עצמו - נשמר לקובץ זמני שנמחק בסיום
+        plan = self.service.build_plan(template_name, field_ids)
+        file_name = query.get("name", ["upload.pdf"])[0]
+
+        fd, temp_path = tempfile.mkstemp(prefix="pdf-extractor-", suffix=".pdf")
+        try:
+            with os.fdopen(fd, "wb") as temp_file:
+                self._read_body(temp_file)
+
+            result = self.service.extract(temp_path, plan)
+            result.file_path = result.file_name = file_name
+            return result
+
+        finally:
+            os.remove(temp_path)
+
+
+class ExtractionServer(ThreadingHTTPServer):
+    """
+    שרת HTTP של שירות החילוץ.
+    """
+
+    daemon_threads = True
+
+    # תור החיבורים של מערכת ההפעלה - גדול מספיק כדי שחיבורים עודפים יקבלו 429 ולא ינותקו
+    request_queue_size = 128
+
+    def __init__(self, address, service):
+        """
+        Args:
+            address (tuple): (כתובת, פורט)
+            service (ExtractionService): השירות
+        """
+        super().__init__(address, ExtractionRequestHandler)
+        self.service = service
+
+
+def serve(host=SERVICE_DEFAULT_HOST, port=SERVICE_DEFAULT_PORT, workers=None, queue_size=SERVICE_QUEUE_SIZE,
+          processor=None, ready_callback=None):
+    """
+    הפעלת שירות החילוץ עד לעצירה (Ctrl+C).
+
+    Args:
+        host (str, optional): הכתובת להאזנה (ברירת מחדל - localhost בלבד)
+        port (int, optional): הפורט
+        workers (int, optional): מספר תהליכי העבודה
+        queue_size (int, optional): מספר הבקשות שממתינות לתהליך פנוי
+        processor (DataProcessor, optional): מעבד הנתונים לתהליכי העבודה
+        ready_callback (callable, optional): נקרא עם השרת לאחר שתהליכי העבודה מוכנים
+    """
+    service = ExtractionService(processor, workers, queue_size)
+    server = ExtractionServer((host, port), service)
+
+    if ready_callback:
+        ready_callback(server)
+
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+        service.close()
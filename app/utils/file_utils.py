@@ -6,6 +6,7 @@
 
 import os
 import shutil
+import hashlib
 from pathlib import Path
 from app.utils.logger import get_logger
 
@@ -65,6 +66,26 @@ def get_pdf_files_in_directory(directory_path, recursive=True):
         return []
 
 
+def compute_file_hash(file_path, chunk_size=1024 * 1024):
+    """
+    חישוב גיבוב SHA-256 של תוכן קובץ.
+
+    Args:
+        file_path (str): נתיב הקובץ
+        chunk_size (int, optional): גודל כל קטע קריאה בבתים
+
+    Returns:
+        str: הגיבוב בייצוג הקסדצימלי
+    """
+    digest = hashlib.sha256()
+
+    with open(file_path, 'rb') as f:
+        for chunk in iter(lambda: f.read(chunk_size), b''):
+            digest.update(chunk)
+
+    return digest.hexdigest()
+
+
 def get_file_name(file_path):
     """
     חילוץ שם הקובץ מנתיב מלא.
@@ -16,14 +16,26 @@ LOG_LEVEL = logging.INFO
 # ספריית התיעודים
 LOG_DIR = Path.home() / "PDFExtractor" / "logs"
 
-# יצירת ספריית התיעודים אם לא קיימת
-LOG_DIR.mkdir(parents=True, exist_ok=True)
-
 # שם קובץ התיעוד הנוכחי
 LOG_FILE = LOG_DIR / f"pdf_extractor_{datetime.now().strftime('%Y%m%d')}.log"
 
+
+class LazyFileHandler(logging.FileHandler):
+    """
+    handler לקובץ שיוצר את ספריית התיעודים ופותח את הקובץ רק ברשומה הראשונה,
+    ולא בזמן ייבוא המודול.
+    """
+
+    def __init__(self, file_path):
+        super().__init__(file_path, encoding='utf-8', delay=True)
+
+    def _open(self):
+        Path(self.baseFilename).parent.mkdir(parents=True, exist_ok=True)
+        return super()._open()
+
+
 # הגדרת handler לקובץ
-file_handler = logging.FileHandler(LOG_FILE, encoding='utf-8')
+file_handler = LazyFileHandler(LOG_FILE)
 file_handler.setFormatter(logging.Formatter(LOG_FORMAT))
 
 # הגדרת handler לקונסול
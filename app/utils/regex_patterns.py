@@ -4,6 +4,8 @@
 ביטויים רגולריים לחילוץ מידע מנסחי טאבו.
 """
 
+import hashlib
+
 # ביטויים רגולריים לחילוץ מידע מנסחי טאבו
 PATTERNS = {
     # נתונים כלליים
@@ -15,11 +17,6 @@ PATTERNS = {
     "authority": r'(?:עיריית|מועצה מקומית|מועצה אזורית)\s+([^\n\r]+)',
     "land_type": r'סוג(?:\s+ה)*מקרקעין\s*:*\s*([\w\s]+)',
 
-    # חלקים של המסמך
-    "owners_section": r'בעלויות(?:.*?)(?=משכנתאות|הערות|$)',
-    "mortgages_section": r'משכנתאות(?:.*?)(?=הערות|$)',
-    "remarks_section": r'הערות(?:.*?)(?=$)',
-
     # תבניות לחילוץ נתוני בעלים
     "owner_entry": r'(?:מהות פעולה.*?)(.*?)\s+(?:סוג זיהוי)\s+(?:מס\' זיהוי).*?(?:ת\.ז|חברה|דרכון)\s+([\d\/\w]+).*?(?:החלק בנכס)[\s:]*(\d+\s*\/\s*\d+)',
 
@@ -28,4 +25,30 @@ PATTERNS = {
 
     # תבניות לחילוץ נתוני הערות
     "remark_entry": r'(?:מהות פעולה)\s*:(.*?)(?:שם המוטב)\s*:(.*?)(?:על הבעלות של|$)'
-}
\ No newline at end of file
+}
+
+# כותרות חלקי המסמך
+SECTION_HEADERS = {
+    "owners": "בעלויות",
+    "mortgages": "משכנתאות",
+    "remarks": "הערות"
+}
+
+# כותרות שמסיימות כל חלק - חלק נמשך עד הכותרת המסיימת הקרובה או עד סוף הטקסט
+SECTION_TERMINATORS = {
+    "owners": ("mortgages", "remarks"),
+    "mortgages": ("remarks",),
+    "remarks": ()
+}
+
+# מילות עוגן לשדות כלליים שהביטוי שלהם מתחיל בחלופות (ולכן ללא תחילית קבועה).
+# כל התאמה של השדה מתחילה באחת ממילות העוגן, כך שניתן לאתר מועמדים בחיפוש מחרוזת מהיר
+GENERAL_FIELD_ANCHORS = {
+    "authority": ("עיריית", "מועצה מקומית", "מועצה אזורית")
+}
+
+# גרסת הביטויים - גיבוב הביטויים עצמם (ולא קובץ המקור, שאינו קיים בדיסק בהרצה מ-zip או מחבילה
+# קפואה). משתנה רק בשינוי ביטוי או מילת עוגן, ומשמשת לפסילת תוצאות שמורות
+PATTERNS_VERSION = hashlib.sha256(
+    repr((PATTERNS, SECTION_HEADERS, SECTION_TERMINATORS, GENERAL_FIELD_ANCHORS)).encode("utf-8")
+).hexdigest()[:16]
\ No newline at end of file
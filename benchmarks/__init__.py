@@ -0,0 +1,7 @@
+# -*- coding: utf-8 -*-
+
+"""
+מדידות ביצועים של רכיבי האפליקציה. כל מודול ניתן להרצה ישירה:
+
+    python -m benchmarks.<שם המודול>
+"""
@@ -0,0 +1,126 @@
+# -*- coding: utf-8 -*-
+
+"""
+מדידת זמן וזיכרון שיא של ייצוא לאקסל.
+
+משווה שתי גישות:
+    dataframe  - רשימת שורות (legacy_prepare_rows) -> pandas DataFrame -> to_excel (הקוד הקודם)
+    streaming  - ExportManager.export_to_excel בזרימה (openpyxl write-only)
+
+כל מדידה רצה בתהליך נפרד כדי שזיכרון השיא (ru_maxrss) יהיה של הגישה הנמדדת בלבד.
+הזיכרון מדווח כתוספת מעל הזיכרון שנדרש לבניית התוצאות עצמן.
+
+הרצה:
+    python -m benchmarks.bench_excel_export [--rows 10000 100000]
+"""
+
+import os
+import sys
+import json
+import time
+import argparse
+import tempfile
+import subprocess
+
+from app.config.constants import FIELD_ID_TO_NAME
+from benchmarks.bench_export_rows import legacy_build_row
+from benchmarks.sample_documents import make_results
+
+APPROACHES = ("dataframe", "streaming")
+
+
+def peak_rss_kb():
+    """
+    Returns:
+        int: זיכרון השיא של התהליך בקילובייט (None אם המדידה אינה נתמכת)
+    """
+    try:
+        import resource
+    except ImportError:
+        return None
+
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+
+    # ב-macOS הערך בבתים, ובלינוקס בקילובייט
+    return peak // 1024 if sys.platform == "darwin" else peak
+
+
+def legacy_prepare_rows(results, selected_fields):
+    """
+    הכנת הנתונים לייצוא בקוד הקודם - רשימה של כל השורות בזיכרון, שורה כדיקשנרי.
+
+    Args:
+        results (list): רשימת תוצאות החילוץ
+        selected_fields (list): רשימת מזהי השדות שנבחרו
+
+    Returns:
+        list: רשימת שורות נתונים מוכנה לייצוא
+    """
+    return [legacy_build_row(result, selected_fields) for result in results if not result.has_error()]
+
+
+def run_child(approach, rows, file_path):
+    """
+    ביצוע מדידה אחת (בתוך תהליך הילד) והדפסת התוצאה כ-JSON.
+    """
+    import pandas as pd
+    from app.core.export_manager import ExportManager
+
+    selected_fields = list(FIELD_ID_TO_NAME)
+    results = make_results(rows)
+    export_manager = ExportManager()
+
+    baseline_kb = peak_rss_kb()
+    start = time.perf_counter()
+
+    if approach == "dataframe":
+        data_rows = legacy_prepare_rows(results, selected_fields)
+        pd.DataFrame(data_rows).to_excel(file_path, index=False)
+    else:
+        if not export_manager.export_to_excel(results, selected_fields, file_path):
+            raise RuntimeError("streaming export failed")
+
+    elapsed = time.perf_counter() - start
+    peak_kb = peak_rss_kb()
+
+    print(json.dumps({
+        "seconds": elapsed,
+        "extra_kb": peak_kb - baseline_kb if peak_kb is not None else None,
+        "size_kb": os.path.getsize(file_path) // 1024
+    }))
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rows", type=int, nargs="+", default=[10000, 100000])
+    parser.add_argument("--child", choices=APPROACHES, help=argparse.SUPPRESS)
+    parser.add_argument("--out", help=argparse.SUPPRESS)
+    args = parser.parse_args(argv)
+
+    if args.child:
+        run_child(args.child, args.rows[0], args.out)
+        return 0
+
+    print(f"{'rows':>8} {'approach':<10} {'time':>9} {'peak RSS +':>12} {'file':>9}")
+
+    with tempfile.TemporaryDirectory() as temp_dir:
+        for rows in args.rows:
+            for approach in APPROACHES:
+                file_path = os.path.join(temp_dir, f"{approach}_{rows}.xlsx")
+                output = subprocess.run(
+                    [sys.executable, "-m", "benchmarks.bench_excel_export",
+                     "--child", approach, "--rows", str(rows), "--out", file_path],
+                    check=True, capture_output=True, text=True).stdout
+
+                measurement = json.loads(output.strip().splitlines()[-1])
+                extra = measurement["extra_kb"]
+                extra_text = f"{extra / 1024:.1f} MB" if extra is not None else "n/a"
+
+                print(f"{rows:>8,} {approach:<10} {measurement['seconds']:>8.2f}s {extra_text:>12} "
+                      f"{measurement['size_kb']:>6} KB")
+
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,157 @@
+# -*- coding: utf-8 -*-
+
+"""
+מדידת זמן בניית שורות הייצוא.
+
+משווה שתי גישות:
+    legacy       - פענוח כל מזהה שדה (startswith/split) ובניית המיפוי בכל שורה (הקוד הקודם)
+    column plan  - ColumnPlan מהודר פעם אחת (הקוד הנוכחי): שורה כדיקשנרי ושורה כרשימה
+
+הרצה:
+    python -m benchmarks.bench_export_rows [--rows 100000]
+"""
+
+import sys
+import time
+import argparse
+
+from app.config.constants import FIELD_ID_TO_NAME
+from app.core.column_plan import ColumnPlan
+from benchmarks.sample_documents import make_results
+
+
+def legacy_build_row(result, selected_fields):
+    """
+    בניית שורת ייצוא בקוד הקודם - פענוח מזהה השדה ובניית המיפוי מחדש בכל שורה.
+
+    Args:
+        result (ExtractionResult): תוצאת החילוץ
+        selected_fields (list): רשימת מזהי השדות שנבחרו
+
+    Returns:
+        dict: שורת נתונים לייצוא {שם עמודה: ערך}
+    """
+    # בסיס השורה - שם הקובץ
+    row_data = {"שם קובץ": result.file_name}
+    data = result.data
+
+    # הוספת נתונים פשוטים
+    for field_id in selected_fields:
+        if field_id.startswith("owner_"):
+            # טיפול בשדות בעלים
+            owners = data.get("owners", [])
+            if owners:
+                field_parts = field_id.split("_", 1)
+                if len(field_parts) > 1:
+                    field_type = field_parts[1]
+                    owners_data = []
+
+                    mapping = {
+                        "name": "name",
+                        "id": "id_number",
+                        "id_type": "id_type",
+                        "share": "share"
+                    }
+
+                    if field_type in mapping:
+                        for owner in owners:
+                            value = owner.get(mapping[field_type], "")
+                            if value:
+                                owners_data.append(str(value))
+
+                    row_data[FIELD_ID_TO_NAME.get(field_id, field_id)] = ", ".join(owners_data)
+
+        elif field_id.startswith("mortgage_"):
+            # טיפול בשדות משכנתאות
+            mortgages = data.get("mortgages", [])
+            if mortgages:
+                field_parts = field_id.split("_", 1)
+                if len(field_parts) > 1:
+                    field_type = field_parts[1]
+                    mortgage_data = []
+
+                    mapping = {
+                        "holder": "holder",
+                        "amount": "amount",
+                        "rank": "rank"
+                    }
+
+                    if field_type in mapping:
+                        for mortgage in mortgages:
+                            value = mortgage.get(mapping[field_type], "")
+                            if value:
+                                mortgage_data.append(str(value))
+
+                    row_data[FIELD_ID_TO_NAME.get(field_id, field_id)] = ", ".join(mortgage_data)
+
+        elif field_id.startswith("remark_"):
+            # טיפול בשדות הערות
+            remarks = data.get("remarks", [])
+            if remarks:
+                field_parts = field_id.split("_", 1)
+                if len(field_parts) > 1:
+                    field_type = field_parts[1]
+                    remark_data = []
+
+                    mapping = {
+                        "type": "type",
+                        "content": "content"
+                    }
+
+                    if field_type in mapping:
+                        for remark in remarks:
+                            value = remark.get(mapping[field_type], "")
+                            if value:
+                                remark_data.append(str(value))
+
+                    row_data[FIELD_ID_TO_NAME.get(field_id, field_id)] = ", ".join(remark_data)
+
+        else:
+            # שדות רגילים
+            display_name = FIELD_ID_TO_NAME.get(field_id, field_id)
+            row_data[display_name] = data.get(field_id, "")
+
+    return row_data
+
+
+def measure(function, results):
+    """
+    Returns:
+        float: הזמן הכולל בשניות
+    """
+    start = time.perf_counter()
+    for result in results:
+        function(result)
+    return time.perf_counter() - start
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rows", type=int, default=100000)
+    args = parser.parse_args(argv)
+
+    selected_fields = list(FIELD_ID_TO_NAME)
+    results = make_results(args.rows)
+    column_plan = ColumnPlan(selected_fields)
+
+    # שתי הגישות חייבות לבנות שורות זהות
+    for result in results[:100]:
+        if legacy_build_row(result, selected_fields) != column_plan.row_dict(result):
+            print("RESULT MISMATCH")
+            return 1
+
+    approaches = {
+        "legacy": lambda result: legacy_build_row(result, selected_fields),
+        "plan row_dict": column_plan.row_dict,
+        "plan row_values": column_plan.row_values
+    }
+
+    print(f"{args.rows:,} results x {len(selected_fields)} fields")
+    for name, function in approaches.items():
+        print(f"  {name:<16} {measure(function, results):8.3f}s")
+
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,134 @@
+# -*- coding: utf-8 -*-
+
+"""
+מדידת זמן חילוץ השדות הכלליים על נסחים ארוכים.
+
+משווה שלוש גישות:
+    legacy       - re.search נפרד לכל שדה עם מחרוזת הביטוי (הקוד הקודם)
+    alternation  - ביטוי משולב אחד עם קבוצות בשם וסריקה אחת של הטקסט
+    scanner      - DataExtractor עם תוכנית חילוץ מהודרת (הקוד הנוכחי)
+
+הרצה:
+    python -m benchmarks.bench_general_fields [--pages 20] [--repeat 200]
+"""
+
+import re
+import sys
+import time
+import argparse
+
+from app.core.data_extractor import DataExtractor, RegexTimeBudget
+from app.core.extraction_plan import ExtractionPlan, GENERAL_FIELD_IDS
+from app.utils.regex_patterns import PATTERNS, GENERAL_FIELD_ANCHORS
+from benchmarks.sample_documents import HEADER_PAGE, make_document
+
+
+def legacy_extract(text_content):
+    """
+    חילוץ השדות הכלליים כפי שבוצע לפני תוכנית החילוץ.
+    """
+    result = {}
+    for field_id in GENERAL_FIELD_IDS:
+        match = re.search(PATTERNS[field_id], text_content)
+        if match:
+            result[field_id] = match.group(1).strip()
+    return result
+
+
+def build_alternation_extract():
+    """
+    בניית חילוץ בסריקה אחת: ביטוי משולב של מילות המפתח עם קבוצה בשם לכל שדה,
+    ובדיקת הביטוי המלא של השדה בכל מועמד.
+    """
+    keywords = {
+        "nesach_number": "נסח מס",
+        "date": "תאריך הפקה",
+        "gush": "גוש",
+        "helka": "חלקה",
+        "area": "שטח",
+        "authority": "|".join(GENERAL_FIELD_ANCHORS["authority"]),
+        "land_type": "סוג"
+    }
+    scanner = re.compile("|".join(f"(?P<{field_id}>{keyword})" for field_id, keyword in keywords.items()))
+    patterns = {field_id: re.compile(PATTERNS[field_id]) for field_id in GENERAL_FIELD_IDS}
+
+    def alternation_extract(text_content):
+        result = {}
+        remaining = set(GENERAL_FIELD_IDS)
+        for keyword_match in scanner.finditer(text_content):
+            field_id = keyword_match.lastgroup
+            if field_id not in remaining:
+                continue
+            match = patterns[field_id].match(text_content, keyword_match.start())
+            if match:
+                result[field_id] = match.group(1).strip()
+                remaining.discard(field_id)
+                if not remaining:
+                    break
+        return result
+
+    return alternation_extract
+
+
+def build_scanner_extract():
+    """
+    חילוץ דרך DataExtractor עם תוכנית חילוץ מהודרת.
+    """
+    extractor = DataExtractor()
+    plan = ExtractionPlan(GENERAL_FIELD_IDS)
+
+    def scanner_extract(text_content):
+        result = {}
+        extractor._extract_general_data(text_content, result, plan, RegexTimeBudget(None), {})
+        return result
+
+    return scanner_extract
+
+
+def measure(function, text_content, repeat):
+    """
+    Returns:
+        float: זמן ממוצע לקריאה במיקרו-שניות
+    """
+    start = time.perf_counter()
+    for _ in range(repeat):
+        function(text_content)
+    return (time.perf_counter() - start) / repeat * 1e6
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--pages", type=int, default=20)
+    parser.add_argument("--repeat", type=int, default=200)
+    args = parser.parse_args(argv)
+
+    documents = {
+        # כל השדות בעמוד הראשון
+        "all fields on page 1": make_document(args.pages),
+        # רשות מקומית חסרה - כל גישה חייבת לסרוק את כל הטקסט עבורה
+        "authority missing": make_document(args.pages, header=HEADER_PAGE.replace("עיריית", "")),
+        # עמוד הכותרת בסוף המסמך
+        "header on last page": make_document(args.pages, header="") + HEADER_PAGE
+    }
+
+    approaches = {
+        "legacy": legacy_extract,
+        "alternation": build_alternation_extract(),
+        "scanner": build_scanner_extract()
+    }
+
+    for name, text_content in documents.items():
+        expected = legacy_extract(text_content)
+        print(f"{name} ({len(text_content):,} chars, {args.pages} pages)")
+
+        for approach, function in approaches.items():
+            if function(text_content) != expected:
+                print(f"  {approach}: RESULT MISMATCH")
+                return 1
+            print(f"  {approach:<12} {measure(function, text_content, args.repeat):10.1f} us")
+
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,101 @@
+# -*- coding: utf-8 -*-
+
+"""
+בדיקת זמן טעינה - מדידת זמן הייבוא הקר של חבילות הליבה (python -X importtime)
+ובדיקה שהייבוא אינו טוען תלויות כבדות ואינו יוצר קבצים או ספריות.
+
+כל מודול מיובא בתהליך נפרד --repeat פעמים, והזמן המדווח הוא המינימום (הפחות
+רועש). הבדיקה נכשלת (קוד יציאה 1) אם:
+    - זמן הייבוא של מודול חורג מהתקציב שלו ב-IMPORT_BUDGETS_MS
+    - הייבוא טוען אחת מהחבילות ב-HEAVY_MODULES
+    - הייבוא יוצר קבצים בתיקיית הבית (ספריית תיעודים, הגדרות וכו')
+
+הרצה:
+    python -m benchmarks.bench_startup [--repeat 5] [--scale 1.0]
+"""
+
+import os
+import sys
+import argparse
+import tempfile
+import subprocess
+
+# תקציב זמן הייבוא הקר (מילישניות) לכל מודול
+IMPORT_BUDGETS_MS = {
+    "app": 80,
+    "app.core": 80,
+    "app.cli": 80
+}
+
+# חבילות שאסור שייטענו בייבוא המודולים - נטענות רק בשימוש הראשון
+HEAVY_MODULES = ("PyQt5", "pdfplumber", "pdfminer", "openpyxl", "pyarrow", "pandas")
+
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def run_import(module_name, home_dir):
+    """
+    ייבוא מודול בתהליך חדש.
+
+    Args:
+        module_name (str): שם המודול
+        home_dir (str): תיקיית הבית של התהליך
+
+    Returns:
+        tuple: (זמן הייבוא המצטבר במילישניות, רשימת החבילות הכבדות שנטענו)
+    """
+    code = (f"import sys, {module_name}; "
+            f"print(','.join(sorted({{m.split('.')[0] for m in sys.modules}} & set({HEAVY_MODULES!r}))))")
+    env = dict(os.environ, HOME=home_dir, USERPROFILE=home_dir)
+
+    completed = subprocess.run([sys.executable, "-X", "importtime", "-c", code], cwd=PROJECT_ROOT,
+                               env=env, capture_output=True, text=True, check=True)
+
+    # שורות importtime: "import time: self | cumulative | name" - השורה של המודול המבוקש
+    cumulative_us = 0
+    for line in completed.stderr.splitlines():
+        parts = line.split("|")
+        if len(parts) == 3 and parts[2].strip() == module_name:
+            cumulative_us = int(parts[1])
+
+    heavy_loaded = [name for name in completed.stdout.strip().split(",") if name]
+    return cumulative_us / 1000, heavy_loaded
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--scale", type=float, default=1.0,
+                        help="מכפיל לתקציבי הזמן (למכונות איטיות)")
+    args = parser.parse_args(argv)
+
+    failed = False
+
+    print(f"{'module':<12} {'import time':>12} {'budget':>8}  heavy modules")
+
+    for module_name, budget_ms in IMPORT_BUDGETS_MS.items():
+        with tempfile.TemporaryDirectory() as home_dir:
+            runs = [run_import(module_name, home_dir) for _ in range(args.repeat)]
+            created = os.listdir(home_dir)
+
+        best_ms = min(elapsed for elapsed, _ in runs)
+        heavy_loaded = sorted({name for _, names in runs for name in names})
+        budget_ms *= args.scale
+
+        print(f"{module_name:<12} {best_ms:>9.1f} ms {budget_ms:>5.0f} ms  {', '.join(heavy_loaded) or '-'}")
+
+        if best_ms > budget_ms:
+            print(f"  FAIL: import of {module_name} is over budget")
+            failed = True
+        if heavy_loaded:
+            print(f"  FAIL: import of {module_name} loads {', '.join(heavy_loaded)}")
+            failed = True
+        if created:
+            print(f"  FAIL: import of {module_name} creates files in the home directory: {', '.join(created)}")
+            failed = True
+
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
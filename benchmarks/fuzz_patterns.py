@@ -0,0 +1,151 @@
+# -*- coding: utf-8 -*-
+
+"""
+בדיקת עומס לביטויים הרגולריים - הרצת כל ביטוי ב-PATTERNS על קלטים עוינים
+בגדלים הולכים וגדלים ודיווח על זמן הריצה הגרוע ביותר של כל ביטוי.
+
+סוגי הקלטים:
+    repeat_prefix   - מילת הפתיחה של הביטוי חוזרת שוב ושוב ללא המשך
+    missing_tail    - כל מילות הביטוי לפי הסדר, ללא המילה האחרונה (אין התאמה מלאה)
+    separator_run   - מילת הפתיחה ואחריה רצף ארוך של רווחים ונקודתיים
+    random_mix      - ערבוב אקראי של מילות הביטוי, מספרים, סימנים ושורות חדשות
+
+כל הרצה מוגבלת ל---timeout שניות. ביטוי שחורג מהמגבלה מסומן TIMEOUT, וגדלים
+גדולים יותר של אותו קלט אינם נבדקים.
+
+הרצה:
+    python -m benchmarks.fuzz_patterns [--max-size 20000] [--timeout 2] [--limit 0.5]
+"""
+
+import re
+import sys
+import time
+import random
+import argparse
+
+from app.config.constants import FIELD_ID_TO_NAME
+from app.core.extraction_plan import ExtractionPlan, SUPPORTS_TIMEOUT
+from app.utils.regex_patterns import PATTERNS
+
+# מילים בעברית (כולל גרשיים ונקודות) שמופיעות במחרוזת הביטוי
+HEBREW_TOKEN = re.compile(r'[\u05d0-\u05ea][\u05d0-\u05ea."\'\\]*(?:\s+[\u05d0-\u05ea][\u05d0-\u05ea."\'\\]*)*')
+
+# תווים נוספים שמשולבים בקלט האקראי
+FILLER_TOKENS = (" ", " ", ":", "\n", "/", "123", "1/2", "ת.ז", "x")
+
+
+def pattern_tokens(pattern_name):
+    """
+    Args:
+        pattern_name (str): שם הביטוי ב-PATTERNS
+
+    Returns:
+        list: המילים הקבועות בביטוי לפי סדר הופעתן
+    """
+    return [token.replace("\\", "") for token in HEBREW_TOKEN.findall(PATTERNS[pattern_name])]
+
+
+def build_inputs(tokens, size, rng):
+    """
+    בניית הקלטים העוינים עבור ביטוי בגודל נתון.
+
+    Args:
+        tokens (list): המילים הקבועות בביטוי
+        size (int): אורך הקלט המשוער בתווים
+        rng (random.Random): מחולל מספרים אקראיים
+
+    Returns:
+        dict: {שם הקלט: טקסט}
+    """
+    first = tokens[0]
+    tail = tokens[:-1] or tokens
+
+    def repeat_until(chunk):
+        return chunk * max(1, size // len(chunk))
+
+    mix_tokens = tokens + list(FILLER_TOKENS)
+    mix = []
+    mix_length = 0
+    while mix_length < size:
+        token = rng.choice(mix_tokens)
+        mix.append(token)
+        mix_length += len(token) + 1
+
+    return {
+        "repeat_prefix": repeat_until(first + " "),
+        "missing_tail": repeat_until(" ".join(tail) + " "),
+        "separator_run": first + repeat_until(" :"),
+        "random_mix": " ".join(mix)
+    }
+
+
+def run_pattern(pattern, text_content, timeout):
+    """
+    Returns:
+        float או None: זמן הריצה בשניות, או None אם הריצה חרגה ממגבלת הזמן
+    """
+    start = time.perf_counter()
+    try:
+        for _ in pattern.finditer(text_content, timeout=timeout):
+            pass
+    except TimeoutError:
+        return None
+    return time.perf_counter() - start
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--min-size", type=int, default=100)
+    parser.add_argument("--max-size", type=int, default=20000)
+    parser.add_argument("--timeout", type=float, default=2.0,
+                        help="מגבלת זמן לכל הרצה בשניות")
+    parser.add_argument("--limit", type=float, default=None,
+                        help="כישלון (קוד יציאה 1) אם ביטוי כלשהו איטי יותר מערך זה בשניות")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args(argv)
+
+    if not SUPPORTS_TIMEOUT:
+        print("The 'regex' package is required (stdlib re cannot time out a runaway match)")
+        return 2
+
+    # תוכנית עם כל השדות מהדרת את כל הביטויים בדגלים שבהם הם רצים בחילוץ
+    plan = ExtractionPlan(FIELD_ID_TO_NAME)
+    rng = random.Random(args.seed)
+    failed = False
+
+    print(f"{'pattern':<16} {'worst input':<15} {'size':>8} {'worst time':>12}")
+
+    for pattern_name in PATTERNS:
+        pattern = plan.patterns[pattern_name]
+        tokens = pattern_tokens(pattern_name)
+
+        worst_time, worst_input, worst_size = 0.0, "-", 0
+        timed_out = set()
+
+        size = args.min_size
+        while size <= args.max_size:
+            for input_name, text_content in build_inputs(tokens, size, rng).items():
+                if input_name in timed_out:
+                    continue
+
+                elapsed = run_pattern(pattern, text_content, args.timeout)
+                if elapsed is None:
+                    timed_out.add(input_name)
+                    elapsed = float("inf")
+
+                if elapsed > worst_time:
+                    worst_time, worst_input, worst_size = elapsed, input_name, len(text_content)
+
+            size *= 2
+
+        shown_time = "TIMEOUT" if worst_time == float("inf") else f"{worst_time * 1000:.1f} ms"
+        print(f"{pattern_name:<16} {worst_input:<15} {worst_size:>8,} {shown_time:>12}")
+
+        if args.limit is not None and worst_time > args.limit:
+            failed = True
+
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
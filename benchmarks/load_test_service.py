@@ -0,0 +1,112 @@
+# -*- coding: utf-8 -*-
+
+"""
+בדיקת עומס לשירות החילוץ המקומי (app.service).
+
+מפעיל את השירות בתהליך הנוכחי על פורט פנוי, ושולח אליו --requests העלאות PDF
+מ---clients לקוחות במקביל. מדווח על קודי התשובה (200, ו-429 כשהתור מלא), אחוזוני
+זמן התגובה בצד הלקוח, התפוקה, ואת /stats של השירות בסיום.
+
+כדי לראות דחייה ב-429, הריצו עם יותר לקוחות מ-workers + queue-size, למשל:
+    python -m benchmarks.load_test_service --workers 2 --queue-size 4 --clients 16
+
+הרצה:
+    python -m benchmarks.load_test_service [--requests 400] [--clients 8] [--workers 2] [--queue-size 8]
+"""
+
+import sys
+import json
+import time
+import argparse
+import threading
+import urllib.error
+import urllib.request
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
+
+from app.core.data_processor import DataProcessor
+from app.service import ExtractionService, ExtractionServer, percentile
+from benchmarks.sample_documents import make_pdf_bytes
+
+# שדות החילוץ בבקשות
+FIELDS = "nesach_number,gush,helka,area,owner_name"
+
+
+def send_request(base_url, pdf_bytes, index):
+    """
+    שליחת בקשת חילוץ אחת.
+
+    Args:
+        base_url (str): כתובת השירות
+        pdf_bytes (bytes): תוכן קובץ ה-PDF
+        index (int): מספר הבקשה (לשם הקובץ)
+
+    Returns:
+        tuple: (קוד המצב, זמן התגובה בשניות)
+    """
+    request = urllib.request.Request(f"{base_url}/extract?fields={FIELDS}&name=load_{index}.pdf",
+                                     data=pdf_bytes, headers={"Content-Type": "application/pdf"})
+    started_at = time.perf_counter()
+
+    try:
+        with urllib.request.urlopen(request) as response:
+            response.read()
+            status = response.status
+    except urllib.error.HTTPError as e:
+        e.read()
+        status = e.code
+
+    return status, time.perf_counter() - started_at
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--requests", type=int, default=400)
+    parser.add_argument("--clients", type=int, default=8)
+    parser.add_argument("--workers", type=int, default=2)
+    parser.add_argument("--queue-size", type=int, default=8)
+    args = parser.parse_args(argv)
+
+    pdf_bytes = make_pdf_bytes(["Nesach 123456", "Gush: 6789 Helka: 12", "Area: 450.5"])
+
+    started_at = time.perf_counter()
+    service = ExtractionService(DataProcessor(), args.workers, args.queue_size)
+    server = ExtractionServer(("127.0.0.1", 0), service)
+    print(f"service ready in {time.perf_counter() - started_at:.2f}s "
+          f"({args.workers} workers, queue of {args.queue_size})")
+
+    server_thread = threading.Thread(target=server.serve_forever, daemon=True)
+    server_thread.start()
+    base_url = f"http://127.0.0.1:{server.server_address[1]}"
+
+    try:
+        started_at = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=args.clients) as clients:
+            responses = list(clients.map(lambda index: send_request(base_url, pdf_bytes, index),
+                                         range(args.requests)))
+        elapsed = time.perf_counter() - started_at
+
+        with urllib.request.urlopen(f"{base_url}/stats") as response:
+            stats = json.load(response)
+
+    finally:
+        server.shutdown()
+        server.server_close()
+        service.close()
+
+    statuses = Counter(status for status, _ in responses)
+    accepted = sorted(latency for status, latency in responses if status == 200)
+
+    print(f"{args.requests} requests from {args.clients} clients in {elapsed:.2f}s")
+    print(f"  status codes: {', '.join(f'{status}={count}' for status, count in sorted(statuses.items()))}")
+    print(f"  throughput:   {len(accepted) / elapsed:.1f} extractions/s")
+    if accepted:
+        print(f"  latency (200): p50={percentile(accepted, 0.5) * 1000:.1f}ms "
+              f"p90={percentile(accepted, 0.9) * 1000:.1f}ms p99={percentile(accepted, 0.99) * 1000:.1f}ms")
+    print(f"  /stats: {json.dumps(stats)}")
+
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
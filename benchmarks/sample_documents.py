@@ -0,0 +1,114 @@
+# -*- coding: utf-8 -*-
+
+"""
+יצירת טקסט סינתטי של נסחי טאבו לצורך מדידות ביצועים.
+"""
+
+HEADER_PAGE = """נסח מס' 123456
+תאריך הפקה: 01/02/2023
+גוש: 6789 חלקה: 12
+שטח במ"ר: 450.5
+עיריית תל אביב
+סוג המקרקעין: מקרקעי ישראל
+"""
+
+OWNER_ENTRY = ("מהות פעולה מכר ישראל ישראלי סוג זיהוי מס' זיהוי ת.ז 012345678 "
+               "החלק בנכס 1 / 2\n")
+
+MORTGAGE_ENTRY = "בעלי המשכנתה : בנק הפועלים דרגה : ראשונה סכום : 1,000,000\n"
+
+REMARK_ENTRY = "מהות פעולה : הערת אזהרה שם המוטב : בנק לאומי על הבעלות של ישראל\n"
+
+
+def make_document(pages=20, owners_per_page=40, header=HEADER_PAGE):
+    """
+    בניית טקסט נסח ארוך: עמוד כותרת עם השדות הכלליים, ואחריו עמודי בעלויות,
+    משכנתאות והערות.
+
+    Args:
+        pages (int, optional): מספר עמודי הבעלויות
+        owners_per_page (int, optional): מספר רשומות בעלים בכל עמוד
+        header (str, optional): טקסט עמוד הכותרת
+
+    Returns:
+        str: טקסט המסמך, עם שורה ריקה בין עמודים כמו בפלט של PDFParser
+    """
+    page_texts = [header, "בעלויות\n" + OWNER_ENTRY * owners_per_page]
+    page_texts.extend(OWNER_ENTRY * owners_per_page for _ in range(pages - 1))
+    page_texts.append("משכנתאות\n" + MORTGAGE_ENTRY * 5)
+    page_texts.append("הערות\n" + REMARK_ENTRY * 5)
+
+    return "".join(page_text + "\n\n" for page_text in page_texts)
+
+
+def make_results(count, owners_per_result=3):
+    """
+    בניית תוצאות חילוץ סינתטיות עם כל השדות, לצורך מדידת ביצועי ייצוא והצגה.
+
+    Args:
+        count (int): מספר התוצאות
+        owners_per_result (int, optional): מספר הבעלים בכל תוצאה
+
+    Returns:
+        list: רשימת ExtractionResult
+    """
+    from app.models.extraction_result import ExtractionResult
+
+    results = []
+
+    for idx in range(count):
+        result = ExtractionResult(f"nesach_{idx:06d}.pdf")
+        result.set_data({
+            "nesach_number": str(100000 + idx),
+            "date": "01/02/2023",
+            "gush": str(6000 + idx % 1000),
+            "helka": str(idx % 500),
+            "area": "450.5",
+            "authority": "תל אביב",
+            "land_type": "מקרקעי ישראל",
+            "owners": [
+                {"name": f"ישראל ישראלי {owner}", "id_number": "012345678", "id_type": "ת.ז", "share": "1 / 2"}
+                for owner in range(owners_per_result)
+            ],
+            "mortgages": [{"holder": "בנק הפועלים", "rank": "ראשונה", "amount": "1,000,000"}],
+            "remarks": [{"type": "הערת אזהרה", "content": "בנק לאומי"}]
+        })
+        results.append(result)
+
+    return results
+
+
+def make_pdf_bytes(lines):
+    """
+    בניית קובץ PDF מינימלי בעמוד אחד, לצורך בדיקות עומס שצריכות קובץ אמיתי.
+
+    Args:
+        lines (list): שורות הטקסט בעמוד (ASCII בלבד - הגופן המובנה אינו תומך בעברית)
+
+    Returns:
+        bytes: תוכן קובץ ה-PDF
+    """
+    text = ") Tj T* (".join(line.replace("\\", "\\\\").replace("(", "\\(").replace(")", "\\)") for line in lines)
+    stream = f"BT /F1 12 Tf 14 TL 72 720 Td ({text}) Tj ET".encode("ascii")
+
+    objects = [
+        b"<< /Type /Catalog /Pages 2 0 R >>",
+        b"<< /Type /Pages /Kids [3 0 R] /Count 1 >>",
+        b"<< /Type /Page /Parent 2 0 R /MediaBox [0 0 612 792] /Contents 4 0 R "
+        b"/Resources << /Font << /F1 5 0 R >> >> >>",
+        b"<< /Length %d >>\nstream\n" % len(stream) + stream + b"\nendstream",
+        b"<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica >>"
+    ]
+
+    content = b"%PDF-1.4\n"
+    offsets = []
+    for number, body in enumerate(objects, 1):
+        offsets.append(len(content))
+        content += b"%d 0 obj\n" % number + body + b"\nendobj\n"
+
+    xref_offset = len(content)
+    content += b"xref\n0 %d\n0000000000 65535 f \n" % (len(objects) + 1)
+    content += b"".join(b"%010d 00000 n \n" % offset for offset in offsets)
+    content += b"trailer\n<< /Size %d /Root 1 0 R >>\nstartxref\n%d\n%%%%EOF\n" % (len(objects) + 1, xref_offset)
+
+    return content